@@ -0,0 +1,259 @@
+"""
+MWRASP WebSocket Fan-out
+Per-topic broadcast to many WebSocket clients with per-client bounded send queues
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+
+# Frames waiting for one client before it is treated as a slow consumer and evicted
+SEND_QUEUE_SIZE = 256
+
+# Longest a single send may take before the client is evicted
+SEND_TIMEOUT_SECONDS = 5.0
+
+# Broadcast messages kept for replay to new connections
+MESSAGE_HISTORY_SIZE = 100
+
+# Wire framings: JSON text frames, JSON in binary frames, or MessagePack binary frames
+FRAMING_JSON = "json"
+FRAMING_BINARY = "binary"
+FRAMING_MSGPACK = "msgpack"
+
+# Close code sent to evicted clients ("try again later")
+EVICTION_CLOSE_CODE = 1013
+
+
+def available_framings() -> List[str]:
+    framings = [FRAMING_JSON, FRAMING_BINARY]
+    if MSGPACK_AVAILABLE:
+        framings.append(FRAMING_MSGPACK)
+    return framings
+
+
+def encode_frame(message: Dict, framing: str) -> Any:
+    """Serialize a message for one framing: str for text frames, bytes for binary ones"""
+    if framing == FRAMING_JSON:
+        return json.dumps(message)
+    if framing == FRAMING_BINARY:
+        return json.dumps(message).encode()
+    if framing == FRAMING_MSGPACK and MSGPACK_AVAILABLE:
+        return msgpack.packb(message, default=str)
+    raise ValueError(f"Unsupported framing: {framing}")
+
+
+class FanoutClient:
+    """One connection: its topics, framing and a writer task draining a bounded frame queue"""
+
+    def __init__(self, websocket: Any, topics: Iterable[str], framing: str, queue_size: int):
+        self.websocket = websocket
+        self.topics: Set[str] = set(topics)
+        self.framing = framing
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.writer: Optional[asyncio.Task] = None
+        self.connected_at = time.time()
+        self.frames_sent = 0
+        self.bytes_sent = 0
+
+    async def _send(self, frame: Any):
+        if isinstance(frame, str):
+            await self.websocket.send_text(frame)
+        else:
+            await self.websocket.send_bytes(frame)
+        self.frames_sent += 1
+        self.bytes_sent += len(frame)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            'topics': sorted(self.topics),
+            'framing': self.framing,
+            'queued': self.queue.qsize(),
+            'frames_sent': self.frames_sent,
+            'bytes_sent': self.bytes_sent,
+            'connected_seconds': time.time() - self.connected_at
+        }
+
+
+class FanoutEngine:
+    """Broadcasts messages to per-topic subscriber sets without waiting on any one client.
+
+    ``publish`` serializes a message once per framing in use and puts the
+    frame on each subscriber's bounded queue. It never awaits a socket.
+    Every client has its own writer task, so sends run concurrently and a
+    slow dashboard only delays itself. A client whose queue fills up, or
+    whose send takes longer than ``send_timeout``, is evicted: its socket is
+    closed and ``on_evict(websocket)`` is called. Published messages are
+    kept in a ring buffer for replay to new connections.
+    """
+
+    def __init__(self, queue_size: int = SEND_QUEUE_SIZE, history_size: int = MESSAGE_HISTORY_SIZE,
+                 send_timeout: float = SEND_TIMEOUT_SECONDS,
+                 on_evict: Optional[Callable[[Any], None]] = None):
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        self.on_evict = on_evict
+        self.history: deque = deque(maxlen=history_size)
+        self._clients: Dict[Any, FanoutClient] = {}
+        self._topics: Dict[str, Set[FanoutClient]] = {}
+
+        self.messages_published = 0
+        self.frames_encoded = 0
+        self.frames_queued = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def __contains__(self, websocket: Any) -> bool:
+        return websocket in self._clients
+
+    # Clients
+
+    def add_client(self, websocket: Any, topics: Iterable[str], framing: str = FRAMING_JSON) -> FanoutClient:
+        """Register a connection and start its writer on the running loop"""
+        if framing not in available_framings():
+            raise ValueError(f"Unsupported framing: {framing}")
+        self.remove_client(websocket)
+        client = FanoutClient(websocket, topics, framing, self.queue_size)
+        self._clients[websocket] = client
+        for topic in client.topics:
+            self._topics.setdefault(topic, set()).add(client)
+        client.writer = asyncio.get_running_loop().create_task(self._writer(client))
+        return client
+
+    def remove_client(self, websocket: Any) -> Optional[FanoutClient]:
+        client = self._clients.pop(websocket, None)
+        if client is None:
+            return None
+        for topic in client.topics:
+            subscribers = self._topics.get(topic)
+            if subscribers is not None:
+                subscribers.discard(client)
+                if not subscribers:
+                    del self._topics[topic]
+        if client.writer is not None and client.writer is not asyncio.current_task():
+            client.writer.cancel()
+        return client
+
+    def set_topics(self, websocket: Any, topics: Iterable[str]):
+        client = self._clients.get(websocket)
+        if client is None:
+            return
+        topics = set(topics)
+        for topic in client.topics - topics:
+            subscribers = self._topics[topic]
+            subscribers.discard(client)
+            if not subscribers:
+                del self._topics[topic]
+        for topic in topics - client.topics:
+            self._topics.setdefault(topic, set()).add(client)
+        client.topics = topics
+
+    def topics_of(self, websocket: Any) -> List[str]:
+        client = self._clients.get(websocket)
+        return sorted(client.topics) if client is not None else []
+
+    def subscriber_count(self, topic: str) -> int:
+        return len(self._topics.get(topic, ()))
+
+    def _evict(self, client: FanoutClient, reason: str):
+        if self._clients.get(client.websocket) is not client:
+            return
+        self.remove_client(client.websocket)
+        self.evictions += 1
+        print(f"Evicting slow websocket client: {reason}")
+        asyncio.ensure_future(self._close(client))
+        if self.on_evict is not None:
+            self.on_evict(client.websocket)
+
+    async def _close(self, client: FanoutClient):
+        try:
+            await client.websocket.close(code=EVICTION_CLOSE_CODE)
+        except Exception:
+            pass  # Already gone
+
+    async def _writer(self, client: FanoutClient):
+        while True:
+            frame = await client.queue.get()
+            try:
+                await asyncio.wait_for(client._send(frame), self.send_timeout)
+            except asyncio.TimeoutError:
+                self._evict(client, f"send took longer than {self.send_timeout}s")
+                return
+            except Exception as e:
+                self._evict(client, f"send failed: {e}")
+                return
+
+    # Publishing
+
+    def _enqueue(self, client: FanoutClient, frame: Any) -> bool:
+        try:
+            client.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            self._evict(client, f"{self.queue_size} frames pending")
+            return False
+        self.frames_queued += 1
+        return True
+
+    def publish(self, message: Dict, topic: Optional[str] = None, record: bool = True) -> int:
+        """Queue a message for every subscriber of topic (every client if None); returns how many"""
+        self.messages_published += 1
+        if record:
+            self.history.append(message)
+        recipients = self._topics.get(topic, ()) if topic is not None else self._clients.values()
+
+        frames: Dict[str, Any] = {}
+        delivered = 0
+        for client in list(recipients):
+            frame = frames.get(client.framing)
+            if frame is None:
+                frame = frames[client.framing] = encode_frame(message, client.framing)
+                self.frames_encoded += 1
+            delivered += self._enqueue(client, frame)
+        return delivered
+
+    def send_to(self, websocket: Any, message: Dict) -> bool:
+        """Queue a message for one client, behind anything already queued for it"""
+        client = self._clients.get(websocket)
+        if client is None:
+            return False
+        self.frames_encoded += 1
+        return self._enqueue(client, encode_frame(message, client.framing))
+
+    def replay_history(self, websocket: Any, count: int) -> int:
+        """Queue the last ``count`` published messages for one client"""
+        history = list(self.history)[-count:] if count > 0 else []
+        return sum(self.send_to(websocket, message) for message in history)
+
+    async def close(self):
+        """Cancel every writer and close every connection"""
+        clients = list(self._clients.values())
+        for client in clients:
+            self.remove_client(client.websocket)
+        await asyncio.gather(*(self._close(client) for client in clients))
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            'clients': len(self._clients),
+            'topics': {topic: len(subscribers) for topic, subscribers in self._topics.items()},
+            'framings': {
+                framing: sum(1 for client in self._clients.values() if client.framing == framing)
+                for framing in available_framings()
+            },
+            'messages_published': self.messages_published,
+            'frames_encoded': self.frames_encoded,
+            'frames_queued': self.frames_queued,
+            'frames_pending': sum(client.queue.qsize() for client in self._clients.values()),
+            'evictions': self.evictions,
+            'history_size': len(self.history)
+        }
@@ -0,0 +1,167 @@
+"""
+MWRASP API Response Cache
+TTL response cache with single-flight computation on a worker pool, plus per-endpoint latency histograms
+"""
+
+import asyncio
+import bisect
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+# Threads that run heavy statistics aggregations off the event loop
+AGGREGATION_WORKERS = 4
+
+# Latency histogram bucket upper bounds in milliseconds; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram; percentiles resolve to bucket upper bounds"""
+
+    def __init__(self, bounds_ms: Tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.bounds_ms = bounds_ms
+        self.counts = [0] * (len(bounds_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, seconds: float):
+        ms = seconds * 1000.0
+        self.counts[bisect.bisect_left(self.bounds_ms, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, fraction: float) -> float:
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return self.bounds_ms[index] if index < len(self.bounds_ms) else self.max_ms
+        return self.max_ms
+
+    def get_statistics(self) -> Dict[str, Any]:
+        labels = [f"<={bound}ms" for bound in self.bounds_ms] + [f">{self.bounds_ms[-1]}ms"]
+        return {
+            'count': self.count,
+            'mean_ms': self.total_ms / self.count if self.count else 0.0,
+            'max_ms': self.max_ms,
+            'p50_ms': self.percentile(0.50),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'buckets': {label: count for label, count in zip(labels, self.counts) if count}
+        }
+
+
+class EndpointMetrics:
+    """Latency histogram per endpoint path template"""
+
+    def __init__(self):
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, seconds: float):
+        with self._lock:
+            histogram = self._histograms.get(endpoint)
+            if histogram is None:
+                histogram = self._histograms[endpoint] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def get_statistics(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {endpoint: histogram.get_statistics() for endpoint, histogram in sorted(self._histograms.items())}
+
+
+class ResponseCache:
+    """Caches computed responses per key for a TTL and coalesces concurrent misses.
+
+    On a miss, the first caller runs ``compute`` on the worker pool, so a
+    slow aggregation does not block the event loop, and stores the result
+    for ``ttl`` seconds. Callers arriving while that computation is in
+    flight await the same result instead of starting their own
+    (single-flight). If ``snapshot`` is given, it runs on the event loop
+    first and ``compute`` receives its result, so state that the loop
+    mutates is copied there and only the aggregation runs on the pool.
+    The computation runs as its own task, so a caller that is cancelled
+    stops waiting without cancelling it for the others.
+    Failures are passed to every waiter and are not cached.
+    Cached values are shared, so callers must not mutate them.
+    """
+
+    def __init__(self, max_workers: int = AGGREGATION_WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mwrasp-aggregation")
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    async def get(self, key: str, ttl: float, compute: Callable[..., Any], offload: bool = True,
+                  snapshot: Optional[Callable[[], Any]] = None) -> Any:
+        """Cached value for key, computing it at most once per TTL across concurrent callers"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+
+        task = self._in_flight.get(key)
+        if task is None:
+            self.misses += 1
+            task = self._in_flight[key] = asyncio.ensure_future(
+                self._compute(key, ttl, compute, offload, snapshot)
+            )
+            # Nobody may be left to retrieve a failure once every caller has gone
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        else:
+            self.coalesced += 1
+        # Every caller waits through a shield, so a cancelled caller leaves the computation running
+        return await asyncio.shield(task)
+
+    async def _compute(self, key: str, ttl: float, compute: Callable[..., Any], offload: bool,
+                       snapshot: Optional[Callable[[], Any]]) -> Any:
+        try:
+            if snapshot is not None:
+                compute = functools.partial(compute, snapshot())
+            if offload:
+                value = await asyncio.get_running_loop().run_in_executor(self.executor, compute)
+            else:
+                value = compute()
+        except Exception:
+            self.errors += 1
+            raise
+        else:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            return value
+        finally:
+            del self._in_flight[key]
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drop one cached key, or every key"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            'entries': len(self._entries),
+            'in_flight': len(self._in_flight),
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'errors': self.errors,
+            'hit_rate': (self.hits + self.coalesced) / lookups if lookups else 0.0
+        }
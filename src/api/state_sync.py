@@ -0,0 +1,141 @@
+"""
+MWRASP Dashboard State Sync
+Versioned state channels: one full snapshot, then JSON-patch style deltas keyed by version
+"""
+
+import copy
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+
+# Deltas kept per channel so a client that missed some can catch up without a snapshot
+STATE_DELTA_HISTORY = 64
+
+SNAPSHOT_EVENT = "state_snapshot"
+DELTA_EVENT = "state_delta"
+
+
+def _escape(key: Any) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _equal(old: Any, new: Any) -> bool:
+    if type(old) is not type(new):
+        return False
+    try:
+        return bool(old == new)
+    except Exception:
+        return False  # Array-like values without a single truth value
+
+
+def diff_state(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """JSON-patch style operations turning old into new.
+
+    Dicts are compared key by key. Any other changed value, lists included,
+    is replaced whole. Paths are JSON pointers (RFC 6901).
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(diff_state(old[key], value, child))
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        return ops
+    if _equal(old, new):
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_patch(state: Any, ops: List[Dict[str, Any]]) -> Any:
+    """Apply diff_state operations to a decoded JSON state in place; returns the new root"""
+    for op in ops:
+        if op["path"] == "":
+            state = None if op["op"] == "remove" else op["value"]
+            continue
+        *parents, last = [_unescape(token) for token in op["path"].split("/")[1:]]
+        target = state
+        for key in parents:
+            target = target[key]
+        if op["op"] == "remove":
+            del target[last]
+        else:
+            target[last] = op["value"]
+    return state
+
+
+class StateChannel:
+    """One versioned piece of dashboard state, such as the threat statistics.
+
+    ``update`` diffs the new state against the last one. If anything
+    changed, it bumps the version and returns a delta message carrying
+    ``base_version`` and ``version``, so clients only pay for what changed.
+    A client applies a delta only when ``base_version`` matches its own
+    version. On a gap it sends a resync request, and ``resync_messages``
+    answers with the missed deltas, or with a fresh snapshot once those
+    have aged out of the history.
+    """
+
+    def __init__(self, topic: str, history: int = STATE_DELTA_HISTORY):
+        self.topic = topic
+        self.version = 0
+        self.state: Any = None
+        self._deltas: deque = deque(maxlen=history)
+
+        self.snapshots_sent = 0
+        self.deltas_published = 0
+        self.ops_published = 0
+
+    def update(self, state: Any) -> Optional[Dict[str, Any]]:
+        """Record a new state; returns the delta message, or None if nothing changed"""
+        ops = diff_state(self.state, state)
+        if not ops:
+            return None
+        self.state = copy.deepcopy(state)
+        self.version += 1
+        delta = {
+            "type": self.topic,
+            "event": DELTA_EVENT,
+            "timestamp": time.time(),
+            "data": {"base_version": self.version - 1, "version": self.version, "ops": ops}
+        }
+        self._deltas.append(delta)
+        self.deltas_published += 1
+        self.ops_published += len(ops)
+        return delta
+
+    def snapshot_message(self) -> Dict[str, Any]:
+        self.snapshots_sent += 1
+        return {
+            "type": self.topic,
+            "event": SNAPSHOT_EVENT,
+            "timestamp": time.time(),
+            "data": {"version": self.version, "state": self.state}
+        }
+
+    def resync_messages(self, since_version: int) -> List[Dict[str, Any]]:
+        """What a client at ``since_version`` needs to catch up to the current version"""
+        if since_version == self.version:
+            return []
+        oldest_base = self._deltas[0]["data"]["base_version"] if self._deltas else self.version
+        if oldest_base <= since_version < self.version:
+            return [delta for delta in self._deltas if delta["data"]["base_version"] >= since_version]
+        return [self.snapshot_message()]
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            'version': self.version,
+            'deltas_retained': len(self._deltas),
+            'deltas_published': self.deltas_published,
+            'ops_published': self.ops_published,
+            'snapshots_sent': self.snapshots_sent
+        }
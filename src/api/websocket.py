@@ -1,20 +1,37 @@
-from fastapi import WebSocket, WebSocketDisconnect
-from typing import Dict, List, Set
+from fastapi import WebSocket
+from typing import Dict, List, Optional, Set
 import asyncio
-import json
 import time
 from datetime import datetime
 
 from ..core.quantum_detector import QuantumDetector, ThreatLevel
 from ..core.temporal_fragmentation import TemporalFragmentation
 from ..core.agent_system import AutonomousDefenseCoordinator
+from ..core.threat_bus import ThreatSubscription
+from .fanout import FRAMING_JSON, FanoutEngine, available_framings
+from .state_sync import StateChannel
+
+
+# Threats buffered for dashboards; when clients fall behind the oldest are dropped
+THREAT_QUEUE_SIZE = 256
+
+# Topics a new connection receives until it sends a subscribe message
+DEFAULT_SUBSCRIPTIONS = ["threats", "agents", "fragments", "system"]
 
 
 class WebSocketManager:
     def __init__(self):
         # Active WebSocket connections
         self.active_connections: Set[WebSocket] = set()
-        self.connection_subscriptions: Dict[WebSocket, List[str]] = {}
+        
+        # Per-topic fan-out with bounded per-client send queues and message history
+        self.fanout = FanoutEngine(on_evict=self.disconnect)
+        
+        # Versioned dashboard state sent as one snapshot followed by deltas
+        self.state_channels: Dict[str, StateChannel] = {
+            "system": StateChannel("system"),
+            "threats": StateChannel("threats")
+        }
         
         # System references (set by server)
         self.quantum_detector: QuantumDetector = None
@@ -23,13 +40,10 @@ class WebSocketManager:
         
         # Real-time monitoring state
         self.monitoring_task = None
-        self.last_threat_count = 0
+        self.threat_task = None
+        self.threat_subscription: ThreatSubscription = None
         self.last_fragment_count = 0
         self.last_agent_status = {}
-        
-        # Message history for new connections
-        self.recent_messages: List[Dict] = []
-        self.max_history = 100
     
     def set_system_references(self, quantum_detector, fragmentation_system, agent_coordinator):
         """Set references to the core systems"""
@@ -41,7 +55,12 @@ class WebSocketManager:
         """Handle new WebSocket connection"""
         await websocket.accept()
         self.active_connections.add(websocket)
-        self.connection_subscriptions[websocket] = ["threats", "agents", "fragments", "system"]
+        
+        # Clients may ask for binary frames with ?framing=binary or ?framing=msgpack
+        framing = websocket.query_params.get("framing", FRAMING_JSON)
+        if framing not in available_framings():
+            framing = FRAMING_JSON
+        self.fanout.add_client(websocket, DEFAULT_SUBSCRIPTIONS, framing)
         
         # Send initial system state
         await self._send_initial_state(websocket)
@@ -49,16 +68,26 @@ class WebSocketManager:
         # Start monitoring if this is the first connection
         if len(self.active_connections) == 1 and not self.monitoring_task:
             self.monitoring_task = asyncio.create_task(self._monitoring_loop())
+        if self.quantum_detector and not self.threat_task:
+            self.threat_subscription = self.quantum_detector.threat_bus.subscribe(
+                "websocket_manager", maxsize=THREAT_QUEUE_SIZE
+            )
+            self.threat_task = asyncio.create_task(self._threat_event_loop(self.threat_subscription))
     
     def disconnect(self, websocket: WebSocket):
         """Handle WebSocket disconnection"""
         self.active_connections.discard(websocket)
-        self.connection_subscriptions.pop(websocket, None)
+        self.fanout.remove_client(websocket)
         
         # Stop monitoring if no active connections
         if not self.active_connections and self.monitoring_task:
             self.monitoring_task.cancel()
             self.monitoring_task = None
+        if not self.active_connections and self.threat_task:
+            self.threat_subscription.close()
+            self.threat_task.cancel()
+            self.threat_subscription = None
+            self.threat_task = None
     
     async def _send_initial_state(self, websocket: WebSocket):
         """Send initial system state to new connection"""
@@ -69,41 +98,67 @@ class WebSocketManager:
                 "event": "connected",
                 "timestamp": time.time(),
                 "message": "Connected to MWRASP Real-time Monitoring",
-                "server_time": datetime.now().isoformat()
+                "server_time": datetime.now().isoformat(),
+                "framings": available_framings()
             }
-            await websocket.send_text(json.dumps(welcome_msg))
+            self.fanout.send_to(websocket, welcome_msg)
             
             # Send recent message history
-            for message in self.recent_messages[-10:]:  # Last 10 messages
-                await websocket.send_text(json.dumps(message))
+            self.fanout.replay_history(websocket, 10)  # Last 10 messages
             
-            # Send current system status
-            await self._send_system_status(websocket)
+            # Send current state snapshots
+            await self._send_state_snapshots(websocket, self.fanout.topics_of(websocket))
             
         except Exception as e:
             print(f"Error sending initial state: {e}")
     
+    def _collect_state(self, topic: str):
+        """Current state for a state channel, or None if its systems are not set yet"""
+        if topic == "threats":
+            if not self.quantum_detector:
+                return None
+            return self.quantum_detector.get_threat_statistics()
+        
+        if not all([self.quantum_detector, self.fragmentation_system, self.agent_coordinator]):
+            return None
+        return {
+            "quantum_detector": self.quantum_detector.get_threat_statistics(),
+            "temporal_fragmentation": self.fragmentation_system.get_system_stats(),
+            "agent_coordination": self.agent_coordinator.get_agent_status()
+        }
+    
+    async def _publish_state(self, topic: str) -> Optional[StateChannel]:
+        """Refresh a state channel and broadcast the delta, if any, to its subscribers"""
+        channel = self.state_channels[topic]
+        state = self._collect_state(topic)
+        if state is None:
+            return None
+        
+        delta = channel.update(state)
+        if delta:
+            # Deltas are useless without their base snapshot, so keep them out of replay history
+            await self.broadcast_message(delta, subscription_filter=topic, record_history=False)
+        return channel
+    
+    async def _send_state_snapshots(self, websocket: WebSocket, topics: List[str]):
+        """Send a fresh snapshot of each state channel among topics to one client"""
+        for topic in topics:
+            if topic not in self.state_channels:
+                continue
+            try:
+                channel = await self._publish_state(topic)
+                if channel:
+                    self.fanout.send_to(websocket, channel.snapshot_message())
+            except Exception as e:
+                print(f"Error sending {topic} state: {e}")
+    
     async def _send_system_status(self, websocket: WebSocket = None):
-        """Send current system status"""
+        """Send current system status: a snapshot to one client, or a delta to all"""
         try:
-            if not all([self.quantum_detector, self.fragmentation_system, self.agent_coordinator]):
-                return
-            
-            status_msg = {
-                "type": "system",
-                "event": "status_update",
-                "timestamp": time.time(),
-                "data": {
-                    "quantum_detector": self.quantum_detector.get_threat_statistics(),
-                    "temporal_fragmentation": self.fragmentation_system.get_system_stats(),
-                    "agent_coordination": self.agent_coordinator.get_agent_status()
-                }
-            }
-            
             if websocket:
-                await websocket.send_text(json.dumps(status_msg))
+                await self._send_state_snapshots(websocket, ["system"])
             else:
-                await self.broadcast_message(status_msg)
+                await self._publish_state("system")
                 
         except Exception as e:
             print(f"Error sending system status: {e}")
@@ -114,9 +169,6 @@ class WebSocketManager:
             try:
                 await asyncio.sleep(0.5)  # 500ms update interval
                 
-                # Check for new threats
-                await self._check_threat_updates()
-                
                 # Check for fragment changes
                 await self._check_fragment_updates()
                 
@@ -132,49 +184,32 @@ class WebSocketManager:
                 print(f"Monitoring loop error: {e}")
                 await asyncio.sleep(1.0)
     
-    async def _check_threat_updates(self):
-        """Check for new quantum threats"""
-        try:
-            if not self.quantum_detector:
-                return
-            
-            current_threats = self.quantum_detector.get_active_threats()
-            current_count = len(current_threats)
-            
-            if current_count != self.last_threat_count:
-                # New threats detected
-                new_threats = current_threats[self.last_threat_count:]
-                
-                for threat in new_threats:
+    async def _threat_event_loop(self, subscription: ThreatSubscription):
+        """Broadcast each threat as soon as the detector publishes it"""
+        async for threat in subscription:
+            try:
+                for new_threat in [threat] + subscription.drain():
                     threat_msg = {
                         "type": "threats",
                         "event": "new_threat",
                         "timestamp": time.time(),
                         "data": {
-                            "threat_id": threat.threat_id,
-                            "threat_level": threat.threat_level.name,
-                            "detection_time": threat.detection_time,
-                            "attack_vector": threat.attack_vector,
-                            "quantum_indicators": threat.quantum_indicators,
-                            "confidence_score": threat.confidence_score,
-                            "affected_tokens": threat.affected_tokens
+                            "threat_id": new_threat.threat_id,
+                            "threat_level": new_threat.threat_level.name,
+                            "detection_time": new_threat.detection_time,
+                            "attack_vector": new_threat.attack_vector,
+                            "quantum_indicators": new_threat.quantum_indicators,
+                            "confidence_score": new_threat.confidence_score,
+                            "affected_tokens": new_threat.affected_tokens
                         }
                     }
                     await self.broadcast_message(threat_msg, subscription_filter="threats")
                 
-                self.last_threat_count = current_count
-                
-                # Send updated statistics
-                stats_msg = {
-                    "type": "threats",
-                    "event": "statistics_update",
-                    "timestamp": time.time(),
-                    "data": self.quantum_detector.get_threat_statistics()
-                }
-                await self.broadcast_message(stats_msg, subscription_filter="threats")
+                # Send what changed in the statistics once per burst
+                await self._publish_state("threats")
                 
-        except Exception as e:
-            print(f"Error checking threat updates: {e}")
+            except Exception as e:
+                print(f"Error broadcasting threat updates: {e}")
     
     async def _check_fragment_updates(self):
         """Check for fragment system changes"""
@@ -263,40 +298,14 @@ class WebSocketManager:
         }
         await self.broadcast_message(heartbeat_msg, subscription_filter="system")
     
-    async def broadcast_message(self, message: Dict, subscription_filter: str = None):
-        """Broadcast message to all connected clients"""
+    async def broadcast_message(self, message: Dict, subscription_filter: str = None,
+                                record_history: bool = True):
+        """Broadcast message to all connected clients subscribed to the filter topic"""
         if not self.active_connections:
             return
         
-        message_json = json.dumps(message)
-        
-        # Add to message history
-        self.recent_messages.append(message)
-        if len(self.recent_messages) > self.max_history:
-            self.recent_messages.pop(0)
-        
-        # Send to all appropriate connections
-        disconnected = set()
-        
-        for websocket in self.active_connections:
-            try:
-                # Check subscription filter
-                if subscription_filter:
-                    subscriptions = self.connection_subscriptions.get(websocket, [])
-                    if subscription_filter not in subscriptions:
-                        continue
-                
-                await websocket.send_text(message_json)
-                
-            except WebSocketDisconnect:
-                disconnected.add(websocket)
-            except Exception as e:
-                print(f"Error broadcasting to websocket: {e}")
-                disconnected.add(websocket)
-        
-        # Clean up disconnected clients
-        for websocket in disconnected:
-            self.disconnect(websocket)
+        # Serialized once per framing and queued; slow clients are evicted by the fan-out
+        self.fanout.publish(message, topic=subscription_filter, record=record_history)
     
     async def send_alert(self, alert_type: str, message: str, severity: str = "info"):
         """Send immediate alert to all connected clients"""
@@ -321,7 +330,8 @@ class WebSocketManager:
             if message_type == "subscribe":
                 # Update subscriptions
                 subscriptions = message.get("subscriptions", [])
-                self.connection_subscriptions[websocket] = subscriptions
+                added = [topic for topic in subscriptions if topic not in self.fanout.topics_of(websocket)]
+                self.fanout.set_topics(websocket, subscriptions)
                 
                 response = {
                     "type": "subscription",
@@ -329,7 +339,18 @@ class WebSocketManager:
                     "timestamp": time.time(),
                     "subscriptions": subscriptions
                 }
-                await websocket.send_text(json.dumps(response))
+                self.fanout.send_to(websocket, response)
+                
+                # Newly subscribed state channels start from a snapshot
+                await self._send_state_snapshots(websocket, added)
+            
+            elif message_type == "resync":
+                # Client saw a version gap; send the missed deltas or a fresh snapshot
+                channel = self.state_channels.get(message.get("topic"))
+                if channel is None:
+                    raise ValueError(f"Unknown state topic: {message.get('topic')}")
+                for state_msg in channel.resync_messages(int(message.get("version", 0))):
+                    self.fanout.send_to(websocket, state_msg)
             
             elif message_type == "request_status":
                 # Send current status
@@ -350,7 +371,7 @@ class WebSocketManager:
                 "timestamp": time.time(),
                 "error": str(e)
             }
-            await websocket.send_text(json.dumps(error_msg))
+            self.fanout.send_to(websocket, error_msg)
     
     async def _handle_simulation_request(self, websocket: WebSocket, message: Dict):
         """Handle simulation requests from clients"""
@@ -373,7 +394,7 @@ class WebSocketManager:
                 "timestamp": time.time(),
                 "data": {"intensity": intensity}
             }
-            await websocket.send_text(json.dumps(response))
+            self.fanout.send_to(websocket, response)
         
         elif simulation_type == "fragment_test":
             # Test fragmentation system
@@ -391,7 +412,7 @@ class WebSocketManager:
                         "test_id": "websocket_test"
                     }
                 }
-                await websocket.send_text(json.dumps(response))
+                self.fanout.send_to(websocket, response)
     
     async def _handle_command_request(self, websocket: WebSocket, message: Dict):
         """Handle system command requests"""
@@ -413,17 +434,21 @@ class WebSocketManager:
                 "timestamp": time.time(),
                 "command": command
             }
-            await websocket.send_text(json.dumps(response))
+            self.fanout.send_to(websocket, response)
     
     def get_connection_stats(self) -> Dict:
         """Get WebSocket connection statistics"""
         return {
             "active_connections": len(self.active_connections),
             "monitoring_active": self.monitoring_task is not None,
-            "message_history_size": len(self.recent_messages),
+            "threat_subscription": self.threat_subscription.get_statistics() if self.threat_subscription else None,
+            "message_history_size": len(self.fanout.history),
             "subscription_breakdown": {
-                sub: sum(1 for subs in self.connection_subscriptions.values() if sub in subs)
-                for sub in ["threats", "agents", "fragments", "system"]
+                sub: self.fanout.subscriber_count(sub) for sub in DEFAULT_SUBSCRIPTIONS
+            },
+            "fanout": self.fanout.get_statistics(),
+            "state_channels": {
+                topic: channel.get_statistics() for topic, channel in self.state_channels.items()
             }
         }
 
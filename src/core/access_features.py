@@ -0,0 +1,285 @@
+"""
+MWRASP Streaming Access Features
+Incremental sliding-window statistics consumed by the quantum algorithm detectors
+"""
+
+import math
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+# Interval thresholds (seconds) below which a query counts as "rapid"
+RAPID_QUERY_THRESHOLDS = (0.001, 0.002, 0.005)
+
+# Intervals are quantized to 1ms buckets for timing entropy
+INTERVAL_BUCKETS_PER_SECOND = 1000
+
+# Values above this are treated as cryptographic-size operands (Shor's)
+LARGE_VALUE_THRESHOLD = 1000
+
+# Floating-point running sums are recomputed exactly after this many updates
+REFRESH_INTERVAL = 4096
+
+
+def _plogp(count: int) -> float:
+    return count * math.log2(count) if count > 1 else 0.0
+
+
+class RollingHistogram:
+    """Multiset of hashable keys with O(1) add/remove.
+
+    Tracks distinct keys, the highest key frequency (via a count-of-counts
+    table) and the running sum of c*log2(c) needed for Shannon entropy.
+    """
+
+    def __init__(self):
+        self.counts: Dict[float, int] = {}
+        self._frequency_counts: Dict[int, int] = {}
+        self.total = 0
+        self.max_frequency = 0
+        self._plogp_sum = 0.0
+
+    def add(self, key):
+        count = self.counts.get(key, 0)
+        if count:
+            self._frequency_counts[count] -= 1
+        self.counts[key] = count + 1
+        self._frequency_counts[count + 1] = self._frequency_counts.get(count + 1, 0) + 1
+        self._plogp_sum += _plogp(count + 1) - _plogp(count)
+        self.total += 1
+        if count + 1 > self.max_frequency:
+            self.max_frequency = count + 1
+
+    def remove(self, key):
+        count = self.counts[key]
+        self._frequency_counts[count] -= 1
+        if count == 1:
+            del self.counts[key]
+        else:
+            self.counts[key] = count - 1
+            self._frequency_counts[count - 1] = self._frequency_counts.get(count - 1, 0) + 1
+        self._plogp_sum += _plogp(count - 1) - _plogp(count)
+        self.total -= 1
+        if count == self.max_frequency and self._frequency_counts[count] == 0:
+            self.max_frequency -= 1
+
+    @property
+    def distinct(self) -> int:
+        return len(self.counts)
+
+    def entropy(self) -> float:
+        """Shannon entropy (bits) of the key distribution"""
+        if self.total == 0:
+            return 0.0
+        entropy = math.log2(self.total) - self._plogp_sum / self.total
+        return entropy if entropy > 0.0 else 0.0
+
+    def refresh(self):
+        self._plogp_sum = sum(_plogp(count) for count in self.counts.values())
+
+
+class SlidingExtremes:
+    """Sliding-window min/max with monotonic deques (O(1) amortized)"""
+
+    def __init__(self):
+        self._min: deque = deque()
+        self._max: deque = deque()
+
+    def push(self, sequence: int, value: float):
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((sequence, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((sequence, value))
+
+    def expire(self, sequence: int):
+        """Drop entries at or before sequence"""
+        while self._min and self._min[0][0] <= sequence:
+            self._min.popleft()
+        while self._max and self._max[0][0] <= sequence:
+            self._max.popleft()
+
+    @property
+    def minimum(self) -> Optional[float]:
+        return self._min[0][1] if self._min else None
+
+    @property
+    def maximum(self) -> Optional[float]:
+        return self._max[0][1] if self._max else None
+
+
+class WindowFeatures:
+    """Statistics over the last ``size`` accesses of one token.
+
+    Maintains the inter-access interval moments, rapid-query counters,
+    quantized-interval entropy and, optionally, a frequency histogram of one
+    value column. Every push/pop is O(1).
+    """
+
+    def __init__(self, size: int, value_column: Optional[str] = None):
+        self.size = size
+        self.value_column = value_column
+        self.reset()
+
+    def reset(self):
+        self.interval_count = 0
+        self._interval_sum = 0.0
+        self._interval_sumsq = 0.0
+        self._rapid_counts = [0] * len(RAPID_QUERY_THRESHOLDS)
+        self.interval_histogram = RollingHistogram()
+        self.value_histogram = RollingHistogram()
+        self.large_value_count = 0
+        self._extremes = SlidingExtremes()
+
+    @staticmethod
+    def _interval_bucket(interval: float) -> int:
+        return round(interval * INTERVAL_BUCKETS_PER_SECOND)
+
+    def push_interval(self, interval: float):
+        self.interval_count += 1
+        self._interval_sum += interval
+        self._interval_sumsq += interval * interval
+        for i, threshold in enumerate(RAPID_QUERY_THRESHOLDS):
+            if interval < threshold:
+                self._rapid_counts[i] += 1
+        self.interval_histogram.add(self._interval_bucket(interval))
+
+    def pop_interval(self, interval: float):
+        self.interval_count -= 1
+        self._interval_sum -= interval
+        self._interval_sumsq -= interval * interval
+        for i, threshold in enumerate(RAPID_QUERY_THRESHOLDS):
+            if interval < threshold:
+                self._rapid_counts[i] -= 1
+        self.interval_histogram.remove(self._interval_bucket(interval))
+
+    def push_value(self, sequence: int, value: float):
+        if value != value:  # NaN: access carried no usable value
+            return
+        self.value_histogram.add(value)
+        if value > LARGE_VALUE_THRESHOLD:
+            self.large_value_count += 1
+        self._extremes.push(sequence, value)
+
+    def pop_value(self, sequence: int, value: float):
+        self._extremes.expire(sequence)
+        if value != value:
+            return
+        self.value_histogram.remove(value)
+        if value > LARGE_VALUE_THRESHOLD:
+            self.large_value_count -= 1
+
+    def refresh_sums(self, intervals: np.ndarray):
+        """Recompute floating-point running sums exactly"""
+        self._interval_sum = float(intervals.sum())
+        self._interval_sumsq = float(np.dot(intervals, intervals))
+        self.interval_histogram.refresh()
+        self.value_histogram.refresh()
+
+    # Feature accessors
+
+    @property
+    def interval_mean(self) -> float:
+        return self._interval_sum / self.interval_count if self.interval_count else 0.0
+
+    @property
+    def interval_std(self) -> float:
+        """Population standard deviation of the intervals"""
+        if not self.interval_count:
+            return 0.0
+        mean = self.interval_mean
+        variance = self._interval_sumsq / self.interval_count - mean * mean
+        return math.sqrt(variance) if variance > 0.0 else 0.0
+
+    def rapid_count(self, threshold: float) -> int:
+        return self._rapid_counts[RAPID_QUERY_THRESHOLDS.index(threshold)]
+
+    @property
+    def interval_entropy(self) -> float:
+        return self.interval_histogram.entropy()
+
+    @property
+    def value_count(self) -> int:
+        return self.value_histogram.total
+
+    @property
+    def distinct_values(self) -> int:
+        return self.value_histogram.distinct
+
+    @property
+    def max_value_frequency(self) -> int:
+        return self.value_histogram.max_frequency
+
+    @property
+    def value_entropy(self) -> float:
+        return self.value_histogram.entropy()
+
+    @property
+    def value_range(self) -> Tuple[Optional[float], Optional[float]]:
+        return self._extremes.minimum, self._extremes.maximum
+
+
+class AccessFeatures:
+    """Set of WindowFeatures kept in step with one token's AccessHistory.
+
+    ``windows`` maps a window size (in accesses) to the value column that
+    window should histogram (or None). The owning history must retain at
+    least ``max_window + 1`` records so outgoing entries can be read back.
+    """
+
+    def __init__(self, windows: Dict[int, Optional[str]]):
+        self.windows: Dict[int, WindowFeatures] = {
+            size: WindowFeatures(size, column) for size, column in sorted(windows.items())
+        }
+        self.max_window = max(self.windows) if self.windows else 0
+        self._updates = 0
+
+    def window(self, size: int) -> WindowFeatures:
+        return self.windows[size]
+
+    def on_record(self, history):
+        """Fold the record just appended to history into every window"""
+        length = len(history)
+        span = min(length, self.max_window + 1)
+        times = history.times(last=span)
+        columns = {}
+        for features in self.windows.values():
+            column = features.value_column
+            if column is not None and column not in columns:
+                columns[column] = getattr(history, column)(last=span)
+        newest_sequence = history.total_recorded - 1
+
+        for size, features in self.windows.items():
+            if length >= 2:
+                features.push_interval(float(times[-1] - times[-2]))
+            if features.value_column is not None:
+                features.push_value(newest_sequence, float(columns[features.value_column][-1]))
+            if length > size:
+                features.pop_interval(float(times[-size] - times[-size - 1]))
+                if features.value_column is not None:
+                    features.pop_value(newest_sequence - size, float(columns[features.value_column][-size - 1]))
+
+        self._updates += 1
+        if self._updates >= REFRESH_INTERVAL:
+            self._updates = 0
+            for size, features in self.windows.items():
+                features.refresh_sums(np.diff(history.times(last=size)))
+
+    def rebuild(self, history):
+        """Recompute every window from the history (after evictions)"""
+        length = len(history)
+        first_sequence = history.total_recorded - length
+        for size, features in self.windows.items():
+            features.reset()
+            span = min(length, size)
+            times = history.times(last=span)
+            for interval in np.diff(times):
+                features.push_interval(float(interval))
+            if features.value_column is not None:
+                values = getattr(history, features.value_column)(last=span)
+                for offset, value in enumerate(values):
+                    features.push_value(first_sequence + length - span + offset, float(value))
+        self._updates = 0
@@ -0,0 +1,563 @@
+"""
+MWRASP Canary Token Access History
+Fixed-capacity, array-backed ring buffers for per-token access records
+"""
+
+import math
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .access_features import AccessFeatures
+
+
+class SymbolTable:
+    """Interns strings (accessor ids, access values) to compact integer ids"""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {'': 0}
+        self._symbols: List[str] = ['']
+
+    def intern(self, symbol: Optional[Any]) -> int:
+        """Return the id for a symbol, assigning a new one on first sight"""
+        if symbol is None:
+            return 0
+        symbol = str(symbol)
+        symbol_id = self._ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = len(self._symbols)
+            self._ids[symbol] = symbol_id
+            self._symbols.append(symbol)
+        return symbol_id
+
+    def lookup(self, symbol_id: int) -> str:
+        return self._symbols[symbol_id]
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+
+def _digit_value(value: Any) -> float:
+    """Numeric value of a digit-string access value, NaN otherwise"""
+    if isinstance(value, str) and value and value.isdigit():
+        return float(int(value))
+    return math.nan
+
+
+def _search_value(value: Any) -> float:
+    """Search-space value used by Grover's detection, NaN if not applicable"""
+    if isinstance(value, str) and value and (value.isdigit() or len(value) <= 8):
+        return float(int(value)) if value.isdigit() else float(hash(value) % 10000)
+    return math.nan
+
+
+def _oracle_value(value: Any, input_value: Any, output_value: Any) -> float:
+    """Oracle query value used by Simon's detection, NaN if not applicable"""
+    digit = _digit_value(value)
+    if not math.isnan(digit):
+        return digit
+    if isinstance(input_value, int):
+        return float(input_value)
+    if isinstance(output_value, int):
+        return float(output_value)
+    return math.nan
+
+
+class AccessHistory:
+    """Per-token ring buffer of access records stored as NumPy columns.
+
+    Every column is allocated at twice the capacity and each record is written
+    to both halves, so the live window is always one contiguous slice and
+    readers get zero-copy array views. Appends and evictions only move the
+    head/length pointers. Value columns are allocated on the first access that
+    carries a value. When ``feature_windows`` is given, an AccessFeatures
+    engine is updated incrementally on every record.
+    """
+
+    VALUE_COLUMNS = ('value_ids', 'values', 'search_values', 'oracle_values')
+
+    def __init__(self, capacity: int = 1024, symbols: Optional[SymbolTable] = None,
+                 token_id: Optional[str] = None,
+                 feature_windows: Optional[Dict[int, Optional[str]]] = None):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if feature_windows and capacity <= max(feature_windows):
+            raise ValueError("capacity must exceed the largest feature window")
+        self.capacity = capacity
+        self.token_id = token_id
+        self.symbols = symbols if symbols is not None else SymbolTable()
+        self._head = 0
+        self._length = 0
+        self._times = np.zeros(2 * capacity, dtype=np.float64)
+        self._accessor_ids = np.zeros(2 * capacity, dtype=np.int32)
+        self._value_ids: Optional[np.ndarray] = None
+        self._values: Optional[np.ndarray] = None
+        self._search_values: Optional[np.ndarray] = None
+        self._oracle_values: Optional[np.ndarray] = None
+        self.total_recorded = 0
+        self.total_evicted = 0
+        self.features = AccessFeatures(feature_windows) if feature_windows else None
+
+    @classmethod
+    def from_accesses(cls, accesses: Iterable[Dict], symbols: Optional[SymbolTable] = None,
+                      feature_windows: Optional[Dict[int, Optional[str]]] = None) -> 'AccessHistory':
+        """Build a history from legacy access dicts"""
+        accesses = list(accesses)
+        capacity = max(len(accesses), max(feature_windows) + 1 if feature_windows else 1)
+        history = cls(capacity=capacity, symbols=symbols, feature_windows=feature_windows)
+        for access in accesses:
+            history.append(access)
+        return history
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _allocate_value_columns(self):
+        self._value_ids = np.zeros(2 * self.capacity, dtype=np.int32)
+        self._values = np.full(2 * self.capacity, np.nan, dtype=np.float64)
+        self._search_values = np.full(2 * self.capacity, np.nan, dtype=np.float64)
+        self._oracle_values = np.full(2 * self.capacity, np.nan, dtype=np.float64)
+
+    def record(self, timestamp: float, accessor_id: Optional[str] = None, value: Any = None,
+               input_value: Any = None, output_value: Any = None):
+        """Record one access, overwriting the oldest record when full"""
+        if self._length == self.capacity:
+            self._head = (self._head + 1) % self.capacity
+            self._length -= 1
+            self.total_evicted += 1
+
+        slot = (self._head + self._length) % self.capacity
+        mirror = slot + self.capacity
+        accessor = self.symbols.intern(accessor_id or 'unknown')
+        self._times[slot] = self._times[mirror] = timestamp
+        self._accessor_ids[slot] = self._accessor_ids[mirror] = accessor
+
+        has_value = value is not None or input_value is not None or output_value is not None
+        if has_value and self._value_ids is None:
+            self._allocate_value_columns()
+        if self._value_ids is not None:
+            value_id = self.symbols.intern(value)
+            digit = _digit_value(value)
+            search = _search_value(value)
+            oracle = _oracle_value(value, input_value, output_value)
+            self._value_ids[slot] = self._value_ids[mirror] = value_id
+            self._values[slot] = self._values[mirror] = digit
+            self._search_values[slot] = self._search_values[mirror] = search
+            self._oracle_values[slot] = self._oracle_values[mirror] = oracle
+
+        self._length += 1
+        self.total_recorded += 1
+        if self.features is not None:
+            self.features.on_record(self)
+
+    def append(self, access: Dict):
+        """Record a legacy access dict ({'time', 'accessor_id', 'value', ...})"""
+        self.record(
+            access['time'],
+            access.get('accessor_id'),
+            access.get('value'),
+            access.get('input'),
+            access.get('output')
+        )
+
+    def extend(self, timestamps: np.ndarray, accessor_ids: np.ndarray,
+               values: Optional[List[Any]] = None):
+        """Record a time-ordered block of accesses with vectorized column writes.
+
+        ``accessor_ids`` are already-interned ids. Features are rebuilt once
+        for the whole block rather than updated per record.
+        """
+        count = len(timestamps)
+        if count == 0:
+            return
+        if values is not None and self._value_ids is None:
+            self._allocate_value_columns()
+
+        # Only the newest `capacity` records of the block can survive
+        skip = max(count - self.capacity, 0)
+        overflow = self._length + count - self.capacity
+        slots = (self._head + self._length + np.arange(skip, count)) % self.capacity
+        mirrors = slots + self.capacity
+        self._times[slots] = self._times[mirrors] = timestamps[skip:]
+        self._accessor_ids[slots] = self._accessor_ids[mirrors] = accessor_ids[skip:]
+        if self._value_ids is not None:
+            block = values[skip:] if values is not None else [None] * (count - skip)
+            value_ids = np.fromiter((self.symbols.intern(v) for v in block), dtype=np.int32, count=len(block))
+            self._value_ids[slots] = self._value_ids[mirrors] = value_ids
+            for column, parse in ((self._values, _digit_value), (self._search_values, _search_value)):
+                column[slots] = column[mirrors] = np.fromiter((parse(v) for v in block), dtype=np.float64, count=len(block))
+            oracle = np.fromiter((_oracle_value(v, None, None) for v in block), dtype=np.float64, count=len(block))
+            self._oracle_values[slots] = self._oracle_values[mirrors] = oracle
+
+        if overflow > 0:
+            self._head = (self._head + overflow) % self.capacity
+            self._length = self.capacity
+            self.total_evicted += overflow
+        else:
+            self._length += count
+        self.total_recorded += count
+        if self.features is not None:
+            self.features.rebuild(self)
+
+    def _window(self, column: Optional[np.ndarray], last: Optional[int], fill: float) -> np.ndarray:
+        length = self._length if last is None else min(last, self._length)
+        if column is None:
+            return np.full(length, fill, dtype=np.float64)
+        start = self._head + self._length - length
+        return column[start:start + length]
+
+    def times(self, last: Optional[int] = None) -> np.ndarray:
+        """Access timestamps, oldest first (read-only view)"""
+        return self._window(self._times, last, 0.0)
+
+    def accessor_ids(self, last: Optional[int] = None) -> np.ndarray:
+        return self._window(self._accessor_ids, last, 0)
+
+    def value_ids(self, last: Optional[int] = None) -> np.ndarray:
+        """Interned raw access values; 0 means no value"""
+        if self._value_ids is None:
+            return np.zeros(self._length if last is None else min(last, self._length), dtype=np.int32)
+        return self._window(self._value_ids, last, 0)
+
+    def values(self, last: Optional[int] = None) -> np.ndarray:
+        """Digit-string access values, NaN where absent"""
+        return self._window(self._values, last, np.nan)
+
+    def search_values(self, last: Optional[int] = None) -> np.ndarray:
+        return self._window(self._search_values, last, np.nan)
+
+    def oracle_values(self, last: Optional[int] = None) -> np.ndarray:
+        return self._window(self._oracle_values, last, np.nan)
+
+    def last_time(self) -> Optional[float]:
+        if self._length == 0:
+            return None
+        return float(self._times[self._head + self._length - 1])
+
+    def count_since(self, cutoff: float) -> int:
+        """Number of accesses strictly after cutoff"""
+        times = self.times()
+        return self._length - int(np.searchsorted(times, cutoff, side='right'))
+
+    def has_access_near(self, timestamp: float, window: float) -> bool:
+        """Whether any access lies strictly within window seconds of timestamp"""
+        times = self.times()
+        index = int(np.searchsorted(times, timestamp - window, side='right'))
+        return index < self._length and times[index] < timestamp + window
+
+    def evict_before(self, cutoff: float) -> int:
+        """Drop records at or older than cutoff; returns the number evicted"""
+        if self._length == 0:
+            return 0
+        evicted = int(np.searchsorted(self.times(), cutoff, side='right'))
+        if evicted:
+            self._head = (self._head + evicted) % self.capacity
+            self._length -= evicted
+            self.total_evicted += evicted
+            if self.features is not None:
+                self.features.rebuild(self)
+        return evicted
+
+    def to_dicts(self, last: Optional[int] = None) -> List[Dict]:
+        """Materialize records as legacy access dicts (for reporting only)"""
+        times = self.times(last)
+        accessors = self.accessor_ids(last)
+        value_ids = self.value_ids(last)
+        records = []
+        for timestamp, accessor, value_id in zip(times, accessors, value_ids):
+            record = {
+                'time': float(timestamp),
+                'accessor_id': self.symbols.lookup(int(accessor)),
+                'token_id': self.token_id
+            }
+            if value_id:
+                record['value'] = self.symbols.lookup(int(value_id))
+            records.append(record)
+        return records
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by this buffer's columns"""
+        total = self._times.nbytes + self._accessor_ids.nbytes
+        for name in self.VALUE_COLUMNS:
+            column = getattr(self, f'_{name}')
+            if column is not None:
+                total += column.nbytes
+        return total
+
+
+def as_access_history(accesses: Union[AccessHistory, List[Dict]],
+                      feature_windows: Optional[Dict[int, Optional[str]]] = None) -> AccessHistory:
+    """Accept either an AccessHistory or a legacy list of access dicts"""
+    if isinstance(accesses, AccessHistory):
+        return accesses
+    return AccessHistory.from_accesses(accesses, feature_windows=feature_windows)
+
+
+class RecentTokenIndex:
+    """Rolling multiset of the tokens accessed in the last ``window`` seconds.
+
+    Accesses must arrive in time order; older ones are ignored. Answers "how
+    many distinct tokens were hit within ``window`` of the newest access" in
+    O(1) amortized.
+    """
+
+    def __init__(self, window: float = 0.05):
+        self.window = window
+        self._accesses: deque = deque()
+        self._token_counts: Dict[str, int] = {}
+        self.newest_time = -math.inf
+
+    def __len__(self) -> int:
+        return len(self._accesses)
+
+    def add(self, timestamp: float, token_id: str) -> bool:
+        """Index one access; returns False (and ignores it) if it is out of order"""
+        if timestamp < self.newest_time:
+            return False
+        self.newest_time = timestamp
+        self._accesses.append((timestamp, token_id))
+        self._token_counts[token_id] = self._token_counts.get(token_id, 0) + 1
+        self.expire(timestamp)
+        return True
+
+    def add_batch(self, token_ids: np.ndarray, timestamps: np.ndarray):
+        """Index a batch in global time order, skipping accesses already outside the window"""
+        if len(timestamps) == 0:
+            return
+        time_order = np.argsort(timestamps, kind='stable')
+        horizon = timestamps[time_order[-1]] - self.window
+        for i in time_order[np.searchsorted(timestamps[time_order], horizon, side='right'):]:
+            if timestamps[i] >= self.newest_time:
+                self.newest_time = timestamps[i]
+                token_id = str(token_ids[i])
+                self._accesses.append((timestamps[i], token_id))
+                self._token_counts[token_id] = self._token_counts.get(token_id, 0) + 1
+        self.expire(self.newest_time)
+
+    def expire(self, current_time: float):
+        cutoff = current_time - self.window
+        while self._accesses and self._accesses[0][0] <= cutoff:
+            _, token_id = self._accesses.popleft()
+            remaining = self._token_counts[token_id] - 1
+            if remaining:
+                self._token_counts[token_id] = remaining
+            else:
+                del self._token_counts[token_id]
+
+    def count(self, current_time: float) -> Optional[int]:
+        """Distinct tokens accessed within window of current_time.
+
+        Only answerable for current_time at or after the newest indexed
+        access; returns None otherwise.
+        """
+        if current_time < self.newest_time:
+            return None
+        self.expire(current_time)
+        return len(self._token_counts)
+
+    def snapshot(self) -> List[Tuple[float, str]]:
+        """Indexed (timestamp, token_id) pairs, oldest first"""
+        return list(self._accesses)
+
+
+class AccessHistoryStore:
+    """Token id -> AccessHistory mapping sharing one symbol table.
+
+    Behaves like the ``defaultdict(list)`` it replaces: indexing an unknown
+    token creates its buffer. Accesses recorded through ``record`` also feed a
+    rolling cross-token index so "how many tokens were hit in the last
+    ``recent_window`` seconds" is answered without scanning every token.
+
+    Recording, eviction and the feature rebuilds they trigger all run under
+    ``lock``. Callers that read a history's features after recording should
+    hold it too, so the monitor thread cannot evict in between.
+    """
+
+    def __init__(self, capacity_per_token: int = 1024,
+                 feature_windows: Optional[Dict[int, Optional[str]]] = None,
+                 recent_window: float = 0.05):
+        self.capacity_per_token = capacity_per_token
+        self.feature_windows = feature_windows
+        self.symbols = SymbolTable()
+        self._histories: Dict[str, AccessHistory] = {}
+        self.total_evicted = 0
+        self.recent_window = recent_window
+        self.recent_index = RecentTokenIndex(recent_window)
+        # Reentrant: record and the detectors' reads nest inside a caller's critical section
+        self.lock = threading.RLock()
+
+    def __getitem__(self, token_id: str) -> AccessHistory:
+        with self.lock:
+            history = self._histories.get(token_id)
+            if history is None:
+                history = AccessHistory(self.capacity_per_token, self.symbols, token_id,
+                                        self.feature_windows)
+                self._histories[token_id] = history
+            return history
+
+    def __contains__(self, token_id: str) -> bool:
+        return token_id in self._histories
+
+    def __len__(self) -> int:
+        return len(self._histories)
+
+    def __iter__(self):
+        return iter(self._histories)
+
+    def get(self, token_id: str, default: Any = None) -> Any:
+        return self._histories.get(token_id, default)
+
+    def keys(self):
+        return self._histories.keys()
+
+    def values(self):
+        return self._histories.values()
+
+    def items(self):
+        return self._histories.items()
+
+    def record(self, token_id: str, timestamp: float, accessor_id: Optional[str] = None,
+               value: Any = None) -> AccessHistory:
+        with self.lock:
+            history = self[token_id]
+            history.record(timestamp, accessor_id, value)
+            self.recent_index.add(timestamp, token_id)
+            return history
+
+    def record_batch(self, token_ids: np.ndarray, timestamps: np.ndarray,
+                     accessor_ids: np.ndarray, values: Optional[List[Any]] = None) -> Dict[str, AccessHistory]:
+        """Record a batch of accesses for many tokens.
+
+        The batch is grouped by token with a single lexsort; each token's
+        block is written with ``AccessHistory.extend``. Returns the histories
+        touched, keyed by token id.
+        """
+        token_ids = np.asarray(token_ids)
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        if len(token_ids) == 0:
+            return {}
+        accessor_ids = np.asarray([accessor or 'unknown' for accessor in accessor_ids], dtype=str)
+        unique_accessors, accessor_inverse = np.unique(accessor_ids, return_inverse=True)
+        interned = np.array([self.symbols.intern(a) for a in unique_accessors], dtype=np.int32)
+        accessor_codes = interned[accessor_inverse]
+
+        unique_tokens, token_codes = np.unique(token_ids, return_inverse=True)
+        order = np.lexsort((timestamps, token_codes))
+        sorted_codes = token_codes[order]
+        boundaries = np.flatnonzero(np.diff(sorted_codes)) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [len(order)]))
+
+        with self.lock:
+            touched: Dict[str, AccessHistory] = {}
+            for start, end in zip(starts, ends):
+                rows = order[start:end]
+                token_id = str(unique_tokens[sorted_codes[start]])
+                history = self[token_id]
+                block_times = timestamps[rows]
+                newest = history.last_time()
+                if newest is not None:
+                    # Keep each buffer time-ordered: late arrivals are clamped
+                    block_times = np.maximum(block_times, newest)
+                block_values = [values[i] for i in rows] if values is not None else None
+                history.extend(block_times, accessor_codes[rows], block_values)
+                touched[token_id] = history
+
+            # Feed the cross-token recent index in global time order
+            self.recent_index.add_batch(token_ids, timestamps)
+            return touched
+
+    def count_tokens_near(self, current_time: float, window: Optional[float] = None) -> int:
+        """Number of tokens with an access strictly within window seconds of current_time"""
+        with self.lock:
+            window = self.recent_window if window is None else window
+            if window == self.recent_window:
+                count = self.recent_index.count(current_time)
+                if count is not None:
+                    return count
+            return sum(
+                1 for history in self._histories.values()
+                if history.has_access_near(current_time, window)
+            )
+
+    def count_tokens_near_many(self, query_times: np.ndarray, window: Optional[float] = None) -> np.ndarray:
+        """count_tokens_near for many times with a single pass over the tracked tokens.
+
+        Times at or after the newest indexed access are answered by the
+        rolling index. The rest are answered from one time-sorted merge of
+        every access near the query range, two searchsorted lookups per time.
+        """
+        with self.lock:
+            window = self.recent_window if window is None else window
+            query_times = np.asarray(query_times, dtype=np.float64)
+            counts = np.zeros(len(query_times), dtype=np.int64)
+            if len(query_times) == 0:
+                return counts
+
+            pending = np.ones(len(query_times), dtype=bool)
+            if window == self.recent_window:
+                for i, query_time in enumerate(query_times.tolist()):
+                    count = self.recent_index.count(query_time)
+                    if count is not None:
+                        counts[i] = count
+                        pending[i] = False
+            if not pending.any():
+                return counts
+
+            low = query_times[pending].min() - window
+            high = query_times[pending].max() + window
+            time_parts, code_parts = [], []
+            for code, history in enumerate(list(self._histories.values())):
+                times = history.times()
+                first = int(np.searchsorted(times, low, side='right'))
+                last = int(np.searchsorted(times, high, side='left'))
+                if last > first:
+                    time_parts.append(times[first:last])
+                    code_parts.append(np.full(last - first, code, dtype=np.int64))
+            if not time_parts:
+                return counts
+
+            all_times = np.concatenate(time_parts)
+            all_codes = np.concatenate(code_parts)
+            order = np.argsort(all_times, kind='stable')
+            all_times = all_times[order]
+            all_codes = all_codes[order]
+            for i in np.flatnonzero(pending):
+                first = np.searchsorted(all_times, query_times[i] - window, side='right')
+                last = np.searchsorted(all_times, query_times[i] + window, side='left')
+                counts[i] = len(np.unique(all_codes[first:last]))
+            return counts
+
+    def evict_older_than(self, cutoff: float) -> int:
+        """Evict records older than cutoff and release empty buffers"""
+        evicted = 0
+        with self.lock:
+            for token_id in list(self._histories):
+                history = self._histories[token_id]
+                evicted += history.evict_before(cutoff)
+                if len(history) == 0:
+                    del self._histories[token_id]
+            self.total_evicted += evicted
+        return evicted
+
+    def get_memory_statistics(self, histories: Optional[List[AccessHistory]] = None) -> Dict[str, Any]:
+        """Memory footprint of the access history, or of a snapshot of its histories"""
+        if histories is None:
+            # Snapshot first: the monitor thread evicts entries while statistics are read
+            histories = list(self._histories.values())
+        total_bytes = sum(history.nbytes for history in histories)
+        total_records = sum(len(history) for history in histories)
+        # float64 time + int32 accessor, plus int32 value id + 3 float64 value columns
+        max_bytes_per_token = 2 * self.capacity_per_token * ((8 + 4) + (4 + 8 * 3))
+        return {
+            'tracked_tokens': len(histories),
+            'buffered_records': total_records,
+            'capacity_per_token': self.capacity_per_token,
+            'max_bytes_per_token': max_bytes_per_token,
+            'total_bytes': total_bytes,
+            'interned_symbols': len(self.symbols),
+            'total_evicted': self.total_evicted
+        }
@@ -12,6 +12,14 @@ from collections import defaultdict, deque
 from .quantum_detector import QuantumDetector, ThreatLevel, QuantumThreat
 from .temporal_fragmentation import TemporalFragmentation, FragmentationPolicy
 from .ai_learning_engine import AILearningEngine, Experience, get_learning_engine
+from .threat_bus import ThreatSubscription
+
+
+# Seconds between agent health checks and stats updates when no events arrive
+COORDINATION_MAINTENANCE_INTERVAL = 1.0
+
+# Bound on threats waiting for the coordinator; overflow is counted by the bus
+COORDINATOR_QUEUE_SIZE = 4096
 
 
 class AgentRole(Enum):
@@ -90,6 +98,7 @@ class AutonomousDefenseCoordinator:
         self.message_queue = asyncio.Queue()
         self.running = False
         self.coordination_task = None
+        self.threat_subscription: Optional[ThreatSubscription] = None
         
         # AI Learning integration
         self.learning_engine = get_learning_engine()
@@ -104,7 +113,8 @@ class AutonomousDefenseCoordinator:
             'successful_defenses': 0,
             'failed_defenses': 0,
             'average_response_time': 0.0,
-            'active_agents': 0
+            'active_agents': 0,
+            'threat_events': 0
         }
     
     def _initialize_agent_fleet(self):
@@ -226,7 +236,13 @@ class AutonomousDefenseCoordinator:
             return
         
         self.running = True
-        self.coordination_task = asyncio.create_task(self._coordination_loop())
+        
+        # Threats already active are coordinated once; new ones arrive on the bus
+        backlog = self.quantum_detector.get_active_threats()
+        self.threat_subscription = self.quantum_detector.threat_bus.subscribe(
+            "defense_coordinator", maxsize=COORDINATOR_QUEUE_SIZE
+        )
+        self.coordination_task = asyncio.create_task(self._coordination_loop(backlog))
         
         # Start quantum detector monitoring
         self.quantum_detector.start_monitoring()
@@ -240,6 +256,10 @@ class AutonomousDefenseCoordinator:
         """Stop the coordination system"""
         self.running = False
         
+        if self.threat_subscription:
+            self.threat_subscription.close()
+            self.threat_subscription = None
+        
         if self.coordination_task:
             self.coordination_task.cancel()
             try:
@@ -254,30 +274,64 @@ class AutonomousDefenseCoordinator:
         for agent in self.agents.values():
             agent.status = AgentStatus.OFFLINE
     
-    async def _coordination_loop(self):
-        """Main coordination loop for autonomous defense"""
-        while self.running:
-            try:
-                # Check for active quantum threats
-                active_threats = self.quantum_detector.get_active_threats()
-                
-                if active_threats:
-                    await self._coordinate_threat_response(active_threats)
-                
-                # Monitor agent health
-                await self._monitor_agent_health()
-                
-                # Process coordination messages
-                await self._process_coordination_messages()
-                
-                # Update coordination statistics
-                self._update_coordination_stats()
-                
-                await asyncio.sleep(0.05)  # 50ms coordination cycle
-                
-            except Exception as e:
-                print(f"Coordination error: {e}")
-                await asyncio.sleep(0.1)
+    async def _coordination_loop(self, backlog: Optional[List[QuantumThreat]] = None):
+        """Main coordination loop for autonomous defense.
+        
+        Sleeps until a threat is published on the detector's threat bus or a
+        coordination message arrives, so each new threat is coordinated
+        exactly once as soon as it is detected. Agent health and statistics
+        are refreshed on every wake-up and at least once per maintenance
+        interval.
+        """
+        subscription = self.threat_subscription
+        threat_wait = message_wait = None
+        try:
+            if backlog:
+                await self._coordinate_threat_response(backlog)
+            
+            while self.running:
+                try:
+                    if threat_wait is None:
+                        threat_wait = asyncio.ensure_future(subscription.get())
+                    if message_wait is None:
+                        message_wait = asyncio.ensure_future(self.message_queue.get())
+                    
+                    done, _ = await asyncio.wait(
+                        {threat_wait, message_wait},
+                        timeout=COORDINATION_MAINTENANCE_INTERVAL,
+                        return_when=asyncio.FIRST_COMPLETED
+                    )
+                    
+                    # Coordinate the new threat plus any that queued up behind it
+                    if threat_wait in done:
+                        threat = threat_wait.result()
+                        threat_wait = None
+                        if threat is None:
+                            break  # Subscription closed
+                        threats = [threat] + subscription.drain()
+                        self.coordination_stats['threat_events'] += len(threats)
+                        await self._coordinate_threat_response(threats)
+                    
+                    # Process coordination messages
+                    if message_wait in done:
+                        message = message_wait.result()
+                        message_wait = None
+                        await self._handle_coordination_message(message)
+                        await self._process_coordination_messages()
+                    
+                    # Monitor agent health
+                    await self._monitor_agent_health()
+                    
+                    # Update coordination statistics
+                    self._update_coordination_stats()
+                    
+                except Exception as e:
+                    print(f"Coordination error: {e}")
+                    await asyncio.sleep(0.1)
+        finally:
+            for waiter in (threat_wait, message_wait):
+                if waiter is not None:
+                    waiter.cancel()
     
     async def _coordinate_threat_response(self, threats: List[QuantumThreat]):
         """Coordinate autonomous response to quantum threats"""
@@ -0,0 +1,324 @@
+"""
+MWRASP Backup Storage
+Pluggable key -> bytes stores with expiry for the quantum backup engine
+"""
+
+import heapq
+import os
+import struct
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Set, Tuple, Union
+
+
+# Default width of one segment file's expiry range
+SEGMENT_SPAN_SECONDS = 3600.0
+
+# Segment record header: sequence number, expiry time, key length, data length
+RECORD_HEADER = struct.Struct('>QdHI')
+
+# Data length marking a deletion record
+TOMBSTONE = 0xFFFFFFFF
+
+
+class FragmentStore(ABC):
+    """Key -> bytes storage where every entry carries an expiry time.
+
+    Entries are not hidden once they expire; ``expire`` is what reclaims
+    them, so callers decide when cleanup runs. Supports the ``in``, ``[]``,
+    ``del`` and ``len`` operations of the dict it replaces.
+    """
+
+    @abstractmethod
+    def put(self, key: str, data: bytes, expires_at: float):
+        pass
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        pass
+
+    @abstractmethod
+    def expire(self, now: Optional[float] = None) -> int:
+        """Drop entries that expired at or before now; returns how many"""
+        pass
+
+    @abstractmethod
+    def keys(self) -> List[str]:
+        pass
+
+    @abstractmethod
+    def __contains__(self, key: str) -> bool:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @abstractmethod
+    def get_statistics(self) -> Dict[str, Any]:
+        pass
+
+    def __getitem__(self, key: str) -> bytes:
+        data = self.get(key)
+        if data is None:
+            raise KeyError(key)
+        return data
+
+    def __delitem__(self, key: str):
+        if not self.delete(key):
+            raise KeyError(key)
+
+    def close(self):
+        pass
+
+
+class InMemoryFragmentStore(FragmentStore):
+    """Dict-backed store with a heap of expiry times; nothing survives a restart"""
+
+    def __init__(self):
+        self._data: Dict[str, bytes] = {}
+        self._expiry: Dict[str, float] = {}
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+        self.entries_expired = 0
+
+    def put(self, key: str, data: bytes, expires_at: float):
+        data = bytes(data)
+        with self._lock:
+            self._data[key] = data
+            self._expiry[key] = expires_at
+            heapq.heappush(self._expiry_heap, (expires_at, key))
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            return self._data.get(key)
+
+    def _delete_locked(self, key: str) -> bool:
+        if key not in self._data:
+            return False
+        del self._data[key]
+        del self._expiry[key]
+        return True
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            return self._delete_locked(key)
+
+    def expire(self, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        dropped = 0
+        with self._lock:
+            while self._expiry_heap and self._expiry_heap[0][0] <= now:
+                expires_at, key = heapq.heappop(self._expiry_heap)
+                # Skip heap entries left behind by deletes and overwrites
+                if self._expiry.get(key) == expires_at:
+                    self._delete_locked(key)
+                    dropped += 1
+            self.entries_expired += dropped
+        return dropped
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'entries': len(self._data),
+                'stored_bytes': sum(len(data) for data in self._data.values()),
+                'entries_expired': self.entries_expired
+            }
+
+
+@dataclass
+class _Segment:
+    path: Path
+    file: BinaryIO
+    size: int = 0
+    keys: Set[str] = field(default_factory=set)
+
+
+class SegmentFileFragmentStore(FragmentStore):
+    """Append-only segment files on disk, one per expiry range, plus an in-memory index.
+
+    An entry goes to the segment covering ``segment_span`` seconds of expiry
+    times that contains its ``expires_at``. Writes only ever append, and
+    deletes append a tombstone. Expiry unlinks whole segment files once
+    their range has passed; it never rewrites or scans them. The index maps
+    each key to its segment, offset and length. It is rebuilt on open by
+    replaying record headers, so a store reopened on the same directory sees
+    everything that was written before.
+    """
+
+    def __init__(self, directory: Union[str, Path], segment_span: float = SEGMENT_SPAN_SECONDS):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_span = segment_span
+        self._index: Dict[str, Tuple[int, int, int, int]] = {}  # key -> (bucket, offset, length, sequence)
+        self._segments: Dict[int, _Segment] = {}
+        self._bucket_heap: List[int] = []
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self.segments_dropped = 0
+        self.entries_expired = 0
+        self._load()
+
+    def _bucket(self, expires_at: float) -> int:
+        return int(expires_at // self.segment_span)
+
+    def _open_segment(self, bucket: int) -> _Segment:
+        segment = self._segments.get(bucket)
+        if segment is None:
+            path = self.directory / f"{bucket:012d}.seg"
+            segment = _Segment(path=path, file=open(path, 'a+b'))
+            segment.size = segment.file.seek(0, os.SEEK_END)
+            self._segments[bucket] = segment
+            heapq.heappush(self._bucket_heap, bucket)
+        return segment
+
+    def _load(self):
+        """Rebuild the index by replaying every segment's record headers"""
+        deleted: Dict[str, int] = {}
+        for path in sorted(self.directory.glob('*.seg')):
+            bucket = int(path.stem)
+            segment = self._open_segment(bucket)
+            segment.file.seek(0)
+            offset = 0
+            while offset + RECORD_HEADER.size <= segment.size:
+                sequence, _, key_length, data_length = RECORD_HEADER.unpack(
+                    segment.file.read(RECORD_HEADER.size)
+                )
+                key = segment.file.read(key_length).decode()
+                data_offset = offset + RECORD_HEADER.size + key_length
+                record_end = data_offset + (0 if data_length == TOMBSTONE else data_length)
+                if record_end > segment.size:
+                    break
+                self._sequence = max(self._sequence, sequence)
+
+                # Segments replay in any order, so the highest sequence number wins
+                current = self._index.get(key)
+                if sequence > max(current[3] if current else -1, deleted.get(key, -1)):
+                    if data_length == TOMBSTONE:
+                        deleted[key] = sequence
+                        self._drop_index_entry(key)
+                    else:
+                        self._drop_index_entry(key)
+                        self._index[key] = (bucket, data_offset, data_length, sequence)
+                        segment.keys.add(key)
+                segment.file.seek(record_end)
+                offset = record_end
+
+            if offset < segment.size:
+                # Torn write at the tail: cut it off so appends start cleanly
+                segment.file.truncate(offset)
+                segment.size = offset
+
+    def _drop_index_entry(self, key: str):
+        entry = self._index.pop(key, None)
+        if entry is not None:
+            self._segments[entry[0]].keys.discard(key)
+
+    def _append(self, segment: _Segment, key: str, data: Optional[bytes], expires_at: float) -> Tuple[int, int]:
+        self._sequence += 1
+        encoded_key = key.encode()
+        header = RECORD_HEADER.pack(self._sequence, expires_at, len(encoded_key),
+                                    TOMBSTONE if data is None else len(data))
+        segment.file.write(header + encoded_key)
+        if data is not None:
+            segment.file.write(data)
+        segment.file.flush()
+        data_offset = segment.size + len(header) + len(encoded_key)
+        segment.size = data_offset + (0 if data is None else len(data))
+        return data_offset, self._sequence
+
+    def put(self, key: str, data: bytes, expires_at: float):
+        with self._lock:
+            self._delete_locked(key)
+            bucket = self._bucket(expires_at)
+            segment = self._open_segment(bucket)
+            offset, sequence = self._append(segment, key, bytes(data), expires_at)
+            self._index[key] = (bucket, offset, len(data), sequence)
+            segment.keys.add(key)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return None
+            bucket, offset, length, _ = entry
+            segment = self._segments[bucket]
+            segment.file.seek(offset)
+            return segment.file.read(length)
+
+    def _delete_locked(self, key: str) -> bool:
+        entry = self._index.get(key)
+        if entry is None:
+            return False
+        segment = self._segments[entry[0]]
+        self._append(segment, key, None, entry[0] * self.segment_span)
+        self._drop_index_entry(key)
+        return True
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            return self._delete_locked(key)
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Unlink every segment whose whole expiry range has passed"""
+        now = time.time() if now is None else now
+        dropped = 0
+        with self._lock:
+            while self._bucket_heap and (self._bucket_heap[0] + 1) * self.segment_span <= now:
+                bucket = heapq.heappop(self._bucket_heap)
+                segment = self._segments.pop(bucket)
+                segment.file.close()
+                segment.path.unlink()
+                for key in segment.keys:
+                    del self._index[key]
+                dropped += len(segment.keys)
+                self.segments_dropped += 1
+        self.entries_expired += dropped
+        return dropped
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'backend': 'segment_file',
+                'directory': str(self.directory),
+                'entries': len(self._index),
+                'segments': len(self._segments),
+                'stored_bytes': sum(segment.size for segment in self._segments.values()),
+                'segments_dropped': self.segments_dropped,
+                'entries_expired': self.entries_expired
+            }
+
+    def close(self):
+        with self._lock:
+            for segment in self._segments.values():
+                segment.file.close()
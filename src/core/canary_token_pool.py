@@ -0,0 +1,217 @@
+"""
+MWRASP Canary Token Minting Pool
+Background pre-minting of post-quantum token material and batched token backups
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from .post_quantum_crypto import QuantumSafeCanaryToken
+
+
+@dataclass
+class MintedTokenMaterial:
+    """Expensive, data-type independent part of a canary token"""
+    access_pattern: str
+    quantum_safe_token: Optional[QuantumSafeCanaryToken] = None
+    quantum_signature: Optional[str] = None
+    minted_at: float = 0.0
+
+
+class CanaryTokenMintPool:
+    """Keeps up to ``high_watermark`` pre-minted token materials ready.
+
+    ``take`` pops from a deque (O(1)); when the pool falls below
+    ``low_watermark`` a background thread refills it to the high watermark.
+    An empty pool falls back to minting inline. The refill thread starts on
+    the first ``take``.
+    """
+
+    def __init__(self, mint: Callable[[], MintedTokenMaterial],
+                 low_watermark: int = 64, high_watermark: int = 256):
+        if not 0 <= low_watermark <= high_watermark:
+            raise ValueError("watermarks must satisfy 0 <= low_watermark <= high_watermark")
+        self.mint = mint
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        self._available: deque = deque()
+        self._refill_needed = threading.Event()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        self.minted = 0
+        self.handed_out = 0
+        self.pool_hits = 0
+        self.pool_misses = 0
+        self.mint_seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self._available)
+
+    def _mint_one(self) -> MintedTokenMaterial:
+        started = time.perf_counter()
+        material = self.mint()
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.minted += 1
+            self.mint_seconds += elapsed
+        return material
+
+    def start(self):
+        with self._lock:
+            if self._running or self.high_watermark == 0:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._refill_loop, name="canary-token-mint", daemon=True)
+            self._thread.start()
+        self._refill_needed.set()
+
+    def stop(self):
+        with self._lock:
+            self._running = False
+            thread = self._thread
+            self._thread = None
+        self._refill_needed.set()
+        if thread:
+            thread.join(timeout=2.0)
+
+    def _refill_loop(self):
+        while self._running:
+            self._refill_needed.wait()
+            self._refill_needed.clear()
+            while self._running and len(self._available) < self.high_watermark:
+                try:
+                    self._available.append(self._mint_one())
+                except Exception as e:
+                    print(f"Canary token minting error: {e}")
+                    break
+
+    def take(self) -> MintedTokenMaterial:
+        """Hand out one pre-minted material, minting inline if the pool is empty"""
+        if not self._running:
+            self.start()
+        try:
+            material = self._available.popleft()
+            self.pool_hits += 1
+        except IndexError:
+            material = self._mint_one()
+            self.pool_misses += 1
+        self.handed_out += 1
+        if len(self._available) < self.low_watermark:
+            self._refill_needed.set()
+        return material
+
+    def take_many(self, count: int) -> List[MintedTokenMaterial]:
+        return [self.take() for _ in range(count)]
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            'available': len(self._available),
+            'low_watermark': self.low_watermark,
+            'high_watermark': self.high_watermark,
+            'minted': self.minted,
+            'handed_out': self.handed_out,
+            'pool_hits': self.pool_hits,
+            'pool_misses': self.pool_misses,
+            'mint_rate_per_second': self.minted / self.mint_seconds if self.mint_seconds > 0 else 0.0
+        }
+
+
+class CanaryBackupBatcher:
+    """Coalesces canary token backup records and writes them in batches.
+
+    Records are keyed by token id, so repeated backups of a token before the
+    next flush collapse into one. A background thread flushes every
+    ``flush_interval`` seconds, or as soon as ``max_batch`` records are
+    pending. ``write_batch`` receives the list of records for one batch.
+    """
+
+    def __init__(self, write_batch: Callable[[List[Dict[str, Any]]], Any],
+                 max_batch: int = 512, flush_interval: float = 1.0):
+        self.write_batch = write_batch
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._flush_requested = threading.Event()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.enqueued = 0
+        self.coalesced = 0
+        self.batches_written = 0
+        self.records_written = 0
+        self.failed_batches = 0
+
+    def start(self):
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._flush_loop, name="canary-backup-batcher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the flush thread after writing everything pending"""
+        with self._lock:
+            self._running = False
+            thread = self._thread
+            self._thread = None
+        self._flush_requested.set()
+        if thread:
+            thread.join(timeout=2.0)
+        self.flush()
+
+    def _flush_loop(self):
+        while self._running:
+            self._flush_requested.wait(self.flush_interval)
+            self._flush_requested.clear()
+            self.flush()
+
+    def enqueue(self, token_id: str, record: Dict[str, Any]):
+        if not self._running:
+            self.start()
+        with self._lock:
+            if token_id in self._pending:
+                self.coalesced += 1
+            self._pending[token_id] = record
+            self.enqueued += 1
+            full = len(self._pending) >= self.max_batch
+        if full:
+            self._flush_requested.set()
+
+    def flush(self) -> int:
+        """Write all pending records now; returns the number written"""
+        with self._write_lock:
+            with self._lock:
+                pending = list(self._pending.values())
+                self._pending = {}
+            written = 0
+            for start in range(0, len(pending), self.max_batch):
+                batch = pending[start:start + self.max_batch]
+                try:
+                    self.write_batch(batch)
+                except Exception as e:
+                    print(f"Warning: Failed to write canary token backup batch: {e}")
+                    self.failed_batches += 1
+                    continue
+                self.batches_written += 1
+                self.records_written += len(batch)
+                written += len(batch)
+            return written
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            'pending': len(self._pending),
+            'enqueued': self.enqueued,
+            'coalesced': self.coalesced,
+            'batches_written': self.batches_written,
+            'records_written': self.records_written,
+            'failed_batches': self.failed_batches,
+            'max_batch': self.max_batch
+        }
@@ -0,0 +1,146 @@
+"""
+MWRASP Circuit Validation Queue
+Bounded background worker pool for quantum circuit conversion validation
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from .quantum_circuit_converter import QuantumCircuitConverter, create_circuit_converter
+
+
+# Latency samples kept for percentile reporting
+LATENCY_SAMPLES = 1024
+
+
+class CircuitValidationQueue:
+    """Runs circuit-conversion validations on a small pool of worker threads.
+
+    Each worker owns one reusable QuantumCircuitConverter, so converters (and
+    their conversion caches) are never shared between threads. Jobs are
+    ``(subject, payload)`` pairs handed to ``validate(converter, subject,
+    payload)``. The queue is bounded: when ``max_pending`` jobs are waiting,
+    new submissions are dropped and counted rather than blocking the caller.
+    Workers start on the first submission.
+    """
+
+    def __init__(self, validate: Callable[[QuantumCircuitConverter, Any, Any], Any],
+                 workers: int = 2, max_pending: int = 256,
+                 converter_factory: Callable[[], QuantumCircuitConverter] = create_circuit_converter):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.validate = validate
+        self.workers = workers
+        self.max_pending = max_pending
+        self.converter_factory = converter_factory
+        self._jobs: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._in_flight = 0
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.dropped = 0
+        self._wait_times: deque = deque(maxlen=LATENCY_SAMPLES)
+        self._validation_times: deque = deque(maxlen=LATENCY_SAMPLES)
+
+    @property
+    def running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def _start(self):
+        self._threads = [
+            threading.Thread(target=self._worker_loop, name=f"circuit-validation-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, subject: Any, payload: Any) -> bool:
+        """Queue a validation; returns False if the queue is full"""
+        with self._lock:
+            if not self.running:
+                self._start()
+            try:
+                self._jobs.put_nowait((time.perf_counter(), subject, payload))
+            except queue.Full:
+                self.dropped += 1
+                return False
+            self.submitted += 1
+            self._in_flight += 1
+            return True
+
+    def _worker_loop(self):
+        converter = self.converter_factory()
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            submitted_at, subject, payload = job
+            started_at = time.perf_counter()
+            try:
+                self.validate(converter, subject, payload)
+                succeeded = True
+            except Exception as e:
+                print(f"Circuit validation error: {e}")
+                succeeded = False
+            finished_at = time.perf_counter()
+            with self._lock:
+                self._wait_times.append(started_at - submitted_at)
+                self._validation_times.append(finished_at - started_at)
+                if succeeded:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+                self._in_flight -= 1
+                if self._in_flight == 0:
+                    self._idle.notify_all()
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued validation has finished"""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._in_flight == 0, timeout)
+
+    def stop(self, timeout: float = 1.0):
+        """Stop the workers after the jobs already queued"""
+        with self._lock:
+            threads = self._threads
+            self._threads = []
+        for _ in threads:
+            self._jobs.put(None)
+        for thread in threads:
+            thread.join(timeout)
+
+    @staticmethod
+    def _percentiles(samples: deque) -> Dict[str, float]:
+        if not samples:
+            return {'p50_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0}
+        values = np.fromiter(samples, dtype=np.float64) * 1000.0
+        return {
+            'p50_ms': float(np.percentile(values, 50)),
+            'p95_ms': float(np.percentile(values, 95)),
+            'max_ms': float(values.max())
+        }
+
+    def get_statistics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'running': self.running,
+                'queue_depth': self._jobs.qsize(),
+                'in_flight': self._in_flight,
+                'max_pending': self.max_pending,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'dropped': self.dropped,
+                'queue_wait': self._percentiles(self._wait_times),
+                'validation_latency': self._percentiles(self._validation_times)
+            }
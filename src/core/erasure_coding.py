@@ -0,0 +1,191 @@
+"""
+MWRASP Erasure Coding
+Systematic Cauchy Reed-Solomon k-of-n erasure coding over GF(256)
+"""
+
+import time
+from typing import Any, Dict, List, Mapping, Sequence
+
+import numpy as np
+
+
+# x^8 + x^4 + x^3 + x^2 + 1, the usual Reed-Solomon field polynomial
+GF_POLYNOMIAL = 0x11D
+
+# Bytes per shard processed at a time, so lookups and XORs stay in cache
+CODING_BLOCK_SIZE = 64 * 1024
+
+
+def _build_tables():
+    exp = np.zeros(512, dtype=np.uint8)
+    log = np.zeros(256, dtype=np.int32)
+    x = 1
+    for power in range(255):
+        exp[power] = x
+        log[x] = power
+        x <<= 1
+        if x & 0x100:
+            x ^= GF_POLYNOMIAL
+    exp[255:510] = exp[:255]
+
+    # Full product table: MUL_TABLE[c] maps every byte b to c*b, so multiplying
+    # a whole shard by a constant is one table lookup per byte
+    mul = np.zeros((256, 256), dtype=np.uint8)
+    nonzero = np.arange(1, 256)
+    mul[1:, 1:] = exp[log[nonzero][:, None] + log[nonzero][None, :]]
+    return exp, log, mul
+
+
+GF_EXP, GF_LOG, MUL_TABLE = _build_tables()
+
+
+def gf_mul(a: int, b: int) -> int:
+    return int(MUL_TABLE[a, b])
+
+
+def gf_inverse(a: int) -> int:
+    if a == 0:
+        raise ZeroDivisionError("0 has no inverse in GF(256)")
+    return int(GF_EXP[255 - GF_LOG[a]])
+
+
+def gf_invert_matrix(matrix: np.ndarray) -> np.ndarray:
+    """Gauss-Jordan inversion of a square GF(256) matrix"""
+    size = len(matrix)
+    work = [list(map(int, row)) + [int(i == j) for j in range(size)] for i, row in enumerate(matrix)]
+    for column in range(size):
+        pivot = next((row for row in range(column, size) if work[row][column]), None)
+        if pivot is None:
+            raise ValueError("Matrix is singular over GF(256)")
+        work[column], work[pivot] = work[pivot], work[column]
+        scale = gf_inverse(work[column][column])
+        work[column] = [gf_mul(scale, value) for value in work[column]]
+        for row in range(size):
+            factor = work[row][column]
+            if row != column and factor:
+                work[row] = [value ^ gf_mul(factor, pivot_value)
+                             for value, pivot_value in zip(work[row], work[column])]
+    return np.array([row[size:] for row in work], dtype=np.uint8)
+
+
+def cauchy_matrix(data_shards: int, parity_shards: int) -> np.ndarray:
+    """Parity rows 1 / (x_i + y_j) with x_i = data_shards + i and y_j = j; every square submatrix is invertible"""
+    return np.array([
+        [gf_inverse((data_shards + i) ^ j) for j in range(data_shards)]
+        for i in range(parity_shards)
+    ], dtype=np.uint8)
+
+
+def _multiply_accumulate(coefficients: Sequence[int], shards: Sequence[np.ndarray], out: np.ndarray):
+    """out = XOR of coefficient * shard over GF(256), a cache-sized block at a time"""
+    terms = [(MUL_TABLE[coefficient], shard) for coefficient, shard in zip(coefficients, shards) if coefficient]
+    product = np.empty(min(CODING_BLOCK_SIZE, len(out)), dtype=np.uint8)
+    for start in range(0, len(out), CODING_BLOCK_SIZE):
+        block = out[start:start + CODING_BLOCK_SIZE]
+        scratch = product[:len(block)]
+        block[:] = 0
+        for table, shard in terms:
+            np.take(table, shard[start:start + CODING_BLOCK_SIZE], out=scratch)
+            np.bitwise_xor(block, scratch, out=block)
+
+
+class ReedSolomonCodec:
+    """Systematic k-of-n erasure code: any ``data_shards`` of the n shards rebuild the payload.
+
+    The first ``data_shards`` shards are the zero-padded payload itself; the
+    remaining ``parity_shards`` are Cauchy combinations of them. Row i of
+    ``matrix`` is the coding row of shard i. Encode and decode work on whole
+    shards at a time through the GF(256) product table, and the codec keeps
+    byte and time counters for throughput reporting.
+    """
+
+    def __init__(self, data_shards: int, parity_shards: int):
+        if data_shards < 1 or parity_shards < 0 or data_shards + parity_shards > 256:
+            raise ValueError("Need at least one data shard and at most 256 shards in total")
+        self.data_shards = data_shards
+        self.parity_shards = parity_shards
+        self.total_shards = data_shards + parity_shards
+        self.matrix = np.vstack([
+            np.eye(data_shards, dtype=np.uint8),
+            cauchy_matrix(data_shards, parity_shards)
+        ])
+        self._decode_matrices: Dict[tuple, np.ndarray] = {}
+
+        self.encoded_bytes = 0
+        self.encode_seconds = 0.0
+        self.decoded_bytes = 0
+        self.decode_seconds = 0.0
+        self.degraded_decodes = 0
+
+    def shard_size(self, length: int) -> int:
+        return -(-length // self.data_shards)
+
+    def encode(self, data: bytes) -> np.ndarray:
+        """Split and encode a payload into a (total_shards, shard_size) uint8 array"""
+        started = time.perf_counter()
+        payload = np.frombuffer(data, dtype=np.uint8)
+        size = self.shard_size(len(payload))
+        shards = np.zeros((self.total_shards, size), dtype=np.uint8)
+        shards[:self.data_shards].reshape(-1)[:len(payload)] = payload
+
+        for i in range(self.parity_shards):
+            _multiply_accumulate(self.matrix[self.data_shards + i], shards[:self.data_shards],
+                                 shards[self.data_shards + i])
+
+        self.encoded_bytes += len(payload)
+        self.encode_seconds += time.perf_counter() - started
+        return shards
+
+    def decode(self, shards: Mapping[int, Any], length: int) -> bytes:
+        """Rebuild ``length`` payload bytes from any ``data_shards`` of the shards, keyed by shard index"""
+        started = time.perf_counter()
+        available = sorted(index for index in shards if 0 <= index < self.total_shards)
+        if len(available) < self.data_shards:
+            raise ValueError(f"Need {self.data_shards} shards to decode, have {len(available)}")
+
+        # Prefer data shards (no arithmetic needed), then the lowest parity shards
+        chosen = available[:self.data_shards]
+        arrays = [np.frombuffer(shards[index], dtype=np.uint8) for index in chosen]
+        size = self.shard_size(length)
+        if any(len(array) != size for array in arrays):
+            raise ValueError(f"Shards must all be {size} bytes long")
+
+        output = np.empty((self.data_shards, size), dtype=np.uint8)
+        missing = [row for row in range(self.data_shards) if row not in shards]
+        for position, index in enumerate(chosen):
+            if index < self.data_shards:
+                output[index] = arrays[position]
+
+        if missing:
+            key = tuple(chosen)
+            inverse = self._decode_matrices.get(key)
+            if inverse is None:
+                inverse = gf_invert_matrix(self.matrix[chosen])
+                self._decode_matrices[key] = inverse
+            for row in missing:
+                _multiply_accumulate(inverse[row], arrays, output[row])
+            self.degraded_decodes += 1
+
+        data = output.reshape(-1)[:length].tobytes()
+        self.decoded_bytes += length
+        self.decode_seconds += time.perf_counter() - started
+        return data
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return coding_statistics([self])
+
+
+def coding_statistics(codecs: List[ReedSolomonCodec]) -> Dict[str, Any]:
+    """Combined byte counts and MB/s encode and decode throughput of several codecs"""
+    encoded = sum(codec.encoded_bytes for codec in codecs)
+    encode_seconds = sum(codec.encode_seconds for codec in codecs)
+    decoded = sum(codec.decoded_bytes for codec in codecs)
+    decode_seconds = sum(codec.decode_seconds for codec in codecs)
+    return {
+        'codes': sorted(f"{codec.data_shards}-of-{codec.total_shards}" for codec in codecs),
+        'encoded_bytes': encoded,
+        'decoded_bytes': decoded,
+        'degraded_decodes': sum(codec.degraded_decodes for codec in codecs),
+        'encode_mb_per_second': encoded / encode_seconds / 1e6 if encode_seconds > 0 else 0.0,
+        'decode_mb_per_second': decoded / decode_seconds / 1e6 if decode_seconds > 0 else 0.0
+    }
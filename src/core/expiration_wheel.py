@@ -0,0 +1,258 @@
+"""
+MWRASP Expiration Wheel
+Single-threaded hierarchical timing wheel for fragment expiration
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+
+# Tick-lag samples kept for percentile reporting
+LAG_SAMPLES = 1024
+
+# Fraction of a tick absorbed when mapping times to ticks, so float noise at
+# exact tick boundaries does not push a deadline a whole tick later
+_TICK_TOLERANCE = 1e-6
+
+
+class ExpirationWheel:
+    """Hierarchical timing wheel that expires keys in batches, one tick at a time.
+
+    Level 0 has ``slots`` buckets of one ``tick`` each; every higher level has
+    ``slots`` buckets covering a whole turn of the level below. ``schedule``
+    and ``cancel`` are O(1) dict operations; when a lower level wraps, the
+    current bucket of the next level is cascaded down. Deadlines beyond the
+    top level park in its farthest bucket and are re-placed as they cascade.
+
+    Entries never fire early. Everything due on a tick is handed to
+    ``on_expire`` as one list of ``(key, payload)`` pairs, called from the
+    wheel thread without the wheel lock held. The thread starts on the first
+    ``schedule`` and sleeps while the wheel is empty. ``advance`` can also be
+    driven directly (e.g. with a fake ``clock``) instead of starting the
+    thread.
+    """
+
+    def __init__(self, on_expire: Callable[[List[Tuple[Hashable, Any]]], Any],
+                 tick: float = 0.005, slots: int = 256, levels: int = 4,
+                 clock: Callable[[], float] = time.time, autostart: bool = True):
+        if tick <= 0 or slots < 2 or levels < 1:
+            raise ValueError("tick must be positive, slots at least 2 and levels at least 1")
+        self.on_expire = on_expire
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self.clock = clock
+        self.autostart = autostart
+
+        self._wheels: List[List[Dict[Hashable, Any]]] = [[{} for _ in range(slots)] for _ in range(levels)]
+        self._entries: Dict[Hashable, Tuple[int, int, int]] = {}  # key -> (level, slot, expiry tick)
+        self._origin = clock()
+        self._current_tick = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.scheduled = 0
+        self.cancelled = 0
+        self.expired = 0
+        self.cascaded = 0
+        self.ticks = 0
+        self.largest_batch = 0
+        self.max_lag = 0.0
+        self._lags: deque = deque(maxlen=LAG_SAMPLES)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    # -- placement ----------------------------------------------------------
+
+    def _tick_for(self, deadline: float) -> int:
+        """First tick at or after the deadline, and always in the future"""
+        return max(self._current_tick + 1, math.ceil((deadline - self._origin) / self.tick - _TICK_TOLERANCE))
+
+    def _place(self, key: Hashable, payload: Any, expiry_tick: int):
+        delta = expiry_tick - self._current_tick
+        level = 0
+        span = self.slots
+        while level < self.levels - 1 and delta >= span:
+            level += 1
+            span *= self.slots
+        if delta >= span:
+            # Beyond the wheel: park in the top level's farthest bucket
+            slot = (self._current_tick // (span // self.slots) - 1) % self.slots
+        else:
+            slot = (expiry_tick // (span // self.slots)) % self.slots
+        self._wheels[level][slot][key] = payload
+        self._entries[key] = (level, slot, expiry_tick)
+
+    def schedule(self, key: Hashable, deadline: float, payload: Any = None):
+        """Expire ``key`` at ``deadline`` (clock time), replacing any earlier schedule"""
+        with self._lock:
+            self._remove(key)
+            self._place(key, payload, self._tick_for(deadline))
+            self.scheduled += 1
+            if len(self._entries) == 1:
+                self._wakeup.notify()
+        if self.autostart and not self._running:
+            self.start()
+
+    def _remove(self, key: Hashable) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        level, slot, _ = entry
+        self._wheels[level][slot].pop(key, None)
+        return True
+
+    def cancel(self, key: Hashable) -> bool:
+        with self._lock:
+            removed = self._remove(key)
+            if removed:
+                self.cancelled += 1
+            return removed
+
+    def clear(self):
+        """Cancel everything scheduled"""
+        with self._lock:
+            self.cancelled += len(self._entries)
+            self._entries.clear()
+            for wheel in self._wheels:
+                for bucket in wheel:
+                    bucket.clear()
+
+    # -- ticking ------------------------------------------------------------
+
+    def _cascade(self, level: int):
+        span = self.slots ** level
+        bucket = self._wheels[level][(self._current_tick // span) % self.slots]
+        if not bucket:
+            return
+        entries = list(bucket.items())
+        bucket.clear()
+        for key, payload in entries:
+            expiry_tick = self._entries[key][2]
+            self._place(key, payload, expiry_tick)
+        self.cascaded += len(entries)
+
+    def _advance_one(self) -> List[Tuple[Hashable, Any]]:
+        self._current_tick += 1
+        self.ticks += 1
+        # Cascade from the highest wrapped level down so entries can fall through
+        wrapped = 0
+        span = self.slots
+        while wrapped < self.levels - 1 and self._current_tick % span == 0:
+            wrapped += 1
+            span *= self.slots
+        for level in range(wrapped, 0, -1):
+            self._cascade(level)
+
+        bucket = self._wheels[0][self._current_tick % self.slots]
+        if not bucket:
+            return []
+        entries = list(bucket.items())
+        bucket.clear()
+        due = []
+        for key, payload in entries:
+            expiry_tick = self._entries[key][2]
+            if expiry_tick > self._current_tick:
+                # Parked beyond the wheel's horizon
+                self._place(key, payload, expiry_tick)
+                continue
+            del self._entries[key]
+            due.append((key, payload))
+        return due
+
+    def advance(self, now: Optional[float] = None) -> int:
+        """Process every tick due by ``now``; returns the number of keys expired"""
+        now = self.clock() if now is None else now
+        target_tick = math.floor((now - self._origin) / self.tick + _TICK_TOLERANCE)
+        expired = 0
+        while True:
+            with self._lock:
+                if self._current_tick >= target_tick:
+                    break
+                if not self._entries:
+                    # Nothing to expire or cascade: jump straight to now
+                    self._current_tick = target_tick
+                    break
+                due = self._advance_one()
+                lag = now - (self._origin + self._current_tick * self.tick)
+            if due:
+                self._lags.append(lag)
+                self.max_lag = max(self.max_lag, lag)
+                self.expired += len(due)
+                self.largest_batch = max(self.largest_batch, len(due))
+                expired += len(due)
+                try:
+                    self.on_expire(due)
+                except Exception as e:
+                    print(f"Expiration callback error: {e}")
+        return expired
+
+    def start(self):
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="expiration-wheel", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        with self._lock:
+            self._running = False
+            thread = self._thread
+            self._thread = None
+            self._wakeup.notify_all()
+        if thread:
+            thread.join(timeout=1.0)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while self._running and not self._entries:
+                    self._wakeup.wait()
+                if not self._running:
+                    return
+                next_tick_at = self._origin + (self._current_tick + 1) * self.tick
+            delay = next_tick_at - self.clock()
+            if delay > 0:
+                time.sleep(delay)
+            self.advance()
+
+    # -- reporting ----------------------------------------------------------
+
+    def get_statistics(self) -> Dict[str, Any]:
+        if self._lags:
+            lags = np.fromiter(self._lags, dtype=np.float64) * 1000.0
+            lag_stats = {
+                'p50_ms': float(np.percentile(lags, 50)),
+                'p95_ms': float(np.percentile(lags, 95)),
+                'p99_ms': float(np.percentile(lags, 99)),
+                'max_ms': self.max_lag * 1000.0
+            }
+        else:
+            lag_stats = {'p50_ms': 0.0, 'p95_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+        return {
+            'pending': len(self._entries),
+            'tick_ms': self.tick * 1000.0,
+            'slots': self.slots,
+            'levels': self.levels,
+            'horizon_seconds': self.tick * self.slots ** self.levels,
+            'running': self._running,
+            'scheduled': self.scheduled,
+            'cancelled': self.cancelled,
+            'expired': self.expired,
+            'cascaded': self.cascaded,
+            'ticks': self.ticks,
+            'largest_batch': self.largest_batch,
+            'scheduler_lag': lag_stats
+        }
@@ -20,6 +20,13 @@ import numpy as np
 from .real_legal_sources import RealLegalConflictChecker, LegalConflict, ComplianceRequirement
 
 
+# Legal barriers kept on a routing decision
+LEGAL_BARRIER_LIMIT = 10
+
+# Greedy jurisdiction selections cached per (available jurisdictions, threshold, min_hostility)
+ROUTING_CACHE_SIZE = 256
+
+
 class HostilityLevel(Enum):
     """Legal hostility classification levels"""
     CRITICAL = 0.9  # Active warfare, complete breakdown
@@ -100,6 +107,18 @@ class LegalConflictEngine:
     def __init__(self, enable_real_time_tracking: bool = True, enable_jurisdiction_control: bool = True):
         self.jurisdictions = {}
         self.hostility_matrix = {}
+        # Dense total hostility scores indexed by jurisdiction ordinal, mirroring hostility_matrix
+        self.jurisdiction_ordinals: Dict[str, int] = {}
+        self.hostility_array = np.zeros((0, 0))
+        self._routing_cache: Dict[Tuple, Tuple[List[str], List[str], float]] = {}
+        # Bumped on every hostility change; cached routing selections are keyed by it
+        self.hostility_version = 0
+        self._hostility_inputs: Dict[str, Tuple] = {}  # code -> snapshot of fields its row and column depend on
+        self._diplomatic_inputs: Dict[str, Dict[str, float]] = {}  # code -> diplomatic_status snapshot (per pair)
+        self._hostility_overrides: Dict[Tuple[str, str], HostilityScore] = {}  # real legal conflicts
+        self.hostility_recomputations = 0
+        self.routing_cache_hits = 0
+        self.routing_cache_misses = 0
         self.temporal_constraints = {}
         self.routing_history = []
         self.performance_metrics = {
@@ -241,18 +260,165 @@ class LegalConflictEngine:
     def _calculate_hostility_matrix(self):
         """Calculate comprehensive hostility scores between all jurisdiction pairs"""
         
-        for source_code, source_jurisdiction in self.jurisdictions.items():
-            self.hostility_matrix[source_code] = {}
-            
-            for target_code, target_jurisdiction in self.jurisdictions.items():
-                if source_code != target_code:
-                    score = self._calculate_bilateral_hostility(source_jurisdiction, target_jurisdiction)
-                    self.hostility_matrix[source_code][target_code] = score
-                else:
-                    # Self-hostility is zero
-                    self.hostility_matrix[source_code][target_code] = HostilityScore(
-                        0, 0, 0, 0, 0, 0, 0
-                    )
+        self.jurisdiction_ordinals = {code: i for i, code in enumerate(self.jurisdictions)}
+        self.hostility_array = np.zeros((len(self.jurisdictions), len(self.jurisdictions)))
+        self.hostility_matrix = {}
+        
+        for source_code in self.jurisdictions:
+            for target_code in self.jurisdictions:
+                self._recompute_hostility_pair(source_code, target_code)
+        
+        self._hostility_inputs = {
+            code: self._jurisdiction_hostility_inputs(jurisdiction)
+            for code, jurisdiction in self.jurisdictions.items()
+        }
+        self._diplomatic_inputs = {
+            code: dict(jurisdiction.diplomatic_status)
+            for code, jurisdiction in self.jurisdictions.items()
+        }
+        self._bump_hostility_version()
+
+    @staticmethod
+    def _jurisdiction_hostility_inputs(jurisdiction: Jurisdiction) -> Tuple:
+        """Fields of a jurisdiction that feed its whole row and column, as a comparable snapshot"""
+        
+        # diplomatic_status is tracked per pair instead: each entry feeds one score
+        return (
+            jurisdiction.legal_framework,
+            tuple(jurisdiction.blocking_statutes),
+            tuple(jurisdiction.data_laws),
+            tuple(jurisdiction.sanctions_list),
+            tuple(jurisdiction.mlat_treaties),
+            jurisdiction.enforcement_capability
+        )
+
+    def _recompute_hostility_pair(self, source_code: str, target_code: str):
+        """Recalculate one bilateral score, honouring real legal conflict overrides"""
+        
+        self.hostility_recomputations += 1
+        if source_code == target_code:
+            # Self-hostility is zero
+            score = HostilityScore(0, 0, 0, 0, 0, 0, 0)
+        elif (source_code, target_code) in self._hostility_overrides:
+            score = self._hostility_overrides[(source_code, target_code)]
+        else:
+            score = self._calculate_bilateral_hostility(
+                self.jurisdictions[source_code], self.jurisdictions[target_code]
+            )
+        self._set_hostility(source_code, target_code, score)
+
+    def refresh_hostility(self, jurisdiction_codes: List[str] = None) -> int:
+        """
+        Incrementally recompute hostility after jurisdiction changes
+        
+        A jurisdiction's sanctions, MLAT treaties, blocking statutes, data laws,
+        legal framework and enforcement capability feed both its row (as
+        source) and its column (as target), so only those pairs are
+        recalculated for jurisdictions whose inputs changed since the last
+        refresh (or for ``jurisdiction_codes`` when given). A changed
+        ``diplomatic_status`` entry recalculates just its own pair. Adding or
+        removing jurisdictions falls back to a full recalculation. Returns the
+        number of pairs recalculated; any change bumps ``hostility_version``.
+        """
+        
+        if set(self.jurisdictions) != set(self.jurisdiction_ordinals):
+            self._calculate_hostility_matrix()
+            return len(self.jurisdictions) ** 2
+        
+        changed = []
+        for code in (jurisdiction_codes if jurisdiction_codes is not None else self.jurisdictions):
+            if code not in self.jurisdictions:
+                continue
+            inputs = self._jurisdiction_hostility_inputs(self.jurisdictions[code])
+            if jurisdiction_codes is not None or inputs != self._hostility_inputs.get(code):
+                self._hostility_inputs[code] = inputs
+                changed.append(code)
+        
+        pairs = set()
+        for code in changed:
+            for other in self.jurisdictions:
+                pairs.add((code, other))
+                pairs.add((other, code))
+        
+        for code, jurisdiction in self.jurisdictions.items():
+            previous = self._diplomatic_inputs.get(code, {})
+            if jurisdiction.diplomatic_status != previous:
+                for target_code in set(previous) | set(jurisdiction.diplomatic_status):
+                    if (target_code in self.jurisdictions and
+                            previous.get(target_code) != jurisdiction.diplomatic_status.get(target_code)):
+                        pairs.add((code, target_code))
+                self._diplomatic_inputs[code] = dict(jurisdiction.diplomatic_status)
+        
+        for source_code, target_code in pairs:
+            self._recompute_hostility_pair(source_code, target_code)
+        if pairs:
+            self._bump_hostility_version()
+        return len(pairs)
+
+    def update_jurisdiction(self, jurisdiction_code: str, **changes) -> int:
+        """Change jurisdiction fields (e.g. sanctions_list, mlat_treaties) and recompute its row and column"""
+        
+        jurisdiction = self.jurisdictions[jurisdiction_code]
+        for field_name, value in changes.items():
+            if not hasattr(jurisdiction, field_name):
+                raise AttributeError(f"Jurisdiction has no field {field_name!r}")
+            setattr(jurisdiction, field_name, value)
+        return self.refresh_hostility([jurisdiction_code])
+
+    def _apply_legal_conflicts(self, conflicts: List[LegalConflict]) -> int:
+        """Replace real legal conflict overrides, recomputing only pairs that gained or lost one"""
+        
+        overrides = {}
+        for conflict in conflicts:
+            if (conflict.source_jurisdiction in self.jurisdictions and 
+                conflict.target_jurisdiction in self.jurisdictions and
+                conflict.source_jurisdiction != conflict.target_jurisdiction):
+                
+                # Convert conflict severity to hostility score
+                hostility_score = conflict.severity
+                overrides[(conflict.source_jurisdiction, conflict.target_jurisdiction)] = HostilityScore(
+                    criminal_penalties=hostility_score * 0.3,
+                    civil_fines=hostility_score * 0.3,
+                    enforcement_probability=0.0,
+                    diplomatic_hostility=hostility_score * 0.4,
+                    treaty_conflicts=0.0,
+                    blocking_statute_strength=0.0,
+                    total_score=hostility_score
+                )
+        
+        affected = {
+            pair for pair in set(overrides) | set(self._hostility_overrides)
+            if overrides.get(pair) != self._hostility_overrides.get(pair)
+        }
+        self._hostility_overrides = overrides
+        
+        for source_code, target_code in affected:
+            self._recompute_hostility_pair(source_code, target_code)
+            print(f"[PATENT] Updated hostility: {source_code} -> {target_code} = "
+                  f"{self.hostility_matrix[source_code][target_code].total_score:.2f}")
+        if affected:
+            self._bump_hostility_version()
+        return len(affected)
+
+    def _bump_hostility_version(self):
+        """Record a hostility change; routing selections cached under older versions are dropped"""
+        
+        self.hostility_version += 1
+        self._invalidate_routing_cache()
+
+    def _set_hostility(self, source_code: str, target_code: str, score: HostilityScore):
+        """Store a bilateral score in both the detailed matrix and the dense array"""
+        
+        self.hostility_matrix.setdefault(source_code, {})[target_code] = score
+        source_ordinal = self.jurisdiction_ordinals.get(source_code)
+        target_ordinal = self.jurisdiction_ordinals.get(target_code)
+        if source_ordinal is not None and target_ordinal is not None:
+            self.hostility_array[source_ordinal, target_ordinal] = score.total_score
+
+    def _invalidate_routing_cache(self):
+        """Drop cached jurisdiction selections after hostility or policy changes"""
+        
+        self._routing_cache.clear()
 
     def _calculate_bilateral_hostility(self, j1: Jurisdiction, j2: Jurisdiction) -> HostilityScore:
         """Calculate hostility score between two jurisdictions using patented algorithm"""
@@ -327,6 +493,101 @@ class LegalConflictEngine:
         
         start_time = time.time()
         
+        available_jurisdictions, threshold = await self._resolve_available_jurisdictions(
+            threshold, data_type, user_clearance
+        )
+        selected_jurisdictions, legal_barriers, total_impossibility = self._select_hostile_jurisdictions(
+            available_jurisdictions, threshold, min_hostility
+        )
+        
+        routing_decision = self._create_routing_decision(
+            fragment_id,
+            selected_jurisdictions,
+            self._calculate_hostility_scores(selected_jurisdictions),
+            legal_barriers,
+            self._get_current_temporal_constraints(selected_jurisdictions),
+            total_impossibility
+        )
+        
+        # Record performance metrics
+        latency_ms = (time.time() - start_time) * 1000
+        self.performance_metrics['routing_latency_ms'].append(latency_ms)
+        self.performance_metrics['legal_impossibility_rate'] = total_impossibility
+        
+        # Store decision in immutable history
+        self.routing_history.append(routing_decision)
+        
+        print(f"[PATENT] Hostile routing selected: {selected_jurisdictions} "
+              f"(impossibility: {total_impossibility:.4f}, latency: {latency_ms:.1f}ms)")
+        
+        return routing_decision
+
+    async def select_maximally_hostile_routing_batch(
+        self,
+        fragment_ids: List[str],
+        threshold: int = 3,
+        min_hostility: float = 0.7,
+        data_type: str = None,
+        user_clearance: str = None
+    ) -> List[RoutingDecision]:
+        """
+        Select hostile routing for every fragment of a group in one call
+        
+        Jurisdiction filtering, legal validation, greedy selection, hostility
+        scores and temporal constraints depend only on the routing parameters,
+        so they are computed once and shared; each fragment gets its own
+        decision record and hash. Returns decisions in ``fragment_ids`` order.
+        """
+        
+        if not fragment_ids:
+            return []
+        
+        start_time = time.time()
+        
+        available_jurisdictions, threshold = await self._resolve_available_jurisdictions(
+            threshold, data_type, user_clearance
+        )
+        selected_jurisdictions, legal_barriers, total_impossibility = self._select_hostile_jurisdictions(
+            available_jurisdictions, threshold, min_hostility
+        )
+        hostility_scores = self._calculate_hostility_scores(selected_jurisdictions)
+        temporal_constraints = self._get_current_temporal_constraints(selected_jurisdictions)
+        
+        routing_decisions = [
+            self._create_routing_decision(
+                fragment_id,
+                list(selected_jurisdictions),
+                dict(hostility_scores),
+                list(legal_barriers),
+                dict(temporal_constraints),
+                total_impossibility
+            )
+            for fragment_id in fragment_ids
+        ]
+        
+        # Record performance metrics, amortized over the group
+        latency_ms = (time.time() - start_time) * 1000
+        self.performance_metrics['routing_latency_ms'].extend(
+            [latency_ms / len(routing_decisions)] * len(routing_decisions)
+        )
+        self.performance_metrics['legal_impossibility_rate'] = total_impossibility
+        
+        # Store decisions in immutable history
+        self.routing_history.extend(routing_decisions)
+        
+        print(f"[PATENT] Hostile routing selected for {len(routing_decisions)} fragments: {selected_jurisdictions} "
+              f"(impossibility: {total_impossibility:.4f}, latency: {latency_ms:.1f}ms)")
+        
+        return routing_decisions
+
+    async def _resolve_available_jurisdictions(
+        self,
+        threshold: int,
+        data_type: str = None,
+        user_clearance: str = None
+    ) -> Tuple[List[str], int]:
+        """Jurisdictions eligible for routing, ordered by legal risk, and the effective threshold"""
+        
         # Get available jurisdictions based on control settings
         if self.jurisdiction_controller:
             # Use jurisdiction controller to filter active jurisdictions
@@ -363,14 +624,22 @@ class LegalConflictEngine:
         # Validate routing using real legal data
         if data_type and len(available_jurisdictions) >= 2:
             source_jurisdiction = available_jurisdictions[0]
+            destinations = available_jurisdictions[1:]
+            
+            # Check every potential destination for real legal conflicts concurrently
+            results = await asyncio.gather(
+                *(self.real_legal_checker.data_source.validate_data_routing(
+                    source_jurisdiction, destination, data_type
+                ) for destination in destinations),
+                return_exceptions=True
+            )
             
-            # Check each potential destination for real legal conflicts
             validated_jurisdictions = []
-            for destination in available_jurisdictions[1:]:
+            for destination, result in zip(destinations, results):
                 try:
-                    is_valid, reason = await self.real_legal_checker.data_source.validate_data_routing(
-                        source_jurisdiction, destination, data_type
-                    )
+                    if isinstance(result, Exception):
+                        raise result
+                    is_valid, reason = result
                     
                     if not is_valid:
                         print(f"[PATENT] Legal validation blocked {source_jurisdiction} -> {destination}: {reason}")
@@ -391,87 +660,119 @@ class LegalConflictEngine:
             available_jurisdictions = [source_jurisdiction] + [j[0] for j in validated_jurisdictions]
             
             print(f"[PATENT] Legal validation completed: {len(validated_jurisdictions)} destinations assessed")
+        
+        return available_jurisdictions, threshold
+
+    def _select_hostile_jurisdictions(
+        self,
+        available_jurisdictions: List[str],
+        threshold: int,
+        min_hostility: float
+    ) -> Tuple[List[str], List[str], float]:
+        """Greedy selection for maximum cumulative hostility; returns (selected, barriers, impossibility)"""
+        
+        cache_key = (self.hostility_version, tuple(available_jurisdictions), threshold, min_hostility)
+        cached = self._routing_cache.get(cache_key)
+        if cached is None:
+            self.routing_cache_misses += 1
+            cached = self._greedy_hostile_selection(available_jurisdictions, threshold, min_hostility)
+            if len(self._routing_cache) >= ROUTING_CACHE_SIZE:
+                self._routing_cache.pop(next(iter(self._routing_cache)))
+            self._routing_cache[cache_key] = cached
+        else:
+            self.routing_cache_hits += 1
+        
+        selected_jurisdictions, legal_barriers, total_impossibility = cached
+        return list(selected_jurisdictions), list(legal_barriers), total_impossibility
 
-        # Calculate optimal jurisdiction assignment for maximum hostility
-        selected_jurisdictions = []
+    def _greedy_hostile_selection(
+        self,
+        available_jurisdictions: List[str],
+        threshold: int,
+        min_hostility: float
+    ) -> Tuple[List[str], List[str], float]:
+        """
+        Pick, one at a time, the remaining jurisdiction with the highest average
+        hostility towards those already selected (at least ``min_hostility``),
+        falling back to the first remaining one. Row sums over the dense
+        hostility array replace the per-candidate Python loops.
+        """
+        
+        ordinals = np.array([self.jurisdiction_ordinals[code] for code in available_jurisdictions], dtype=np.intp)
+        remaining = np.ones(len(ordinals), dtype=bool)
+        selected_positions: List[int] = []
         legal_barriers = []
         total_impossibility = 1.0
         
-        # Greedy selection for maximum cumulative hostility
-        remaining_jurisdictions = available_jurisdictions.copy()
-        
         for _ in range(threshold):
-            if not remaining_jurisdictions:
+            if not remaining.any():
                 break
-                
-            best_jurisdiction = None
-            best_hostility = 0.0
             
-            for candidate in remaining_jurisdictions:
-                # Calculate cumulative hostility with already selected jurisdictions
-                cumulative_hostility = 0.0
-                barrier_count = 0
-                
-                for selected in selected_jurisdictions:
-                    hostility = self.hostility_matrix[candidate][selected].total_score
-                    cumulative_hostility += hostility
-                    
-                    # Count legal barriers
-                    if hostility > 0.5:
-                        barrier_count += 1
-                        legal_barriers.append(f"{candidate}-{selected}: {hostility:.2f}")
-                
-                # Prefer jurisdictions that maximize conflict with existing selections
-                avg_hostility = cumulative_hostility / max(len(selected_jurisdictions), 1)
-                
-                if avg_hostility > best_hostility and avg_hostility >= min_hostility:
-                    best_hostility = avg_hostility
-                    best_jurisdiction = candidate
+            candidates = np.flatnonzero(remaining)
+            hostility = self.hostility_array[np.ix_(ordinals[candidates], ordinals[selected_positions])]
+            
+            # Record legal barriers between candidates and selections, in candidate order
+            if len(legal_barriers) < LEGAL_BARRIER_LIMIT:
+                for row, column in zip(*np.nonzero(hostility > 0.5)):
+                    legal_barriers.append(
+                        f"{available_jurisdictions[candidates[row]]}-"
+                        f"{available_jurisdictions[selected_positions[column]]}: {hostility[row, column]:.2f}"
+                    )
+                    if len(legal_barriers) >= LEGAL_BARRIER_LIMIT:
+                        break
+            
+            # Prefer jurisdictions that maximize conflict with existing selections
+            avg_hostility = hostility.sum(axis=1) / max(len(selected_positions), 1)
+            eligible = (avg_hostility > 0.0) & (avg_hostility >= min_hostility)
             
-            if best_jurisdiction:
-                selected_jurisdictions.append(best_jurisdiction)
-                remaining_jurisdictions.remove(best_jurisdiction)
+            if eligible.any():
+                best = int(np.argmax(np.where(eligible, avg_hostility, -np.inf)))
+                best_hostility = float(avg_hostility[best])
                 total_impossibility *= (1 - (1 - best_hostility) * 0.1)  # Compound impossibility
             else:
-                # If no highly hostile jurisdiction available, select randomly
-                if remaining_jurisdictions:
-                    fallback = remaining_jurisdictions.pop(0)
-                    selected_jurisdictions.append(fallback)
+                # If no highly hostile jurisdiction available, take the first remaining
+                best = 0
+            
+            selected_positions.append(int(candidates[best]))
+            remaining[candidates[best]] = False
+        
+        selected_jurisdictions = [available_jurisdictions[position] for position in selected_positions]
+        return selected_jurisdictions, legal_barriers, total_impossibility
+
+    def _calculate_hostility_scores(self, selected_jurisdictions: List[str]) -> Dict[str, float]:
+        """Average hostility of each selected jurisdiction towards the others"""
+        
+        ordinals = [self.jurisdiction_ordinals[code] for code in selected_jurisdictions]
+        hostility = self.hostility_array[np.ix_(ordinals, ordinals)]
         
-        # Calculate hostility scores for decision record
         hostility_scores = {}
-        for jurisdiction in selected_jurisdictions:
-            avg_hostility = np.mean([
-                self.hostility_matrix[jurisdiction][other].total_score
-                for other in selected_jurisdictions if other != jurisdiction
-            ])
-            hostility_scores[jurisdiction] = float(avg_hostility)
-        
-        # Create routing decision record
-        routing_decision = RoutingDecision(
+        for i, jurisdiction in enumerate(selected_jurisdictions):
+            others = [j for j, other in enumerate(selected_jurisdictions) if other != jurisdiction]
+            hostility_scores[jurisdiction] = float(np.mean(hostility[i, others]))
+        return hostility_scores
+
+    def _create_routing_decision(
+        self,
+        fragment_id: str,
+        selected_jurisdictions: List[str],
+        hostility_scores: Dict[str, float],
+        legal_barriers: List[str],
+        temporal_constraints: Dict[str, str],
+        total_impossibility: float
+    ) -> RoutingDecision:
+        """Create routing decision record"""
+        
+        return RoutingDecision(
             fragment_id=fragment_id,
             source_jurisdiction="ORIGIN",
             target_jurisdictions=selected_jurisdictions,
             hostility_scores=hostility_scores,
-            legal_barriers=legal_barriers[:10],  # Limit for performance
-            temporal_constraints=self._get_current_temporal_constraints(selected_jurisdictions),
+            legal_barriers=legal_barriers[:LEGAL_BARRIER_LIMIT],  # Limit for performance
+            temporal_constraints=temporal_constraints,
             impossibility_confidence=min(total_impossibility, 0.9999),
             timestamp=time.time(),
             decision_hash=self._generate_decision_hash(fragment_id, selected_jurisdictions)
         )
-        
-        # Record performance metrics
-        latency_ms = (time.time() - start_time) * 1000
-        self.performance_metrics['routing_latency_ms'].append(latency_ms)
-        self.performance_metrics['legal_impossibility_rate'] = total_impossibility
-        
-        # Store decision in immutable history
-        self.routing_history.append(routing_decision)
-        
-        print(f"[PATENT] Hostile routing selected: {selected_jurisdictions} "
-              f"(impossibility: {total_impossibility:.4f}, latency: {latency_ms:.1f}ms)")
-        
-        return routing_decision
 
     def _get_current_temporal_constraints(self, jurisdictions: List[str]) -> Dict[str, str]:
         """Get temporal-legal constraints for selected jurisdictions"""
@@ -607,12 +908,15 @@ class LegalConflictEngine:
         """Update hostility score for specific jurisdiction pair"""
         
         if source_code in self.jurisdictions and target_code in self.jurisdictions:
-            source_j = self.jurisdictions[source_code]
-            target_j = self.jurisdictions[target_code]
-            
             # Recalculate bilateral hostility
-            new_score = self._calculate_bilateral_hostility(source_j, target_j)
-            self.hostility_matrix[source_code][target_code] = new_score
+            self._recompute_hostility_pair(source_code, target_code)
+            diplomatic_status = self.jurisdictions[source_code].diplomatic_status
+            snapshot = self._diplomatic_inputs.setdefault(source_code, {})
+            if target_code in diplomatic_status:
+                snapshot[target_code] = diplomatic_status[target_code]
+            else:
+                snapshot.pop(target_code, None)
+            self._bump_hostility_version()
 
     async def _update_temporal_constraints(self):
         """Update temporal-legal routing constraints"""
@@ -657,29 +961,9 @@ class LegalConflictEngine:
                 # Update real legal data
                 await self.real_legal_checker.update_legal_data(jurisdiction_codes)
                 
-                # Get active conflicts and update hostility matrix
+                # Get active conflicts and update the affected hostility pairs
                 active_conflicts = self.real_legal_checker.get_active_conflicts()
-                
-                for conflict in active_conflicts:
-                    # Update hostility matrix with real conflict data
-                    if (conflict.source_jurisdiction in self.jurisdictions and 
-                        conflict.target_jurisdiction in self.jurisdictions):
-                        
-                        # Convert conflict severity to hostility score
-                        hostility_score = conflict.severity
-                        
-                        # Update bilateral hostility
-                        if conflict.source_jurisdiction not in self.hostility_matrix:
-                            self.hostility_matrix[conflict.source_jurisdiction] = {}
-                        
-                        self.hostility_matrix[conflict.source_jurisdiction][conflict.target_jurisdiction] = HostilityScore(
-                            diplomatic_score=hostility_score * 0.4,
-                            economic_score=hostility_score * 0.3,
-                            legal_score=hostility_score * 0.3,
-                            total_score=hostility_score
-                        )
-                        
-                        print(f"[PATENT] Updated hostility: {conflict.source_jurisdiction} -> {conflict.target_jurisdiction} = {hostility_score:.2f}")
+                self._apply_legal_conflicts(active_conflicts)
                 
                 # Update compliance requirements
                 for jurisdiction_code in jurisdiction_codes:
@@ -697,6 +981,9 @@ class LegalConflictEngine:
                         
                         jurisdiction.data_laws = data_laws
                 
+                # Recompute rows and columns of jurisdictions whose data laws changed
+                self.refresh_hostility()
+                
                 print(f"[PATENT] Real legal data updated: {len(active_conflicts)} conflicts processed")
                 
                 # Update every 30 minutes for real legal changes
@@ -718,11 +1005,13 @@ class LegalConflictEngine:
         
         metrics['total_routing_decisions'] = len(self.routing_history)
         metrics['active_jurisdictions'] = len(self.jurisdictions)
-        metrics['hostile_pairs'] = sum(
-            1 for source in self.hostility_matrix.values()
-            for target_score in source.values()
-            if target_score.total_score > 0.7
-        )
+        metrics['hostile_pairs'] = int(np.count_nonzero(self.hostility_array > 0.7))
+        metrics['hostility_version'] = self.hostility_version
+        metrics['routing_cache'] = {
+            'entries': len(self._routing_cache),
+            'hits': self.routing_cache_hits,
+            'misses': self.routing_cache_misses
+        }
         
         return metrics
 
@@ -742,12 +1031,16 @@ class LegalConflictEngine:
         from .jurisdiction_control import JurisdictionStatus
         try:
             status_enum = JurisdictionStatus(status)
-            return self.jurisdiction_controller.set_jurisdiction_status(
+            updated = self.jurisdiction_controller.set_jurisdiction_status(
                 jurisdiction_code, status_enum, updated_by, reason
             )
         except ValueError:
             print(f"[PATENT] Invalid status: {status}")
             return False
+        
+        if updated:
+            self._invalidate_routing_cache()
+        return updated
 
     def activate_routing_policy(self, policy_name: str, updated_by: str = 'admin') -> bool:
         """Activate a specific routing policy"""
@@ -755,7 +1048,10 @@ class LegalConflictEngine:
             print("[PATENT] Jurisdiction control not available")
             return False
         
-        return self.jurisdiction_controller.activate_policy(policy_name, updated_by)
+        activated = self.jurisdiction_controller.activate_policy(policy_name, updated_by)
+        if activated:
+            self._invalidate_routing_cache()
+        return activated
 
     def toggle_emergency_mode(self, enabled: bool, activated_by: str = 'admin') -> bool:
         """Toggle emergency mode for maximum legal barriers"""
@@ -763,7 +1059,10 @@ class LegalConflictEngine:
             print("[PATENT] Jurisdiction control not available")
             return False
         
-        return self.jurisdiction_controller.toggle_emergency_mode(enabled, activated_by)
+        toggled = self.jurisdiction_controller.toggle_emergency_mode(enabled, activated_by)
+        if toggled:
+            self._invalidate_routing_cache()
+        return toggled
 
     def get_jurisdiction_control_status(self) -> Dict[str, Any]:
         """Get comprehensive jurisdiction control status"""
@@ -823,7 +1122,10 @@ class LegalConflictEngine:
             print("[PATENT] Jurisdiction control not available")
             return False
         
-        return self.jurisdiction_controller.import_configuration(config_data, imported_by)
+        imported = self.jurisdiction_controller.import_configuration(config_data, imported_by)
+        if imported:
+            self._invalidate_routing_cache()
+        return imported
 
 
 # Factory function for integration with existing MWRASP systems
@@ -0,0 +1,134 @@
+"""
+MWRASP Detection Pattern Cache
+Bounded LRU/TTL cache for window-shape detection results, keyed on access window content
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Sequence
+
+import numpy as np
+
+from .access_history import AccessHistory
+
+
+# Inter-access intervals are quantized to 0.1ms buckets before hashing. Every
+# rapid-query threshold is a multiple of this, so those counts are preserved;
+# ratio and difference tests are not, and are keyed by their exact outcome.
+INTERVAL_QUANTUM = 1e-4
+
+# Absorbs float noise for intervals that sit exactly on a bucket edge
+_QUANTIZE_TOLERANCE = 1e-6
+
+
+def _quantize(intervals) -> np.ndarray:
+    return np.floor(np.asarray(intervals) / INTERVAL_QUANTUM + _QUANTIZE_TOLERANCE).astype(np.int64)
+
+
+def window_fingerprint(history: AccessHistory, window: int, exact_outcomes: Sequence[bool] = ()) -> bytes:
+    """Content-derived key for the last ``window`` accesses of a history.
+
+    Covers the (capped) history length, the mean interval over the whole
+    history, the quantized intervals and the value columns of the window.
+    Threshold tests on ratios or differences of intervals are not preserved
+    by quantization, so callers pass their results on the exact intervals as
+    ``exact_outcomes``. Token identity and absolute time are deliberately
+    excluded so the same attack shape on different tokens maps to the same key.
+    """
+    length = len(history)
+    times = history.times(last=window)
+    digest = hashlib.blake2b(digest_size=16)
+    if length >= 2:
+        all_times = history.times()
+        mean_interval = (all_times[-1] - all_times[0]) / (length - 1)
+        quantized_mean = int(_quantize(mean_interval))
+    else:
+        quantized_mean = 0
+    digest.update(np.array([min(length, window + 1), quantized_mean], dtype=np.int64).tobytes())
+    digest.update(_quantize(np.diff(times)).tobytes())
+    digest.update(history.value_ids(last=window).astype(np.int32).tobytes())
+    digest.update(history.oracle_values(last=window).tobytes())
+    digest.update(np.array(exact_outcomes, dtype=np.bool_).tobytes())
+    return digest.digest()
+
+
+class PatternCache:
+    """Thread-safe LRU cache whose entries also expire ``ttl`` seconds after insertion.
+
+    Lookups and inserts are O(1); the least recently used entry is evicted
+    once ``max_entries`` is reached. Expired entries are dropped lazily on
+    lookup and from the LRU end by ``purge_expired``.
+    """
+
+    def __init__(self, max_entries: int = 4096, ttl: float = 5.0):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable, now: float) -> Optional[Any]:
+        """Cached value for key, or None on a miss or expired entry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if now - stored_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any, now: float):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self._entries[key] = (now, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def purge_expired(self, now: float) -> int:
+        """Drop expired entries from the least recently used end"""
+        purged = 0
+        with self._lock:
+            while self._entries:
+                key, (stored_at, _) = next(iter(self._entries.items()))
+                if now - stored_at < self.ttl:
+                    break
+                del self._entries[key]
+                purged += 1
+            self.expirations += purged
+        return purged
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
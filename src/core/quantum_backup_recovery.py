@@ -4,18 +4,25 @@ Advanced quantum-resistant backup with temporal fragmentation and distributed re
 """
 
 import asyncio
+import heapq
 import time
 import hashlib
 import secrets
 import numpy as np
 from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 from enum import Enum
 import json
 import threading
 from collections import defaultdict
 
+from .backup_storage import FragmentStore, InMemoryFragmentStore
+
+
+# Storage key prefix for persisted backup records
+RECORD_KEY_PREFIX = "record:"
+
 
 class QuantumBackupType(Enum):
     FULL_QUANTUM_SAFE = "full_quantum_safe"
@@ -56,6 +63,20 @@ class QuantumBackupRecord:
     def get_age_seconds(self) -> float:
         """Get age of backup in seconds"""
         return time.time() - self.created_at
+    
+    def to_bytes(self) -> bytes:
+        record = asdict(self)
+        record['backup_type'] = self.backup_type.value
+        record['recovery_priority'] = self.recovery_priority.value
+        return json.dumps(record).encode()
+    
+    @staticmethod
+    def from_bytes(data: bytes) -> 'QuantumBackupRecord':
+        record = json.loads(data.decode())
+        record['backup_type'] = QuantumBackupType(record['backup_type'])
+        record['recovery_priority'] = RecoveryPriority(record['recovery_priority'])
+        record['temporal_checkpoints'] = [tuple(checkpoint) for checkpoint in record['temporal_checkpoints']]
+        return QuantumBackupRecord(**record)
 
 
 @dataclass
@@ -71,10 +92,16 @@ class QuantumRecoveryPoint:
 
 
 class QuantumBackupEngine:
-    def __init__(self):
+    def __init__(self, storage: Optional[FragmentStore] = None):
         self.backup_records: Dict[str, QuantumBackupRecord] = {}
         self.recovery_points: Dict[str, QuantumRecoveryPoint] = {}
-        self.quantum_storage_fragments: Dict[str, bytes] = {}
+        # Fragments and backup records; pass a SegmentFileFragmentStore to keep them across restarts
+        self.quantum_storage_fragments: FragmentStore = (
+            storage if storage is not None else InMemoryFragmentStore()
+        )
+        self._backup_expiry: List[Tuple[float, str]] = []  # (expires_at, backup_id) min-heap
+        # Backups are registered from the token backup thread and expired by the monitor thread
+        self._lock = threading.RLock()
         self.temporal_backup_chains: Dict[str, List[str]] = defaultdict(list)
         self.quantum_noise_generators: Dict[str, np.random.RandomState] = {}
         self.monitoring_thread: Optional[threading.Thread] = None
@@ -86,6 +113,8 @@ class QuantumBackupEngine:
         self.quantum_decoherence_timeout = 3600.0  # 1 hour
         self.cross_temporal_replication_regions = 3
         
+        self._load_backup_records()
+        
     def create_quantum_backup(
         self,
         source_system: str,
@@ -108,11 +137,19 @@ class QuantumBackupEngine:
         # Apply quantum noise obfuscation to data
         obfuscated_data = self._apply_quantum_noise_obfuscation(data, noise_generator)
         
+        # Calculate backup expiration based on type and priority
+        expires_at = self._calculate_backup_expiration(
+            current_time, 
+            backup_type, 
+            recovery_priority
+        )
+        
         # Create temporal fragments with quantum distribution
         fragment_map = self._create_quantum_fragments(
             obfuscated_data, 
             backup_id, 
-            self.default_fragment_count
+            self.default_fragment_count,
+            expires_at
         )
         
         # Generate quantum signature for verification
@@ -125,13 +162,6 @@ class QuantumBackupEngine:
             backup_type
         )
         
-        # Calculate backup expiration based on type and priority
-        expires_at = self._calculate_backup_expiration(
-            current_time, 
-            backup_type, 
-            recovery_priority
-        )
-        
         # Create backup record
         backup_record = QuantumBackupRecord(
             backup_id=backup_id,
@@ -150,17 +180,37 @@ class QuantumBackupEngine:
             cross_temporal_replicated=True
         )
         
-        self.backup_records[backup_id] = backup_record
-        
-        # Add to temporal backup chain
-        chain_key = f"{source_system}_{backup_type.value}"
-        self.temporal_backup_chains[chain_key].append(backup_id)
-        
         # Perform cross-temporal replication
         self._perform_cross_temporal_replication(backup_record)
         
+        self._register_backup(backup_record)
+        self.quantum_storage_fragments.put(
+            RECORD_KEY_PREFIX + backup_id, backup_record.to_bytes(), expires_at
+        )
+        
         return backup_id
     
+    def _register_backup(self, backup_record: QuantumBackupRecord):
+        """Index a backup record by id, temporal chain and expiry time"""
+        with self._lock:
+            self.backup_records[backup_record.backup_id] = backup_record
+            
+            # Add to temporal backup chain
+            chain_key = f"{backup_record.source_system}_{backup_record.backup_type.value}"
+            self.temporal_backup_chains[chain_key].append(backup_record.backup_id)
+            
+            heapq.heappush(self._backup_expiry, (backup_record.expires_at, backup_record.backup_id))
+    
+    def _load_backup_records(self):
+        """Re-register the backup records kept in storage, oldest first"""
+        records = [
+            QuantumBackupRecord.from_bytes(self.quantum_storage_fragments[key])
+            for key in self.quantum_storage_fragments.keys()
+            if key.startswith(RECORD_KEY_PREFIX)
+        ]
+        for backup_record in sorted(records, key=lambda record: record.created_at):
+            self._register_backup(backup_record)
+    
     def _apply_quantum_noise_obfuscation(
         self, 
         data: bytes, 
@@ -186,7 +236,7 @@ class QuantumBackupEngine:
         # Combine quantum noise effects
         obfuscated_array = (
             data_array ^ decoherence_noise ^ superposition_mask ^ interference_noise
-        ) % 256
+        )
         
         return obfuscated_array.astype(np.uint8).tobytes()
     
@@ -194,7 +244,8 @@ class QuantumBackupEngine:
         self, 
         data: bytes, 
         backup_id: str, 
-        fragment_count: int
+        fragment_count: int,
+        expires_at: float
     ) -> Dict[str, str]:
         """Create quantum-distributed fragments with temporal distribution"""
         
@@ -228,8 +279,8 @@ class QuantumBackupEngine:
                 fragment_noise
             )
             
-            # Store fragment in quantum storage
-            self.quantum_storage_fragments[fragment_id] = noisy_fragment
+            # Store fragment in quantum storage until the backup itself expires
+            self.quantum_storage_fragments.put(fragment_id, noisy_fragment, expires_at)
             
             # Add temporal expiration to fragment
             temporal_expiry = time.time() + self.quantum_decoherence_timeout
@@ -363,25 +414,21 @@ class QuantumBackupEngine:
         if not backup_record.is_valid():
             return None
         
-        # Get noise generator for deobfuscation
-        if backup_id not in self.quantum_noise_generators:
-            # Reconstruct noise generator from seed
-            noise_generator = np.random.RandomState(
-                int(hashlib.sha256(backup_record.quantum_noise_seed.encode()).hexdigest()[:8], 16)
-            )
-            self.quantum_noise_generators[backup_id] = noise_generator
-        else:
-            noise_generator = self.quantum_noise_generators[backup_id]
+        # Reconstruct the noise generator from its seed: the cached one has
+        # already been advanced by obfuscation
+        noise_generator = np.random.RandomState(
+            int(hashlib.sha256(backup_record.quantum_noise_seed.encode()).hexdigest()[:8], 16)
+        )
         
         # Recover fragments in temporal order
         recovered_fragments = []
         for fragment_id in sorted(backup_record.fragment_map.keys()):
-            if fragment_id in self.quantum_storage_fragments:
-                fragment_data = self.quantum_storage_fragments[fragment_id]
-                
+            fragment_data = self.quantum_storage_fragments.get(fragment_id)
+            if fragment_data is not None:
                 # Reverse quantum noise obfuscation for fragment
+                fragment_index = int(fragment_id.split('_')[-2])
                 fragment_noise_seed = hashlib.sha256(
-                    f"{backup_id}_{fragment_id.split('_')[-2]}_{fragment_id}".encode()
+                    f"{backup_id}_{fragment_index}_{fragment_id}".encode()
                 ).digest()
                 fragment_noise = np.random.RandomState(
                     int.from_bytes(fragment_noise_seed[:4], 'big')
@@ -396,8 +443,8 @@ class QuantumBackupEngine:
         if not recovered_fragments:
             return None
         
-        # Reconstruct data from fragments
-        reconstructed_data = b''.join(recovered_fragments)
+        # Reconstruct data from fragments, dropping any quantum padding
+        reconstructed_data = b''.join(recovered_fragments)[:backup_record.size_bytes]
         
         # Reverse global quantum noise obfuscation
         clean_data = self._reverse_quantum_noise_obfuscation(
@@ -437,7 +484,7 @@ class QuantumBackupEngine:
         # Reverse the quantum noise effects (XOR is its own inverse)
         recovered_array = (
             obfuscated_array ^ decoherence_noise ^ superposition_mask ^ interference_noise
-        ) % 256
+        )
         
         return recovered_array.astype(np.uint8).tobytes()
     
@@ -523,16 +570,10 @@ class QuantumBackupEngine:
                 current_time = time.time()
                 
                 # Clean up expired backups
-                expired_backups = [
-                    backup_id for backup_id, record in self.backup_records.items()
-                    if not record.is_valid()
-                ]
+                self._expire_backups(current_time)
                 
-                for backup_id in expired_backups:
-                    self._cleanup_expired_backup(backup_id)
-                
-                # Clean up orphaned fragments
-                self._cleanup_orphaned_fragments()
+                # Drop fragment storage whose expiry has passed
+                self._cleanup_orphaned_fragments(current_time)
                 
                 # Update temporal coherence for recovery points
                 self._update_temporal_coherence()
@@ -543,22 +584,30 @@ class QuantumBackupEngine:
                 print(f"Quantum backup monitoring error: {e}")
                 time.sleep(10.0)
     
+    def _expire_backups(self, current_time: Optional[float] = None) -> int:
+        """Clean up backups due by current_time, popped off the expiry heap"""
+        current_time = time.time() if current_time is None else current_time
+        expired = 0
+        with self._lock:
+            while self._backup_expiry and self._backup_expiry[0][0] <= current_time:
+                _, backup_id = heapq.heappop(self._backup_expiry)
+                if backup_id in self.backup_records:
+                    self._cleanup_expired_backup(backup_id)
+                    expired += 1
+        return expired
+    
     def _cleanup_expired_backup(self, backup_id: str):
-        """Clean up expired backup and its fragments"""
+        """Clean up an expired backup record; its fragments go when storage expires them"""
         if backup_id not in self.backup_records:
             return
         
         backup_record = self.backup_records[backup_id]
         
-        # Remove fragments from quantum storage
-        for fragment_id in backup_record.fragment_map.keys():
-            if fragment_id in self.quantum_storage_fragments:
-                del self.quantum_storage_fragments[fragment_id]
-        
-        # Remove from temporal chains
-        for chain_key, chain_backups in self.temporal_backup_chains.items():
-            if backup_id in chain_backups:
-                chain_backups.remove(backup_id)
+        # Remove from temporal chain
+        chain_key = f"{backup_record.source_system}_{backup_record.backup_type.value}"
+        chain_backups = self.temporal_backup_chains.get(chain_key, [])
+        if backup_id in chain_backups:
+            chain_backups.remove(backup_id)
         
         # Remove noise generator
         if backup_id in self.quantum_noise_generators:
@@ -567,17 +616,13 @@ class QuantumBackupEngine:
         # Remove backup record
         del self.backup_records[backup_id]
     
-    def _cleanup_orphaned_fragments(self):
-        """Clean up fragments that no longer have backup records"""
-        active_fragments = set()
-        
-        for backup_record in self.backup_records.values():
-            active_fragments.update(backup_record.fragment_map.keys())
-        
-        orphaned_fragments = set(self.quantum_storage_fragments.keys()) - active_fragments
-        
-        for fragment_id in orphaned_fragments:
-            del self.quantum_storage_fragments[fragment_id]
+    def _cleanup_orphaned_fragments(self, current_time: Optional[float] = None) -> int:
+        """Drop stored fragments and records of expired backups.
+
+        Fragments share their backup's expiry time, so the storage expiry
+        index finds them without comparing key sets.
+        """
+        return self.quantum_storage_fragments.expire(current_time)
     
     def _update_temporal_coherence(self):
         """Update temporal coherence scores for recovery points"""
@@ -601,16 +646,24 @@ class QuantumBackupEngine:
         """Get comprehensive backup system statistics"""
         current_time = time.time()
         
-        active_backups = [r for r in self.backup_records.values() if r.is_valid()]
-        expired_backups = [r for r in self.backup_records.values() if not r.is_valid()]
+        with self._lock:
+            records = list(self.backup_records.values())
+            chain_sizes = {
+                chain_key: len(chain_backups)
+                for chain_key, chain_backups in self.temporal_backup_chains.items()
+            }
+        active_backups = [r for r in records if r.is_valid()]
+        expired_backups = [r for r in records if not r.is_valid()]
         
         stats = {
             "quantum_backups": {
-                "total_backups": len(self.backup_records),
+                "total_backups": len(records),
                 "active_backups": len(active_backups),
                 "expired_backups": len(expired_backups),
                 "total_size_bytes": sum(r.size_bytes for r in active_backups),
-                "quantum_fragments": len(self.quantum_storage_fragments),
+                "quantum_fragments": sum(
+                    len(r.fragment_map) for r in active_backups
+                ),
                 "recovery_points": len(self.recovery_points)
             },
             "backup_types": {
@@ -627,10 +680,8 @@ class QuantumBackupEngine:
                 ])
                 for priority in RecoveryPriority
             },
-            "temporal_chains": {
-                chain_key: len(chain_backups)
-                for chain_key, chain_backups in self.temporal_backup_chains.items()
-            },
+            "storage": self.quantum_storage_fragments.get_statistics(),
+            "temporal_chains": chain_sizes,
             "quantum_features": {
                 "post_quantum_encrypted": len([
                     r for r in active_backups if r.post_quantum_encrypted
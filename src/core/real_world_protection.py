@@ -6,6 +6,7 @@ Monitors and protects actual files, directories, and network traffic
 
 import os
 import time
+import asyncio
 import hashlib
 import json
 from typing import List, Dict, Set, Optional, Any
@@ -17,6 +18,7 @@ import socket
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
 import subprocess
 import winreg
 
@@ -189,9 +191,8 @@ class RealWorldProtectionManager:
             
             self.protected_files[file_path] = protected_file
             
-            # Fragment sensitive content if file is small enough
-            if os.path.getsize(file_path) < 1024 * 1024:  # < 1MB
-                self._fragment_file_content(file_path)
+            # Fragment sensitive content (streamed when the fragmentation system supports it)
+            self._fragment_file_content(file_path)
             
             return True
             
@@ -211,23 +212,50 @@ class RealWorldProtectionManager:
         except:
             return ""
     
-    def _fragment_file_content(self, file_path: str):
-        """Fragment sensitive file content using temporal fragmentation"""
+    def _fragment_file_content(self, file_path: str) -> int:
+        """Fragment sensitive file content using temporal fragmentation; returns the fragment count"""
         
         try:
-            # Read file content
-            with open(file_path, 'rb') as f:
-                content = f.read()
-            
-            # Fragment the content (synchronous version)
             fragment_id = f"file_{hashlib.md5(file_path.encode()).hexdigest()[:8]}"
-            # Create a simple synchronous fragmentation for files
-            fragments = self._simple_fragment_data(content, fragment_id)
             
-            print(f"[FRAGMENT] File fragmented: {file_path} -> {len(fragments)} fragments")
+            if hasattr(self.fragmentation_system, 'fragment_stream'):
+                # Stream the file through temporal fragmentation with bounded memory
+                fragment_count = self._run_coroutine(self._stream_file_fragments(file_path, fragment_id))
+            elif os.path.getsize(file_path) < 1024 * 1024:  # < 1MB
+                # Read file content
+                with open(file_path, 'rb') as f:
+                    content = f.read()
+                
+                # Create a simple synchronous fragmentation for files
+                fragment_count = len(self._simple_fragment_data(content, fragment_id))
+            else:
+                return 0
+            
+            print(f"[FRAGMENT] File fragmented: {file_path} -> {fragment_count} fragments")
+            return fragment_count
             
         except Exception as e:
             print(f"[ERROR] Failed to fragment {file_path}: {e}")
+            return 0
+    
+    def _run_coroutine(self, coroutine):
+        """Run a coroutine to completion from synchronous code, inside a running event loop or not"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+        
+        # Called from an API handler: asyncio.run cannot nest, so use a loop on a worker thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coroutine).result()
+    
+    async def _stream_file_fragments(self, file_path: str, fragment_id: str) -> int:
+        """Fragment a file as it is read, without loading it whole"""
+        fragment_count = 0
+        with open(file_path, 'rb') as f:
+            async for _ in self.fragmentation_system.fragment_stream(f, fragment_id):
+                fragment_count += 1
+        return fragment_count
     
     def _simple_fragment_data(self, data: bytes, fragment_id: str):
         """Simple synchronous data fragmentation for file protection"""
@@ -283,8 +311,7 @@ class RealWorldProtectionManager:
                 
                 # Update hash and re-fragment if necessary
                 protected_file.original_hash = new_hash
-                if os.path.getsize(file_path) < 1024 * 1024:
-                    self._fragment_file_content(file_path)
+                self._fragment_file_content(file_path)
     
     def handle_file_creation(self, file_path: str):
         """Handle file creation events"""
@@ -11,11 +11,22 @@ from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass, field
 from enum import Enum
 import numpy as np
-# Cryptography imports removed - using hashlib for demo
-# In production, would use cryptography library for proper encryption
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 import json
 import base64
 
+from .erasure_coding import ReedSolomonCodec, coding_statistics
+
+
+# AES-GCM authentication tag length; the tag is each fragment's integrity proof
+AEAD_TAG_SIZE = 16
+
+
+def _fragment_nonce(sequence: int) -> bytes:
+    """96-bit GCM nonce; unique per fragment because every data id has its own key"""
+    return struct.pack('>4xQ', sequence)
+
 
 class IntegrityStatus(Enum):
     """Fragment integrity verification status"""
@@ -35,14 +46,25 @@ class FragmentMetadata:
     data_length: int  # Original data length before fragmentation
     fragment_offset: int  # Where this fragment starts in original data
     fragment_size: int  # Size of actual data (not including padding/overhead)
-    checksum: str  # SHA-256 of fragment data
-    error_correction_code: bytes  # Reed-Solomon or similar
+    checksum: str  # Hex AEAD tag of the encrypted shard
+    error_correction_code: bytes  # Reed-Solomon coding row of this fragment over GF(256)
     creation_timestamp: float
     expiration_timestamp: float
+    data_fragments: int = 0  # k: fragments needed to reconstruct (0 = all)
+    shard_size: int = 0  # Size of every erasure-coded shard, padding included
     
     def to_bytes(self) -> bytes:
         """Serialize metadata for transmission"""
-        meta_dict = {
+        return json.dumps(self._to_dict()).encode()
+    
+    def associated_data(self) -> bytes:
+        """Metadata authenticated by the AEAD tag: everything but the checksum, which is the tag"""
+        meta_dict = self._to_dict()
+        del meta_dict['chk']
+        return json.dumps(meta_dict).encode()
+    
+    def _to_dict(self) -> Dict[str, Any]:
+        return {
             'fid': self.fragment_id,
             'seq': self.sequence_number,
             'tot': self.total_fragments,
@@ -52,9 +74,10 @@ class FragmentMetadata:
             'chk': self.checksum,
             'ecc': base64.b64encode(self.error_correction_code).decode(),
             'crt': self.creation_timestamp,
-            'exp': self.expiration_timestamp
+            'exp': self.expiration_timestamp,
+            'k': self.data_fragments,
+            'ssz': self.shard_size
         }
-        return json.dumps(meta_dict).encode()
     
     @staticmethod
     def from_bytes(data: bytes) -> 'FragmentMetadata':
@@ -70,7 +93,9 @@ class FragmentMetadata:
             checksum=meta_dict['chk'],
             error_correction_code=base64.b64decode(meta_dict['ecc']),
             creation_timestamp=meta_dict['crt'],
-            expiration_timestamp=meta_dict['exp']
+            expiration_timestamp=meta_dict['exp'],
+            data_fragments=meta_dict.get('k', 0),
+            shard_size=meta_dict.get('ssz', 0)
         )
 
 
@@ -78,103 +103,97 @@ class FragmentMetadata:
 class SecureFragment:
     """Fragment with integrity protection"""
     metadata: FragmentMetadata
-    encrypted_data: bytes  # The actual fragment data (encrypted)
-    integrity_proof: bytes  # HMAC or digital signature
-    redundancy_data: bytes  # For reconstruction if primary data corrupted
+    encrypted_data: bytes  # The erasure-coded shard, AES-GCM ciphertext without the tag
+    integrity_proof: bytes  # AES-GCM tag over the ciphertext and associated metadata
+    redundancy_data: bytes = b''  # Unused: the AEAD tag already authenticates the plaintext shard
     
-    def verify_integrity(self, verification_key: bytes) -> IntegrityStatus:
-        """Verify fragment hasn't been corrupted or tampered with"""
-        # Check expiration
+    def open(self, key: bytes) -> Tuple[IntegrityStatus, Optional[bytes]]:
+        """Verify and decrypt in a single AEAD pass; the shard is None unless VERIFIED"""
         if time.time() > self.metadata.expiration_timestamp:
-            return IntegrityStatus.EXPIRED
+            return IntegrityStatus.EXPIRED, None
         
-        # Verify checksum
-        data_hash = hashlib.sha256(self.encrypted_data).hexdigest()
-        if data_hash != self.metadata.checksum:
-            return IntegrityStatus.CORRUPTED
-        
-        # Verify integrity proof (simplified - would use HMAC in production)
-        expected_proof = hashlib.sha256(
-            self.encrypted_data + verification_key + self.metadata.to_bytes()
-        ).digest()
+        # The checksum binds the detached tag to this metadata
+        if self.integrity_proof.hex() != self.metadata.checksum:
+            return IntegrityStatus.CORRUPTED, None
         
-        if expected_proof != self.integrity_proof:
-            return IntegrityStatus.TAMPERED
+        try:
+            shard = AESGCM(key).decrypt(
+                _fragment_nonce(self.metadata.sequence_number),
+                bytes(self.encrypted_data) + self.integrity_proof,
+                self.metadata.associated_data()
+            )
+        except InvalidTag:
+            return IntegrityStatus.TAMPERED, None
         
-        return IntegrityStatus.VERIFIED
+        return IntegrityStatus.VERIFIED, shard
+    
+    def verify_integrity(self, verification_key: bytes) -> IntegrityStatus:
+        """Verify fragment hasn't been corrupted or tampered with, given its data id's AES-GCM key"""
+        return self.open(verification_key)[0]
 
 
 class SecureFragmentationSystem:
     """Handles fragmentation with guaranteed integrity"""
     
-    def __init__(self):
+    def __init__(self, parity_fragments: int = 2):
         self.fragment_cache: Dict[str, List[SecureFragment]] = {}
         self.reconstruction_buffer: Dict[str, bytearray] = {}
         self.master_key = secrets.token_bytes(32)
+        self.parity_fragments = parity_fragments
+        self._codecs: Dict[Tuple[int, int], ReedSolomonCodec] = {}
+        
+    def _get_codec(self, data_fragments: int, parity_fragments: int) -> ReedSolomonCodec:
+        key = (data_fragments, parity_fragments)
+        if key not in self._codecs:
+            self._codecs[key] = ReedSolomonCodec(data_fragments, parity_fragments)
+        return self._codecs[key]
         
     def fragment_with_integrity(self, data: bytes, fragment_count: int = 5, 
-                               lifetime_ms: int = 100) -> Tuple[str, List[SecureFragment]]:
+                               lifetime_ms: int = 100,
+                               parity_count: Optional[int] = None) -> Tuple[str, List[SecureFragment]]:
         """
         Fragment data with integrity guarantees
+        Erasure codes ``fragment_count`` data fragments plus ``parity_count``
+        parity fragments (default: the system's parity_fragments); any
+        ``fragment_count`` of them reconstruct the data.
         Returns: (data_id, fragments)
         """
         data_id = secrets.token_hex(16)
         data_length = len(data)
-        
-        # Calculate fragment sizes (equal distribution with last fragment handling remainder)
-        base_fragment_size = data_length // fragment_count
-        
-        fragments = []
-        current_offset = 0
-        
-        for i in range(fragment_count):
-            # Calculate this fragment's size
-            if i == fragment_count - 1:
-                # Last fragment gets any remainder
-                fragment_size = data_length - current_offset
+        parity_count = self.parity_fragments if parity_count is None else parity_count
+        
+        # Data fragments are equal zero-padded slices; parity fragments are Reed-Solomon combinations
+        codec = self._get_codec(fragment_count, parity_count)
+        shards = codec.encode(data)
+        shard_size = shards.shape[1]
+        
+        created = time.time()
+        metadata = []
+        for i in range(codec.total_shards):
+            if i < fragment_count:
+                fragment_offset = i * shard_size
+                fragment_size = max(0, min(shard_size, data_length - fragment_offset))
             else:
-                fragment_size = base_fragment_size
-            
-            # Extract fragment data
-            fragment_data = data[current_offset:current_offset + fragment_size]
-            
-            # Add error correction codes (simplified Reed-Solomon concept)
-            ecc = self._generate_error_correction(fragment_data)
-            
-            # Encrypt fragment
-            encrypted = self._encrypt_fragment(fragment_data, data_id, i)
+                fragment_offset = 0
+                fragment_size = shard_size
             
-            # Create metadata
-            metadata = FragmentMetadata(
+            # Checksum is filled in with the tag once the shard is encrypted
+            metadata.append(FragmentMetadata(
                 fragment_id=f"{data_id}_f{i}",
                 sequence_number=i,
-                total_fragments=fragment_count,
+                total_fragments=codec.total_shards,
                 data_length=data_length,
-                fragment_offset=current_offset,
+                fragment_offset=fragment_offset,
                 fragment_size=fragment_size,
-                checksum=hashlib.sha256(encrypted).hexdigest(),
-                error_correction_code=ecc,
-                creation_timestamp=time.time(),
-                expiration_timestamp=time.time() + (lifetime_ms / 1000.0)
-            )
-            
-            # Generate integrity proof
-            integrity_proof = hashlib.sha256(
-                encrypted + self.master_key + metadata.to_bytes()
-            ).digest()
-            
-            # Create redundancy data for recovery
-            redundancy = self._create_redundancy(fragment_data)
-            
-            fragment = SecureFragment(
-                metadata=metadata,
-                encrypted_data=encrypted,
-                integrity_proof=integrity_proof,
-                redundancy_data=redundancy
-            )
-            
-            fragments.append(fragment)
-            current_offset += fragment_size
+                checksum="",
+                error_correction_code=codec.matrix[i].tobytes(),
+                creation_timestamp=created,
+                expiration_timestamp=created + (lifetime_ms / 1000.0),
+                data_fragments=fragment_count,
+                shard_size=shard_size
+            ))
+        
+        fragments = self._encrypt_fragments(data_id, shards, metadata)
         
         # Store for later reconstruction
         self.fragment_cache[data_id] = fragments
@@ -185,131 +204,87 @@ class SecureFragmentationSystem:
                                      fragments: List[SecureFragment]) -> Optional[bytes]:
         """
         Reconstruct data with integrity verification
+        Fragments that fail verification are treated as lost; any k verified
+        fragments of a k-of-n group are enough.
         Returns None if reconstruction fails or data is corrupted
         """
         if not fragments:
             return None
         
-        # Verify all fragments first
-        for fragment in fragments:
-            status = fragment.verify_integrity(self.master_key)
-            if status not in [IntegrityStatus.VERIFIED, IntegrityStatus.INTACT]:
-                # Try to recover using redundancy
-                if not self._attempt_recovery(fragment):
-                    print(f"Fragment {fragment.metadata.fragment_id} failed verification: {status}")
-                    return None
-        
-        # Sort fragments by sequence number
-        fragments.sort(key=lambda f: f.metadata.sequence_number)
-        
-        # Verify we have all fragments
-        expected_count = fragments[0].metadata.total_fragments
-        if len(fragments) != expected_count:
-            print(f"Missing fragments: have {len(fragments)}, need {expected_count}")
-            return None
-        
-        # Verify sequence is complete
-        for i, fragment in enumerate(fragments):
-            if fragment.metadata.sequence_number != i:
-                print(f"Fragment sequence broken at position {i}")
-                return None
-        
-        # Initialize reconstruction buffer
-        total_length = fragments[0].metadata.data_length
-        reconstructed = bytearray(total_length)
-        
-        # Reconstruct data
+        # Verify and decrypt fragments, keeping one shard per sequence number.
+        # The group layout is only trusted once it has been authenticated as
+        # associated data, so it is read from verified fragments alone.
+        key = self._data_key(data_id)
+        shards: Dict[int, bytes] = {}
+        layout = None
         for fragment in fragments:
-            # Decrypt fragment
-            decrypted = self._decrypt_fragment(
-                fragment.encrypted_data, 
-                data_id, 
-                fragment.metadata.sequence_number
-            )
+            metadata = fragment.metadata
+            sequence = metadata.sequence_number
+            if sequence in shards:
+                continue
             
-            # Verify decrypted size matches metadata
-            if len(decrypted) != fragment.metadata.fragment_size:
-                # Try error correction
-                corrected = self._apply_error_correction(decrypted, fragment.metadata.error_correction_code)
-                if corrected and len(corrected) == fragment.metadata.fragment_size:
-                    decrypted = corrected
-                else:
-                    print(f"Fragment {fragment.metadata.fragment_id} size mismatch")
-                    return None
+            status, decrypted = fragment.open(key)
+            if status != IntegrityStatus.VERIFIED:
+                print(f"Fragment {metadata.fragment_id} failed verification: {status}")
+                continue
             
-            # Place fragment in correct position
-            start = fragment.metadata.fragment_offset
-            end = start + fragment.metadata.fragment_size
+            if len(decrypted) != metadata.shard_size:
+                print(f"Fragment {metadata.fragment_id} failed shard verification")
+                continue
             
-            # Verify bounds
-            if end > total_length:
-                print(f"Fragment {fragment.metadata.fragment_id} exceeds data bounds")
+            fragment_layout = (
+                metadata.total_fragments, metadata.data_fragments or metadata.total_fragments,
+                metadata.data_length, metadata.shard_size
+            )
+            if layout is None:
+                layout = fragment_layout
+            elif fragment_layout != layout:
+                print(f"Fragment {metadata.fragment_id} disagrees with the group layout of {data_id}")
                 return None
             
-            reconstructed[start:end] = decrypted
+            shards[sequence] = decrypted
         
-        return bytes(reconstructed)
-    
-    def _generate_error_correction(self, data: bytes) -> bytes:
-        """Generate error correction codes for data"""
-        # Simplified - in production would use Reed-Solomon or similar
-        # For now, just create XOR parity blocks
-        
-        block_size = 16
-        parity = bytearray(block_size)
+        if layout is None:
+            print(f"No verified fragments for {data_id}")
+            return None
+        total_fragments, data_fragments, data_length, _ = layout
         
-        for i in range(0, len(data), block_size):
-            block = data[i:i+block_size]
-            for j, byte in enumerate(block):
-                if j < len(parity):
-                    parity[j] ^= byte
+        if len(shards) < data_fragments:
+            print(f"Missing fragments: have {len(shards)}, need {data_fragments} of {total_fragments}")
+            return None
         
-        return bytes(parity)
+        codec = self._get_codec(data_fragments, total_fragments - data_fragments)
+        try:
+            return codec.decode(shards, data_length)
+        except ValueError as e:
+            print(f"Reconstruction of {data_id} failed: {e}")
+            return None
     
-    def _apply_error_correction(self, data: bytes, ecc: bytes) -> Optional[bytes]:
-        """Attempt to correct errors in data using ECC"""
-        # Simplified implementation - would use proper ECC in production
-        # For now, just return the data if ECC validates
-        
-        check_ecc = self._generate_error_correction(data)
-        if check_ecc == ecc:
-            return data
-        
-        # In production, would attempt actual error correction here
-        return None
+    def get_coding_statistics(self) -> Dict[str, Any]:
+        """Erasure coding byte counts and encode/decode throughput in MB/s"""
+        return coding_statistics(list(self._codecs.values()))
     
-    def _encrypt_fragment(self, data: bytes, data_id: str, sequence: int) -> bytes:
-        """Encrypt fragment data"""
-        # Derive fragment-specific key
-        fragment_key = hashlib.sha256(
-            self.master_key + data_id.encode() + struct.pack('I', sequence)
-        ).digest()
-        
-        # Simple XOR encryption (in production would use AES-GCM)
-        encrypted = bytearray(len(data))
-        key_stream = fragment_key * ((len(data) // 32) + 1)
-        
-        for i, byte in enumerate(data):
-            encrypted[i] = byte ^ key_stream[i]
-        
-        return bytes(encrypted)
+    def _data_key(self, data_id: str) -> bytes:
+        """AES-256-GCM key of one data id, derived from the master key"""
+        return hashlib.sha256(self.master_key + data_id.encode()).digest()
     
-    def _decrypt_fragment(self, encrypted: bytes, data_id: str, sequence: int) -> bytes:
-        """Decrypt fragment data"""
-        # Encryption is symmetric for XOR
-        return self._encrypt_fragment(encrypted, data_id, sequence)
-    
-    def _create_redundancy(self, data: bytes) -> bytes:
-        """Create redundancy data for recovery"""
-        # Simple approach: store compressed version
-        # In production would use erasure coding
-        return hashlib.sha256(data).digest()
-    
-    def _attempt_recovery(self, fragment: SecureFragment) -> bool:
-        """Attempt to recover corrupted fragment"""
-        # In production, would use redundancy_data to recover
-        # For now, just return False
-        return False
+    def _encrypt_fragments(self, data_id: str, shards: np.ndarray,
+                           metadata: List[FragmentMetadata]) -> List[SecureFragment]:
+        """Encrypt every shard of a data id under one cipher, one AES-GCM call per fragment"""
+        cipher = AESGCM(self._data_key(data_id))
+        fragments = []
+        for shard, meta in zip(shards, metadata):
+            sealed = cipher.encrypt(
+                _fragment_nonce(meta.sequence_number), shard, meta.associated_data()
+            )
+            encrypted, tag = sealed[:-AEAD_TAG_SIZE], sealed[-AEAD_TAG_SIZE:]
+            meta.checksum = tag.hex()
+            fragments.append(SecureFragment(
+                metadata=meta,
+                encrypted_data=encrypted,
+                integrity_proof=tag
+            ))
+        return fragments
 
 
 @dataclass
@@ -0,0 +1,426 @@
+"""
+MWRASP Sharded Quantum Detector
+Multi-process QuantumDetector front-end with token-hash partitioning
+"""
+
+import hashlib
+import multiprocessing
+import os
+import secrets
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .access_history import RecentTokenIndex
+from .quantum_detector import (
+    QuantumDetector, QuantumThreat, CanaryToken, ThreatLevel,
+    BATCH_THREAT_DTYPE, CORRELATION_RETENTION, ENTANGLEMENT_WINDOW
+)
+from .threat_bus import ThreatEventBus
+from .threat_correlation import ThreatCorrelationIndex
+from .threat_store import ThreatStore
+
+
+# Matches QuantumDetector._detect_coordinated_attack_pattern
+COORDINATION_WINDOW = 5.0
+
+# Correlation events shipped back by a shard: (indicators, timestamp, confidence)
+CorrelationEvent = Tuple[List[str], float, float]
+
+
+def shard_for_token(token_id: str, num_shards: int) -> int:
+    """Stable shard index for a token id (independent of PYTHONHASHSEED)"""
+    digest = hashlib.blake2b(token_id.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') % num_shards
+
+
+class _ShardDetector(QuantumDetector):
+    """QuantumDetector owning one partition of the canary tokens.
+
+    Cross-token entanglement counts are supplied per access time by the
+    front-end, which sees every shard's traffic. Correlation events are
+    collected so the front-end can run coordinated-attack detection across
+    shards.
+    """
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.entanglement_counts: Dict[float, int] = {}
+        self.correlation_outbox: List[CorrelationEvent] = []
+
+    def _detect_entanglement_pattern(self, current_time: float) -> int:
+        count = self.entanglement_counts.get(current_time)
+        if count is None:
+            return super()._detect_entanglement_pattern(current_time)
+        return count
+
+    def _detect_entanglement_patterns(self, access_times: np.ndarray) -> Dict[float, int]:
+        access_times = np.unique(access_times)
+        supplied = np.array([t in self.entanglement_counts for t in access_times.tolist()], dtype=bool)
+        counts = super()._detect_entanglement_patterns(access_times[~supplied]) if not supplied.all() else {}
+        counts.update({t: self.entanglement_counts[t] for t in access_times[supplied].tolist()})
+        return counts
+
+    def _store_threat_for_correlation(self, token_id: str, access_info: Dict,
+                                      quantum_indicators: List[str], confidence_scores: List[float]):
+        if quantum_indicators:
+            self.correlation_outbox.append(
+                (list(quantum_indicators), access_info['time'], float(np.mean(confidence_scores)))
+            )
+        super()._store_threat_for_correlation(token_id, access_info, quantum_indicators, confidence_scores)
+
+    def drain_correlation_events(self) -> List[CorrelationEvent]:
+        events = self.correlation_outbox
+        self.correlation_outbox = []
+        return events
+
+    # Shard commands
+
+    def shard_access(self, token_id: str, accessor_id: Optional[str], timestamp: float,
+                     entanglement: Optional[int]) -> Tuple[Optional[QuantumThreat], List[CorrelationEvent]]:
+        if entanglement is not None:
+            self.entanglement_counts = {timestamp: entanglement}
+        try:
+            detected = self.access_token(token_id, accessor_id, timestamp)
+        finally:
+            self.entanglement_counts = {}
+        threat = self.threat_history[-1] if detected else None
+        return threat, self.drain_correlation_events()
+
+    def shard_access_batch(self, token_ids: List[str], timestamps: List[float],
+                           accessor_ids: List[Optional[str]], values: Optional[List[Any]],
+                           entanglement: Dict[float, int]) -> Tuple[np.ndarray, List[QuantumThreat], List[CorrelationEvent]]:
+        known_threats = len(self.threat_history)
+        self.entanglement_counts = entanglement
+        try:
+            rows = self.access_tokens_batch(token_ids, timestamps, accessor_ids, values)
+        finally:
+            self.entanglement_counts = {}
+        return rows, self.threat_history[known_threats:], self.drain_correlation_events()
+
+
+def _shard_worker(connection, detector_options: Dict[str, Any]):
+    """Worker process main loop: execute (command, args) requests from the front-end"""
+    detector = _ShardDetector(**detector_options)
+    commands = {
+        'generate': detector.generate_canary_token,
+        'access': detector.shard_access,
+        'access_batch': detector.shard_access_batch,
+        'statistics': detector.get_threat_statistics,
+        'correlation_analysis': detector.get_threat_correlation_analysis,
+        'start_monitoring': detector.start_monitoring,
+        'stop_monitoring': detector.stop_monitoring,
+    }
+    try:
+        while True:
+            try:
+                command, args = connection.recv()
+            except EOFError:
+                break
+            if command == 'shutdown':
+                connection.send(('ok', None))
+                break
+            try:
+                connection.send(('ok', commands[command](*args)))
+            except Exception as e:
+                connection.send(('error', f"{type(e).__name__}: {e}"))
+    finally:
+        detector.stop_monitoring()
+        connection.close()
+
+
+class ShardedQuantumDetector:
+    """Front-end spreading canary tokens over ``num_shards`` detector processes.
+
+    Tokens are assigned to shards by a stable hash of their id; each worker
+    process owns the access histories and detectors for its tokens. The
+    front-end keeps the cross-shard state: the entanglement index (every
+    access passes through it before being routed) and a correlation index fed
+    with the events each shard returns, used for coordinated-attack
+    detection. Threats are streamed back over the shard pipes, so
+    ``get_active_threats`` is answered locally.
+    """
+
+    def __init__(self, num_shards: Optional[int] = None, sensitivity_threshold: float = 0.7,
+                 government_compliance: bool = True, history_capacity: int = 1024,
+                 pattern_cache_size: int = 4096, start_method: str = 'spawn'):
+        self.num_shards = num_shards or max(1, (os.cpu_count() or 2) - 1)
+        self.sensitivity_threshold = sensitivity_threshold
+        self.government_compliance = government_compliance
+        detector_options = {
+            'sensitivity_threshold': sensitivity_threshold,
+            'government_compliance': government_compliance,
+            'history_capacity': history_capacity,
+            'pattern_cache_size': pattern_cache_size
+        }
+
+        context = multiprocessing.get_context(start_method)
+        self._connections = []
+        self._processes = []
+        self._shard_locks = []
+        for shard in range(self.num_shards):
+            parent_connection, child_connection = context.Pipe()
+            process = context.Process(
+                target=_shard_worker,
+                args=(child_connection, detector_options),
+                name=f"quantum-detector-shard-{shard}",
+                daemon=True
+            )
+            process.start()
+            child_connection.close()
+            self._connections.append(parent_connection)
+            self._processes.append(process)
+            self._shard_locks.append(threading.Lock())
+
+        self.canary_tokens: Dict[str, CanaryToken] = {}
+        self.threat_history = ThreatStore(ThreatLevel)
+        self.threat_bus = ThreatEventBus()
+        self._monitoring = False
+
+        # Cross-shard aggregation state
+        self._aggregator_lock = threading.Lock()
+        self.entanglement_index = RecentTokenIndex(ENTANGLEMENT_WINDOW)
+        self.correlation_index = ThreatCorrelationIndex(retention=CORRELATION_RETENTION)
+        self.correlation_confidence_threshold = 0.75
+        self.coordinated_attacks: List[Dict[str, Any]] = []
+
+    # Shard transport
+
+    def _call(self, shard: int, command: str, *args) -> Any:
+        with self._shard_locks[shard]:
+            self._connections[shard].send((command, args))
+            return self._receive(shard)
+
+    def _receive(self, shard: int) -> Any:
+        status, payload = self._connections[shard].recv()
+        if status == 'error':
+            raise RuntimeError(f"Detector shard {shard} failed: {payload}")
+        return payload
+
+    def _scatter(self, requests: Dict[int, Tuple[str, tuple]]) -> Dict[int, Any]:
+        """Send one request per shard, then gather the replies (shards run in parallel)"""
+        shards = sorted(requests)
+        for shard in shards:
+            self._shard_locks[shard].acquire()
+        try:
+            for shard in shards:
+                command, args = requests[shard]
+                self._connections[shard].send((command, args))
+            return {shard: self._receive(shard) for shard in shards}
+        finally:
+            for shard in shards:
+                self._shard_locks[shard].release()
+
+    def _broadcast(self, command: str, *args) -> List[Any]:
+        replies = self._scatter({shard: (command, args) for shard in range(self.num_shards)})
+        return [replies[shard] for shard in range(self.num_shards)]
+
+    # Detector API
+
+    def generate_canary_token(self, data_type: str = "sensitive") -> CanaryToken:
+        """Generate a canary token on the shard that owns its id"""
+        token_id = secrets.token_hex(16)
+        token = self._call(shard_for_token(token_id, self.num_shards), 'generate', data_type, token_id)
+        self.canary_tokens[token_id] = token
+        return token
+
+    def access_token(self, token_id: str, accessor_id: str = None) -> bool:
+        """Record token access on its shard and analyze for quantum attack patterns"""
+        if token_id not in self.canary_tokens:
+            return False
+
+        current_time = time.time()
+        with self._aggregator_lock:
+            self.entanglement_index.add(current_time, token_id)
+            entanglement = self.entanglement_index.count(current_time)
+
+        threat, events = self._call(
+            shard_for_token(token_id, self.num_shards),
+            'access', token_id, accessor_id, current_time, entanglement
+        )
+        self._merge_shard_results([threat] if threat else [], events)
+        return threat is not None
+
+    def access_tokens_batch(
+        self,
+        token_ids: List[str],
+        timestamps: Optional[List[float]] = None,
+        accessor_ids: Optional[List[Optional[str]]] = None,
+        values: Optional[List[Optional[str]]] = None
+    ) -> np.ndarray:
+        """Scatter a columnar batch of accesses over the shards.
+
+        Same contract as QuantumDetector.access_tokens_batch; the shards
+        analyze their part of the batch in parallel. Rows are returned in
+        batch order, with ``batch_index`` referring to the caller's columns.
+        """
+        token_ids = np.asarray(token_ids, dtype=str)
+        count = len(token_ids)
+        if timestamps is None:
+            timestamps = np.full(count, time.time(), dtype=np.float64)
+        else:
+            timestamps = np.asarray(timestamps, dtype=np.float64)
+        if accessor_ids is None:
+            accessor_ids = ['unknown'] * count
+        if not (len(timestamps) == len(accessor_ids) == count) or (values is not None and len(values) != count):
+            raise ValueError("batch columns must all have the same length")
+
+        known = np.array([token_id in self.canary_tokens for token_id in token_ids], dtype=bool)
+        batch_indices = np.flatnonzero(known)
+        if len(batch_indices) == 0:
+            return np.zeros(0, dtype=BATCH_THREAT_DTYPE)
+
+        known_tokens = token_ids[batch_indices]
+        known_times = timestamps[batch_indices]
+        with self._aggregator_lock:
+            self.entanglement_index.add_batch(known_tokens, known_times)
+            entanglement = self._batch_entanglement_counts(known_tokens, known_times)
+
+        shards = np.array([shard_for_token(token_id, self.num_shards) for token_id in known_tokens])
+        shard_indices = {}
+        requests = {}
+        for shard in np.unique(shards):
+            indices = batch_indices[shards == shard]
+            shard_times = timestamps[indices]
+            shard_indices[int(shard)] = indices
+            requests[int(shard)] = ('access_batch', (
+                token_ids[indices].tolist(),
+                shard_times.tolist(),
+                [accessor_ids[i] for i in indices],
+                [values[i] for i in indices] if values is not None else None,
+                {t: entanglement[t] for t in np.unique(shard_times).tolist()}
+            ))
+        replies = self._scatter(requests)
+
+        results = []
+        for shard, (rows, threats, events) in replies.items():
+            rows['batch_index'] = shard_indices[shard][rows['batch_index']]
+            results.append(rows)
+            self._merge_shard_results(threats, events)
+
+        rows = np.concatenate(results) if results else np.zeros(0, dtype=BATCH_THREAT_DTYPE)
+        return rows[np.argsort(rows['batch_index'], kind='stable')]
+
+    def _batch_entanglement_counts(self, token_ids: np.ndarray, timestamps: np.ndarray) -> Dict[float, int]:
+        """Distinct tokens accessed within ENTANGLEMENT_WINDOW of each batch timestamp.
+
+        Uses the rolling index when the time is current, otherwise the
+        accesses of the batch plus those still in the index.
+        """
+        indexed = self.entanglement_index.snapshot()
+        all_times = np.concatenate((timestamps, [t for t, _ in indexed]))
+        all_tokens = np.concatenate((token_ids, np.asarray([token for _, token in indexed], dtype=str)))
+        order = np.argsort(all_times, kind='stable')
+        all_times = all_times[order]
+        all_tokens = all_tokens[order]
+
+        counts = {}
+        for timestamp in np.unique(timestamps).tolist():
+            count = self.entanglement_index.count(timestamp)
+            if count is None:
+                first = np.searchsorted(all_times, timestamp - ENTANGLEMENT_WINDOW, side='right')
+                last = np.searchsorted(all_times, timestamp + ENTANGLEMENT_WINDOW, side='left')
+                count = len(np.unique(all_tokens[first:last]))
+            counts[timestamp] = count
+        return counts
+
+    def _merge_shard_results(self, threats: List[QuantumThreat], events: List[CorrelationEvent]):
+        """Fold threats and correlation events streamed back by a shard into the global view"""
+        with self._aggregator_lock:
+            self.threat_history.extend(threats)
+            for threat in threats:
+                self.threat_bus.publish(threat)
+            for indicators, timestamp, confidence in events:
+                for indicator in indicators:
+                    self.correlation_index.add(indicator, timestamp, confidence)
+                self._detect_coordinated_attack_pattern(timestamp)
+
+    def _detect_coordinated_attack_pattern(self, current_time: float) -> bool:
+        """Coordinated-attack check over the indicators reported by all shards"""
+        average_confidence = self.correlation_index.coordinated_confidence(
+            current_time, COORDINATION_WINDOW, min_indicators=3
+        )
+        if average_confidence is None or average_confidence <= self.correlation_confidence_threshold:
+            return False
+
+        indicators = sorted(self.correlation_index.window(current_time, COORDINATION_WINDOW))
+        self.coordinated_attacks.append({
+            'detected_at': current_time,
+            'average_confidence': average_confidence,
+            'quantum_indicators': indicators
+        })
+        print(f"CRITICAL: Cross-shard coordinated quantum attack detected at {current_time}")
+        return True
+
+    def get_active_threats(self) -> List[QuantumThreat]:
+        """Get currently active quantum threats across all shards"""
+        return self.threat_history.active_threats(time.time())
+
+    def get_threat_correlation_analysis(self) -> Dict[str, Any]:
+        """Cross-shard correlation view plus each shard's own analysis"""
+        current_time = time.time()
+        analysis_window = 300.0
+        with self._aggregator_lock:
+            distribution = {
+                indicator: threat_index.count_since(current_time - analysis_window)
+                for indicator, threat_index in self.correlation_index.items()
+            }
+            coordinated = [
+                attack for attack in self.coordinated_attacks
+                if current_time - attack['detected_at'] < analysis_window
+            ]
+        return {
+            'threat_pattern_distribution': distribution,
+            'coordinated_attacks': coordinated,
+            'correlation_confidence_threshold': self.correlation_confidence_threshold,
+            'shard_analyses': self._broadcast('correlation_analysis')
+        }
+
+    def get_threat_statistics(self) -> Dict:
+        """Threat statistics aggregated over all shards"""
+        active = self.threat_history.active_statistics(time.time())
+        shard_statistics = self._broadcast('statistics')
+        return {
+            'total_tokens': sum(stats['total_tokens'] for stats in shard_statistics),
+            'total_threats_detected': len(self.threat_history),
+            'active_threats': active['active_threats'],
+            'threat_levels': active['threat_levels'],
+            'average_confidence': active['average_confidence'],
+            'monitoring_active': self._monitoring,
+            'threat_bus': self.threat_bus.get_statistics(),
+            'shards': self.num_shards,
+            'aggregator': {
+                'entanglement_index_accesses': len(self.entanglement_index),
+                'correlation_index': self.correlation_index.get_statistics(),
+                'coordinated_attacks': len(self.coordinated_attacks)
+            },
+            'shard_statistics': shard_statistics
+        }
+
+    def start_monitoring(self):
+        """Start quantum threat monitoring on every shard"""
+        self._broadcast('start_monitoring')
+        self._monitoring = True
+
+    def stop_monitoring(self):
+        """Stop quantum threat monitoring on every shard"""
+        self._broadcast('stop_monitoring')
+        self._monitoring = False
+
+    def shutdown(self, timeout: float = 5.0):
+        """Stop every shard process"""
+        for shard, connection in enumerate(self._connections):
+            with self._shard_locks[shard]:
+                try:
+                    connection.send(('shutdown', ()))
+                    connection.recv()
+                except (EOFError, OSError):
+                    pass
+                connection.close()
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self._monitoring = False
@@ -1,14 +1,17 @@
+import os
 import time
-import threading
 import secrets
 import hashlib
 import numpy as np
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, AsyncIterator, Callable, Union
 from dataclasses import dataclass, field
 from enum import Enum
 import asyncio
 from collections import defaultdict
 
+from .expiration_wheel import ExpirationWheel
+from .timing_keystream import TimingKeystreamCache
+
 # Import patented legal conflict engine
 try:
     from .legal_conflict_engine import LegalConflictEngine, RoutingDecision
@@ -18,6 +21,41 @@ except ImportError:
     print("[WARNING] Legal conflict engine not available - using standard fragmentation")
 
 
+# Seconds an expired, wiped fragment stays in the fragment table before removal
+EXPIRED_FRAGMENT_RETENTION = 1.0
+
+# Seconds past expiry after which the cleanup service removes a fragment
+CLEANUP_GRACE_PERIOD = 5.0
+
+# New payload bytes per fragment when fragmenting a stream
+STREAM_FRAGMENT_SIZE = 1024 * 1024
+
+# Bytes requested per read from file-like and file descriptor stream sources
+STREAM_READ_SIZE = 256 * 1024
+
+
+async def _read_stream(source, read_size: int = STREAM_READ_SIZE) -> AsyncIterator[bytes]:
+    """Yield blocks from an async iterable, file descriptor, file object, buffer or iterable of blocks"""
+    if hasattr(source, '__aiter__'):
+        async for block in source:
+            yield block
+    elif isinstance(source, int) or hasattr(source, 'read'):
+        read = (lambda: os.read(source, read_size)) if isinstance(source, int) else (lambda: source.read(read_size))
+        while True:
+            # Blocking reads run off the event loop
+            block = await asyncio.to_thread(read)
+            if not block:
+                break
+            yield block
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        view = memoryview(source)
+        for offset in range(0, len(view), read_size):
+            yield view[offset:offset + read_size]
+    else:
+        for block in source:
+            yield block
+
+
 class FragmentStatus(Enum):
     ACTIVE = "active"
     EXPIRING = "expiring"
@@ -28,7 +66,7 @@ class FragmentStatus(Enum):
 @dataclass
 class DataFragment:
     fragment_id: str
-    data_chunk: bytes
+    data_chunk: Union[bytes, memoryview]  # memoryview into the fragment group's arena
     created_at: float
     expires_at: float
     fragment_index: int
@@ -59,9 +97,10 @@ class TemporalFragmentation:
         self.policy = policy or FragmentationPolicy()
         self.fragments: Dict[str, DataFragment] = {}
         self.fragment_groups: Dict[str, List[str]] = {}  # original_id -> fragment_ids
-        self.expiration_scheduler = {}
+        # One timing wheel thread expires every fragment; keys are (fragment_id, action)
+        self.expiration_scheduler = ExpirationWheel(self._process_expirations)
         self.reconstruction_callbacks: Dict[str, Callable] = {}
-        self._cleanup_thread = None
+        self.keystream_cache = TimingKeystreamCache()
         
         # Initialize patented legal conflict engine
         self.legal_engine = None
@@ -99,39 +138,45 @@ class TemporalFragmentation:
         chunk_size = len(data) // fragment_count
         overlap_size = int(chunk_size * self.policy.overlap_factor)
         
-        # Generate legal routing decisions for each fragment
+        fragment_ids = [f"{original_id}_frag_{i}_{secrets.token_hex(8)}" for i in range(fragment_count)]
+        
+        # Generate legal routing decisions for the whole group in one batched call
         routing_decisions = {}
         if self.legal_engine:
-            for i in range(fragment_count):
-                fragment_id = f"{original_id}_frag_{i}_{secrets.token_hex(8)}"
-                routing_decision = await self.legal_engine.select_maximally_hostile_routing(
-                    fragment_id=fragment_id,
-                    threshold=3,  # Minimum 3 hostile jurisdictions
-                    min_hostility=0.7  # High hostility requirement
-                )
-                routing_decisions[i] = routing_decision
-                
-                # Add latency for realistic timing
-                await asyncio.sleep(0.001)  # 1ms per routing decision
-        
-        for i in range(fragment_count):
-            start_idx = max(0, i * chunk_size - overlap_size)
-            end_idx = min(len(data), (i + 1) * chunk_size + overlap_size)
-            
-            chunk = data[start_idx:end_idx]
+            decisions = await self.legal_engine.select_maximally_hostile_routing_batch(
+                fragment_ids,
+                threshold=3,  # Minimum 3 hostile jurisdictions
+                min_hostility=0.7  # High hostility requirement
+            )
+            routing_decisions = dict(enumerate(decisions))
+        
+        # All chunks of the group live in one arena; each fragment holds a memoryview of its span
+        spans = [
+            (max(0, i * chunk_size - overlap_size), min(len(data), (i + 1) * chunk_size + overlap_size))
+            for i in range(fragment_count)
+        ]
+        arena = np.empty(sum(max(0, end - start) for start, end in spans), dtype=np.uint8)
+        source = np.frombuffer(data, dtype=np.uint8)
+        arena_offset = 0
+        
+        for i, (start_idx, end_idx) in enumerate(spans):
+            chunk = arena[arena_offset:arena_offset + max(0, end_idx - start_idx)]
+            arena_offset += len(chunk)
             
             # Add quantum timing patterns to fragment for enhanced security
             if self.policy.quantum_resistance_level >= 2:
-                chunk = self._add_quantum_timing_patterns(chunk, i, current_time)
+                self.keystream_cache.apply_into(source[start_idx:end_idx], i, current_time, out=chunk)
+            else:
+                chunk[:] = source[start_idx:end_idx]
             
-            fragment_id = f"{original_id}_frag_{i}_{secrets.token_hex(8)}"
+            fragment_id = fragment_ids[i]
             
             # Get legal routing metadata
             legal_metadata = self._extract_legal_metadata(routing_decisions.get(i))
             
             fragment = DataFragment(
                 fragment_id=fragment_id,
-                data_chunk=chunk,
+                data_chunk=memoryview(chunk),
                 created_at=current_time,
                 expires_at=expires_at,
                 fragment_index=i,
@@ -147,6 +192,7 @@ class TemporalFragmentation:
             
             fragments.append(fragment)
             self.fragments[fragment_id] = fragment
+            self.expiration_scheduler.schedule((fragment_id, 'cleanup'), expires_at + CLEANUP_GRACE_PERIOD)
         
         # Store fragment group mapping
         self.fragment_groups[original_id] = [f.fragment_id for f in fragments]
@@ -164,7 +210,106 @@ class TemporalFragmentation:
               f"quantum timing patterns: {'enabled' if self.policy.quantum_resistance_level >= 2 else 'disabled'}")
         
         return fragments
-    
+
+    async def fragment_stream(self, source, original_id: str = None,
+                              fragment_size: int = STREAM_FRAGMENT_SIZE) -> AsyncIterator[DataFragment]:
+        """
+        Fragment a stream with bounded memory, yielding fragments as they are produced
+
+        ``source`` may be an async iterable of byte blocks, a file descriptor, a
+        binary file object, a bytes-like object or an iterable of blocks. Each
+        fragment carries ``fragment_size`` new payload bytes, prefixed (after the
+        first) by ``int(fragment_size * overlap_factor)`` bytes of the previous
+        one, so ``reconstruct_data`` sees the same overlap layout as for
+        ``fragment_data``. The SHA-256 is computed incrementally; ``original_hash``
+        and ``total_fragments`` of every fragment in the group are filled in once
+        the stream is exhausted.
+        """
+        if original_id is None:
+            original_id = secrets.token_hex(16)
+        if fragment_size <= 0:
+            raise ValueError("fragment_size must be positive")
+
+        # All fragments share the group creation time, and so one keystream sine table
+        creation_time = time.time()
+        lifetime_seconds = self.policy.max_fragment_lifetime_ms / 1000.0
+        overlap_size = int(fragment_size * self.policy.overlap_factor)
+        original_hash = hashlib.sha256()
+        group: List[DataFragment] = []
+        self.fragment_groups[original_id] = []
+
+        pending = bytearray()
+        tail = b''
+        exhausted = False
+        blocks = _read_stream(source)
+
+        while True:
+            while not exhausted and len(pending) < fragment_size:
+                try:
+                    block = await blocks.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                original_hash.update(block)
+                pending.extend(block)
+
+            new_size = min(fragment_size, len(pending))
+            if new_size == 0 and group:
+                break
+
+            i = len(group)
+            chunk = np.empty(len(tail) + new_size, dtype=np.uint8)
+            chunk[:len(tail)] = np.frombuffer(tail, dtype=np.uint8)
+            chunk[len(tail):] = np.frombuffer(pending, dtype=np.uint8, count=new_size)
+            tail = bytes(chunk[-overlap_size:]) if overlap_size else b''
+            del pending[:new_size]
+
+            if self.policy.quantum_resistance_level >= 2:
+                self.keystream_cache.apply_into(chunk, i, creation_time, out=chunk)
+
+            fragment_id = f"{original_id}_frag_{i}_{secrets.token_hex(8)}"
+            routing_decision = None
+            if self.legal_engine:
+                routing_decision = await self.legal_engine.select_maximally_hostile_routing(
+                    fragment_id=fragment_id,
+                    threshold=3,  # Minimum 3 hostile jurisdictions
+                    min_hostility=0.7  # High hostility requirement
+                )
+            legal_metadata = self._extract_legal_metadata(routing_decision)
+            expires_at = time.time() + lifetime_seconds
+
+            fragment = DataFragment(
+                fragment_id=fragment_id,
+                data_chunk=memoryview(chunk),
+                created_at=creation_time,
+                expires_at=expires_at,
+                fragment_index=i,
+                total_fragments=0,  # known once the stream ends
+                original_hash="",
+                reconstruction_key=self._generate_reconstruction_key(original_id, i),
+                legal_jurisdictions=legal_metadata['jurisdictions'],
+                legal_impossibility_score=legal_metadata['impossibility_score'],
+                legal_barriers=legal_metadata['barriers'],
+                routing_decision_hash=legal_metadata['decision_hash']
+            )
+
+            group.append(fragment)
+            self.fragments[fragment_id] = fragment
+            self.fragment_groups[original_id].append(fragment_id)
+            self.expiration_scheduler.schedule((fragment_id, 'cleanup'), expires_at + CLEANUP_GRACE_PERIOD)
+            if self.policy.auto_expire:
+                await self._schedule_legal_aware_expiration([fragment])
+
+            yield fragment
+
+        digest = original_hash.hexdigest()
+        for fragment in group:
+            fragment.original_hash = digest
+            fragment.total_fragments = len(group)
+
+        print(f"[PATENT] Streaming temporal fragmentation complete: {len(group)} fragments, "
+              f"quantum timing patterns: {'enabled' if self.policy.quantum_resistance_level >= 2 else 'disabled'}")
+
     def _extract_legal_metadata(self, routing_decision: Optional['RoutingDecision']) -> Dict[str, Any]:
         """Extract legal routing metadata from routing decision"""
         if routing_decision is None:
@@ -207,17 +352,38 @@ class TemporalFragmentation:
     
     def _schedule_single_expiration(self, fragment: DataFragment, expiration_time: float):
         """Schedule expiration for a single fragment"""
-        delay = max(0, expiration_time - time.time())
+        self.expiration_scheduler.schedule((fragment.fragment_id, 'mark'), expiration_time)
+    
+    def _process_expirations(self, expired: List):
+        """Handle one timing wheel tick's worth of due (fragment_id, action) keys"""
+        current_time = time.time()
+        legally_routed = []
+        to_wipe = []
         
-        def expire_fragment():
-            if fragment.fragment_id in self.fragments:
+        for (fragment_id, action), _ in expired:
+            fragment = self.fragments.get(fragment_id)
+            if fragment is None:
+                continue
+            if action == 'mark':
                 fragment.status = FragmentStatus.EXPIRED
-                print(f"[PATENT] Fragment {fragment.fragment_id} expired in "
-                      f"{len(fragment.legal_jurisdictions)} hostile jurisdictions")
+                if fragment.legal_jurisdictions:
+                    legally_routed.append(fragment)
+            elif action == 'wipe':
+                to_wipe.append(fragment)
+            elif action == 'purge' or (action == 'cleanup' and self._running):
+                self.fragments.pop(fragment_id, None)
+        
+        # Secure wipe for the whole tick in one pass
+        for fragment in to_wipe:
+            self._wipe_fragment(fragment)
+            self.expiration_scheduler.schedule(
+                (fragment.fragment_id, 'purge'), current_time + EXPIRED_FRAGMENT_RETENTION
+            )
         
-        timer = threading.Timer(delay, expire_fragment)
-        timer.start()
-        self.expiration_scheduler[fragment.fragment_id] = timer
+        if legally_routed:
+            jurisdictions = sum(len(fragment.legal_jurisdictions) for fragment in legally_routed)
+            print(f"[PATENT] {len(legally_routed)} fragments expired across "
+                  f"{jurisdictions} hostile jurisdiction assignments")
     
     async def detect_legal_process_on_fragments(self, process_indicator: str) -> bool:
         """
@@ -233,17 +399,12 @@ class TemporalFragmentation:
         if legal_process_detected:
             print(f"[PATENT] Legal process detected on fragmented data: {process_indicator}")
             
-            # Trigger immediate expiration of all active fragments
-            for fragment_id, fragment in self.fragments.items():
+            # Wipe all active fragments now; their pending expirations are replaced by a purge
+            for fragment_id, fragment in list(self.fragments.items()):
                 if fragment.status == FragmentStatus.ACTIVE:
-                    fragment.status = FragmentStatus.EXPIRED
+                    self._expire_fragment(fragment_id)
                     print(f"[PATENT] Emergency expiration triggered for {fragment_id}")
             
-            # Cancel all pending expiration timers
-            for timer in self.expiration_scheduler.values():
-                timer.cancel()
-            self.expiration_scheduler.clear()
-            
             return True
         
         return False
@@ -291,70 +452,17 @@ class TemporalFragmentation:
         noise_level = self.policy.quantum_resistance_level
         
         if noise_level >= 2:
-            # Generate quantum timing-based noise patterns
-            data_array = np.frombuffer(data, dtype=np.uint8)
-            
-            # Create temporal quantum interference pattern
-            microsecond_phase = int((creation_time * 1000000) % 1000000)
-            temporal_seed = (fragment_index * microsecond_phase) % 2**32
-            
-            # Generate quantum decoherence timing pattern
-            timing_random = np.random.RandomState(temporal_seed)
-            decoherence_pattern = timing_random.randint(0, 256, size=len(data_array), dtype=np.uint8)
-            
-            # Apply quantum superposition-like temporal interference
-            time_oscillation = np.sin(2 * np.pi * creation_time * np.arange(len(data_array)) / 1000.0)
-            temporal_noise = (time_oscillation * 127 + 128).astype(np.uint8)
-            
-            # Add quantum entanglement-like correlation between bytes
-            entanglement_noise = np.zeros_like(data_array, dtype=np.uint8)
-            for i in range(0, len(data_array) - 1, 2):
-                correlation = timing_random.randint(0, 64)
-                entanglement_noise[i] = correlation
-                if i + 1 < len(data_array):
-                    entanglement_noise[i + 1] = correlation
-            
-            # Combine all quantum timing effects
-            quantum_enhanced = (
-                data_array ^ decoherence_pattern ^ temporal_noise ^ entanglement_noise
-            ) % 256
-            
-            return quantum_enhanced.astype(np.uint8).tobytes()
+            # XOR with the fragment's quantum timing keystream: decoherence timing
+            # pattern, temporal sine interference and entanglement-like pair noise
+            return self.keystream_cache.apply(data, fragment_index, creation_time)
         
         return data
     
     def _remove_quantum_timing_patterns(self, data: bytes, fragment_index: int, creation_time: float) -> bytes:
         """Remove quantum timing patterns from fragment data during reconstruction"""
         if self.policy.quantum_resistance_level >= 2:
-            # Reverse the quantum timing-based noise patterns
-            data_array = np.frombuffer(data, dtype=np.uint8)
-            
-            # Recreate the same temporal quantum interference pattern
-            microsecond_phase = int((creation_time * 1000000) % 1000000)
-            temporal_seed = (fragment_index * microsecond_phase) % 2**32
-            
-            # Regenerate quantum decoherence timing pattern
-            timing_random = np.random.RandomState(temporal_seed)
-            decoherence_pattern = timing_random.randint(0, 256, size=len(data_array), dtype=np.uint8)
-            
-            # Recreate quantum superposition-like temporal interference
-            time_oscillation = np.sin(2 * np.pi * creation_time * np.arange(len(data_array)) / 1000.0)
-            temporal_noise = (time_oscillation * 127 + 128).astype(np.uint8)
-            
-            # Recreate quantum entanglement-like correlation between bytes
-            entanglement_noise = np.zeros_like(data_array, dtype=np.uint8)
-            for i in range(0, len(data_array) - 1, 2):
-                correlation = timing_random.randint(0, 64)
-                entanglement_noise[i] = correlation
-                if i + 1 < len(data_array):
-                    entanglement_noise[i + 1] = correlation
-            
-            # Remove all quantum timing effects (XOR is its own inverse)
-            clean_data = (
-                data_array ^ decoherence_pattern ^ temporal_noise ^ entanglement_noise
-            ) % 256
-            
-            return clean_data.astype(np.uint8).tobytes()
+            # Same cached keystream as fragmentation (XOR is its own inverse)
+            return self.keystream_cache.apply(data, fragment_index, creation_time)
         
         return data
     
@@ -408,25 +516,24 @@ class TemporalFragmentation:
         if len(fragments) < required_fragments:
             return None
         
-        # Reconstruct data with overlap handling
-        reconstructed_data = bytearray()
+        # Reconstruct data with overlap handling into one preallocated buffer
         overlap_size = int(len(fragments[0].data_chunk) * self.policy.overlap_factor)
-        
-        for i, fragment in enumerate(fragments):
-            # Remove quantum timing patterns
-            clean_chunk = self._remove_quantum_timing_patterns(
-                fragment.data_chunk, 
-                fragment.fragment_index, 
-                fragment.created_at
-            )
-            
-            if i == 0:
-                # First fragment - take all data
-                reconstructed_data.extend(clean_chunk)
+        skips = [0] + [overlap_size] * (len(fragments) - 1)
+        lengths = [max(0, len(fragment.data_chunk) - skip) for fragment, skip in zip(fragments, skips)]
+        reconstructed_data = np.empty(sum(lengths), dtype=np.uint8)
+        offset = 0
+        
+        for fragment, skip, length in zip(fragments, skips, lengths):
+            # Remove quantum timing patterns straight into the output; the first
+            # fragment is taken whole, later ones skip the overlap
+            out = reconstructed_data[offset:offset + length]
+            offset += length
+            if self.policy.quantum_resistance_level >= 2:
+                self.keystream_cache.apply_into(
+                    fragment.data_chunk, fragment.fragment_index, fragment.created_at, out=out, start=skip
+                )
             else:
-                # Subsequent fragments - skip overlap
-                start_idx = overlap_size if i > 0 else 0
-                reconstructed_data.extend(clean_chunk[start_idx:])
+                out[:] = np.frombuffer(fragment.data_chunk, dtype=np.uint8)[skip:]
         
         # Verify integrity
         reconstructed_hash = hashlib.sha256(reconstructed_data).hexdigest()
@@ -440,8 +547,50 @@ class TemporalFragmentation:
         for fragment in fragments:
             fragment.status = FragmentStatus.RECONSTRUCTED
         
-        return bytes(reconstructed_data)
-    
+        return reconstructed_data.tobytes()
+
+    async def reconstruct_stream(self, original_id: str) -> AsyncIterator[bytearray]:
+        """
+        Rebuild fragmented data incrementally, one fragment's payload at a time
+
+        Every fragment of the group must still be valid, since a gap cannot be
+        bridged without buffering; otherwise nothing is yielded. The SHA-256 is
+        checked as the payload streams out, and a mismatch raises ``ValueError``
+        after the last block.
+        """
+        fragments = []
+        for frag_id in self.fragment_groups.get(original_id, []):
+            fragment = self.access_fragment(frag_id)
+            if fragment and fragment.status in [FragmentStatus.ACTIVE, FragmentStatus.EXPIRING]:
+                fragments.append(fragment)
+
+        fragments.sort(key=lambda x: x.fragment_index)
+        if (not fragments or not fragments[0].original_hash
+                or [f.fragment_index for f in fragments] != list(range(fragments[0].total_fragments))):
+            return
+
+        overlap_size = int(len(fragments[0].data_chunk) * self.policy.overlap_factor)
+        reconstructed_hash = hashlib.sha256()
+
+        for i, fragment in enumerate(fragments):
+            skip = overlap_size if i > 0 else 0
+            block = bytearray(max(0, len(fragment.data_chunk) - skip))
+            out = np.frombuffer(block, dtype=np.uint8)
+            if self.policy.quantum_resistance_level >= 2:
+                self.keystream_cache.apply_into(
+                    fragment.data_chunk, fragment.fragment_index, fragment.created_at, out=out, start=skip
+                )
+            else:
+                out[:] = np.frombuffer(fragment.data_chunk, dtype=np.uint8)[skip:]
+            reconstructed_hash.update(block)
+            yield block
+
+        if reconstructed_hash.hexdigest() != fragments[0].original_hash:
+            raise ValueError(f"Reconstructed stream for {original_id} failed integrity verification")
+
+        for fragment in fragments:
+            fragment.status = FragmentStatus.RECONSTRUCTED
+
     def _attempt_repair_reconstruction(self, fragments: List[DataFragment]) -> Optional[bytes]:
         """Attempt to repair reconstruction using quantum error correction"""
         if len(fragments) < 2:
@@ -473,24 +622,32 @@ class TemporalFragmentation:
     
     def _schedule_expiration(self, fragments: List[DataFragment]):
         """Schedule automatic expiration of fragments"""
+        current_time = time.time()
         for fragment in fragments:
-            expiration_delay = fragment.expires_at - time.time()
-            if expiration_delay > 0:
-                timer = threading.Timer(expiration_delay, self._expire_fragment, [fragment.fragment_id])
-                timer.start()
-                self.expiration_scheduler[fragment.fragment_id] = timer
+            if fragment.expires_at > current_time:
+                self.expiration_scheduler.schedule((fragment.fragment_id, 'wipe'), fragment.expires_at)
+    
+    def _wipe_fragment(self, fragment: DataFragment):
+        """Mark a fragment expired and securely overwrite its data"""
+        fragment.status = FragmentStatus.EXPIRED
+        if isinstance(fragment.data_chunk, memoryview) and not fragment.data_chunk.readonly:
+            # Zero the fragment's span of the group arena in place
+            np.frombuffer(fragment.data_chunk, dtype=np.uint8)[:] = 0
+        else:
+            fragment.data_chunk = bytes(len(fragment.data_chunk))
     
     def _expire_fragment(self, fragment_id: str):
         """Expire a fragment and clean up its data"""
         if fragment_id in self.fragments:
             fragment = self.fragments[fragment_id]
-            fragment.status = FragmentStatus.EXPIRED
+            self.expiration_scheduler.cancel((fragment_id, 'mark'))
+            self.expiration_scheduler.cancel((fragment_id, 'wipe'))
             
-            # Securely overwrite fragment data
-            fragment.data_chunk = b'\x00' * len(fragment.data_chunk)
+            # Securely overwrite fragment data in its arena
+            self._wipe_fragment(fragment)
             
             # Remove from active fragments after a delay
-            threading.Timer(1.0, lambda: self.fragments.pop(fragment_id, None)).start()
+            self.expiration_scheduler.schedule((fragment_id, 'purge'), time.time() + EXPIRED_FRAGMENT_RETENTION)
     
     def force_expire_all(self, original_id: str = None):
         """Force immediate expiration of fragments"""
@@ -553,34 +710,20 @@ class TemporalFragmentation:
             return
         
         self._running = True
-        self._cleanup_thread = threading.Thread(target=self._cleanup_loop, daemon=True)
-        self._cleanup_thread.start()
+        
+        # Cleanup entries are scheduled per fragment on the expiration wheel; sweep
+        # once for fragments whose grace period ran out while the service was off
+        current_time = time.time()
+        stale = [
+            frag_id for frag_id, fragment in list(self.fragments.items())
+            if current_time > fragment.expires_at + CLEANUP_GRACE_PERIOD
+        ]
+        for frag_id in stale:
+            self.fragments.pop(frag_id, None)
     
     def stop_cleanup_service(self):
         """Stop background cleanup service"""
         self._running = False
-        if self._cleanup_thread:
-            self._cleanup_thread.join(timeout=1.0)
-    
-    def _cleanup_loop(self):
-        """Background cleanup of expired fragments"""
-        while self._running:
-            try:
-                current_time = time.time()
-                expired_fragments = []
-                
-                for frag_id, fragment in self.fragments.items():
-                    if current_time > fragment.expires_at + 5.0:  # Grace period
-                        expired_fragments.append(frag_id)
-                
-                for frag_id in expired_fragments:
-                    self.fragments.pop(frag_id, None)
-                
-                time.sleep(0.01)  # 10ms cleanup interval
-                
-            except Exception as e:
-                print(f"Cleanup error: {e}")
-                break
     
     def get_system_stats(self) -> Dict:
         """Get comprehensive system statistics"""
@@ -597,6 +740,8 @@ class TemporalFragmentation:
             'active_fragments': active_fragments,
             'fragment_groups': len(self.fragment_groups),
             'cleanup_running': self._running,
+            'expiration_scheduler': self.expiration_scheduler.get_statistics(),
+            'keystream_cache': self.keystream_cache.get_statistics(),
             'policy': {
                 'max_lifetime_ms': self.policy.max_fragment_lifetime_ms,
                 'min_fragments': self.policy.min_fragments,
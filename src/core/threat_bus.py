@@ -0,0 +1,198 @@
+"""
+MWRASP Threat Event Bus
+In-process publish/subscribe for detected threats with bounded asyncio subscriber queues
+"""
+
+import asyncio
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+
+# Default bound on each subscriber's pending events
+SUBSCRIBER_QUEUE_SIZE = 1024
+
+# What a full subscriber queue does with a new event
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+
+
+class ThreatSubscription:
+    """One subscriber's bounded queue on a ThreatEventBus.
+
+    Events are consumed with ``await get()``, ``drain()`` or ``async for``.
+    Each published event is queued once per subscription and handed out
+    once, so a single consumer sees every event exactly once. The only
+    exception is overflow: a full queue drops an event according to
+    ``overflow`` and counts it in ``dropped``.
+    """
+
+    def __init__(self, bus: 'ThreatEventBus', name: str, maxsize: int, overflow: str,
+                 loop: asyncio.AbstractEventLoop):
+        if overflow not in (DROP_OLDEST, DROP_NEWEST):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.bus = bus
+        self.name = name
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.loop = loop
+        self._events: deque = deque()
+        self._waiter: Optional[asyncio.Future] = None
+        self._space: Optional[asyncio.Future] = None
+        self.closed = False
+
+        self.delivered = 0
+        self.dropped = 0
+        self.high_watermark = 0
+
+    def _deliver(self, event: Any) -> bool:
+        """Queue an event; runs on the subscriber's loop"""
+        if self.closed:
+            return False
+        if len(self._events) >= self.maxsize:
+            self.dropped += 1
+            if self.overflow == DROP_NEWEST:
+                return False
+            self._events.popleft()
+        self._events.append(event)
+        self.delivered += 1
+        self.high_watermark = max(self.high_watermark, len(self._events))
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+        return True
+
+    async def _wait_for_space(self):
+        while not self.closed and len(self._events) >= self.maxsize:
+            if self._space is None or self._space.done():
+                self._space = self.loop.create_future()
+            await self._space
+
+    def _release_space(self):
+        if self._space is not None and not self._space.done():
+            self._space.set_result(None)
+
+    async def get(self) -> Any:
+        """Next event, waiting until one is published; None once closed and empty"""
+        while not self._events:
+            if self.closed:
+                return None
+            self._waiter = self.loop.create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        event = self._events.popleft()
+        self._release_space()
+        return event
+
+    def drain(self, limit: Optional[int] = None) -> List[Any]:
+        """Every queued event (or the oldest ``limit``) without waiting"""
+        count = len(self._events) if limit is None else min(limit, len(self._events))
+        events = [self._events.popleft() for _ in range(count)]
+        if events:
+            self._release_space()
+        return events
+
+    def pending(self) -> int:
+        return len(self._events)
+
+    def close(self):
+        """Stop receiving events and wake any waiting consumer"""
+        self.bus.unsubscribe(self)
+        self.closed = True
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+        self._release_space()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Any:
+        event = await self.get()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'pending': len(self._events),
+            'maxsize': self.maxsize,
+            'overflow': self.overflow,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'high_watermark': self.high_watermark
+        }
+
+
+class ThreatEventBus:
+    """Fans each published threat out to every subscriber's queue.
+
+    ``publish`` is synchronous, never blocks and may be called from any
+    thread. Events for subscribers on another thread's event loop are handed
+    over with ``call_soon_threadsafe``. Producers already running on an
+    event loop can use ``publish_async`` instead, which waits for room in
+    full queues rather than dropping (backpressure).
+    """
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscriptions: List[ThreatSubscription] = []
+        self._lock = threading.Lock()
+        self.published = 0
+
+    def subscribe(self, name: str, maxsize: Optional[int] = None,
+                  overflow: str = DROP_OLDEST) -> ThreatSubscription:
+        """Register a subscriber bound to the running event loop"""
+        subscription = ThreatSubscription(
+            self, name, maxsize or self.queue_size, overflow, asyncio.get_running_loop()
+        )
+        with self._lock:
+            self._subscriptions = self._subscriptions + [subscription]
+        return subscription
+
+    def unsubscribe(self, subscription: ThreatSubscription):
+        with self._lock:
+            self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    def publish(self, event: Any) -> int:
+        """Deliver an event to every subscriber; returns how many were reached"""
+        self.published += 1
+        subscriptions = self._subscriptions
+        if not subscriptions:
+            return 0
+        try:
+            current_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            current_loop = None
+
+        for subscription in subscriptions:
+            if subscription.loop is current_loop:
+                subscription._deliver(event)
+            else:
+                try:
+                    subscription.loop.call_soon_threadsafe(subscription._deliver, event)
+                except RuntimeError:
+                    pass  # Subscriber's loop has already shut down
+        return len(subscriptions)
+
+    async def publish_async(self, event: Any) -> int:
+        """Deliver an event, waiting for room in full queues on this loop"""
+        loop = asyncio.get_running_loop()
+        for subscription in self._subscriptions:
+            if subscription.loop is loop:
+                await subscription._wait_for_space()
+        return self.publish(event)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        subscriptions = self._subscriptions
+        return {
+            'published': self.published,
+            'subscribers': len(subscriptions),
+            'dropped': sum(s.dropped for s in subscriptions),
+            'subscriptions': [s.get_statistics() for s in subscriptions]
+        }
@@ -0,0 +1,191 @@
+"""
+MWRASP Threat Correlation Index
+Time-ordered per-indicator threat index with windowed aggregate queries
+"""
+
+import math
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+@dataclass
+class WindowAggregate:
+    """Aggregates over the threats of one indicator inside a time window"""
+    count: int
+    confidence_sum: float
+    mean_confidence: float
+    confidence_std: float
+    mean_age: float      # Mean of (current_time - timestamp)
+    age_std: float       # Spread of the threat timestamps (interval std)
+
+
+def _population_std(total: float, total_sq: float, count: int) -> float:
+    if count == 0:
+        return 0.0
+    mean = total / count
+    variance = total_sq / count - mean * mean
+    return math.sqrt(variance) if variance > 0.0 else 0.0
+
+
+class IndicatorTimeIndex:
+    """Sorted timestamps for one quantum indicator with prefix sums.
+
+    Windowed count / confidence / interval statistics are answered with a
+    bisect plus prefix-sum differences, so queries are O(log n) whatever the
+    window length. Timestamps are stored relative to a base that moves on
+    compaction to keep the squared sums well conditioned. Entries older than
+    ``retention`` seconds behind the newest are dropped; storage is compacted
+    once more than half of it is stale, so pruning is O(1) amortized.
+    """
+
+    COMPACT_MIN_STALE = 1024
+
+    def __init__(self, retention: float = 300.0):
+        self.retention = retention
+        self._base = 0.0
+        self._times: List[float] = []
+        self._confidences: List[float] = []
+        # Prefix sums; element i covers entries [0, i)
+        self._time_sum: List[float] = [0.0]
+        self._time_sq_sum: List[float] = [0.0]
+        self._confidence_sum: List[float] = [0.0]
+        self._confidence_sq_sum: List[float] = [0.0]
+        self._start = 0
+        self.total_recorded = 0
+
+    def __len__(self) -> int:
+        return len(self._times) - self._start
+
+    def _append_prefix(self, relative_time: float, confidence: float):
+        self._time_sum.append(self._time_sum[-1] + relative_time)
+        self._time_sq_sum.append(self._time_sq_sum[-1] + relative_time * relative_time)
+        self._confidence_sum.append(self._confidence_sum[-1] + confidence)
+        self._confidence_sq_sum.append(self._confidence_sq_sum[-1] + confidence * confidence)
+
+    def _rebuild(self, times: List[float], confidences: List[float]):
+        self._base = times[0] if times else 0.0
+        self._times = [t - self._base for t in times]
+        self._confidences = list(confidences)
+        self._time_sum = [0.0]
+        self._time_sq_sum = [0.0]
+        self._confidence_sum = [0.0]
+        self._confidence_sq_sum = [0.0]
+        for relative_time, confidence in zip(self._times, self._confidences):
+            self._append_prefix(relative_time, confidence)
+        self._start = 0
+
+    def add(self, timestamp: float, confidence: float):
+        """Index one threat occurrence"""
+        self.total_recorded += 1
+        if not self._times:
+            self._base = timestamp
+        relative_time = timestamp - self._base
+        if len(self) == 0 or relative_time >= self._times[-1]:
+            self._times.append(relative_time)
+            self._confidences.append(confidence)
+            self._append_prefix(relative_time, confidence)
+        else:
+            # Late arrival (e.g. batched history): insert in order and rebuild
+            times = [t + self._base for t in self._times[self._start:]]
+            confidences = self._confidences[self._start:]
+            position = bisect_right(times, timestamp)
+            times.insert(position, timestamp)
+            confidences.insert(position, confidence)
+            self._rebuild(times, confidences)
+        self.prune(self.newest - self.retention)
+
+    @property
+    def newest(self) -> float:
+        return self._times[-1] + self._base if len(self) else -math.inf
+
+    def prune(self, cutoff: float):
+        """Drop entries at or before cutoff"""
+        self._start = bisect_right(self._times, cutoff - self._base, lo=self._start)
+        if self._start >= self.COMPACT_MIN_STALE and self._start > len(self):
+            self._rebuild(
+                [t + self._base for t in self._times[self._start:]],
+                self._confidences[self._start:]
+            )
+
+    def count_since(self, cutoff: float) -> int:
+        """Entries with timestamp strictly after cutoff"""
+        return len(self._times) - bisect_right(self._times, cutoff - self._base, lo=self._start)
+
+    def window(self, current_time: float, window: float) -> WindowAggregate:
+        """Aggregates over entries with current_time - timestamp < window"""
+        first = bisect_right(self._times, current_time - window - self._base, lo=self._start)
+        last = len(self._times)
+        count = last - first
+        if count == 0:
+            return WindowAggregate(0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+        time_sum = self._time_sum[last] - self._time_sum[first]
+        time_sq_sum = self._time_sq_sum[last] - self._time_sq_sum[first]
+        confidence_sum = self._confidence_sum[last] - self._confidence_sum[first]
+        confidence_sq_sum = self._confidence_sq_sum[last] - self._confidence_sq_sum[first]
+        mean_time = time_sum / count + self._base
+        return WindowAggregate(
+            count=count,
+            confidence_sum=confidence_sum,
+            mean_confidence=confidence_sum / count,
+            confidence_std=_population_std(confidence_sum, confidence_sq_sum, count),
+            mean_age=current_time - mean_time,
+            age_std=_population_std(time_sum, time_sq_sum, count)
+        )
+
+
+class ThreatCorrelationIndex:
+    """Quantum indicator -> IndicatorTimeIndex"""
+
+    def __init__(self, retention: float = 300.0):
+        self.retention = retention
+        self._indices: Dict[str, IndicatorTimeIndex] = {}
+
+    def add(self, indicator: str, timestamp: float, confidence: float):
+        index = self._indices.get(indicator)
+        if index is None:
+            index = IndicatorTimeIndex(self.retention)
+            self._indices[indicator] = index
+        index.add(timestamp, confidence)
+
+    def __contains__(self, indicator: str) -> bool:
+        return indicator in self._indices
+
+    def __getitem__(self, indicator: str) -> IndicatorTimeIndex:
+        return self._indices[indicator]
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def items(self) -> Iterator[Tuple[str, IndicatorTimeIndex]]:
+        return iter(self._indices.items())
+
+    def window(self, current_time: float, window: float) -> Dict[str, WindowAggregate]:
+        """Per-indicator aggregates for every indicator seen in the window"""
+        aggregates = {}
+        for indicator, index in self._indices.items():
+            aggregate = index.window(current_time, window)
+            if aggregate.count:
+                aggregates[indicator] = aggregate
+        return aggregates
+
+    def coordinated_confidence(self, current_time: float, window: float,
+                               min_indicators: int = 3) -> Optional[float]:
+        """Mean confidence across indicators active in the window.
+
+        Returns None unless at least ``min_indicators`` distinct indicators
+        were seen, i.e. unless the window looks like a coordinated attack.
+        """
+        active = self.window(current_time, window)
+        if len(active) < min_indicators:
+            return None
+        total_threats = sum(recent.count for recent in active.values())
+        return sum(recent.confidence_sum for recent in active.values()) / total_threats
+
+    def get_statistics(self) -> Dict[str, int]:
+        return {
+            'indexed_indicators': len(self._indices),
+            'indexed_threats': sum(len(index) for index in self._indices.values()),
+            'retention_seconds': self.retention
+        }
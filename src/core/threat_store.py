@@ -0,0 +1,199 @@
+"""
+MWRASP Threat Store
+Time-bucketed threat history with rolling active-window counters and on-disk archiving
+"""
+
+import bisect
+import heapq
+import json
+import threading
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+
+# Threats count as active for this many seconds after detection
+ACTIVE_THREAT_WINDOW = 300.0
+
+# Width of one time bucket
+THREAT_BUCKET_SECONDS = 10.0
+
+# Most recent threats kept in memory for indexing, whatever their age
+RETAINED_THREATS = 10000
+
+
+@dataclass
+class _ThreatBucket:
+    times: List[float] = field(default_factory=list)
+    threats: List[Any] = field(default_factory=list)
+    expired: int = 0  # Threats at the front that have left the active window
+
+
+class ThreatStore:
+    """Append-only threat history that answers active-window queries without rescanning.
+
+    Threats are placed in ``bucket_seconds`` buckets by detection time.
+    Counts per threat level and the sum of confidence scores over the
+    active window are kept as running totals. Advancing the clock retires
+    each threat exactly once, so ``active_statistics`` costs O(levels)
+    amortized and ``active_threats`` costs O(active). Once a bucket has
+    fully left the window it is appended to ``archive_path`` as JSON lines,
+    when a path is given, and released from memory.
+
+    It also stands in for the plain list it replaces: ``len`` counts every
+    threat ever recorded. Indexing, slicing and iteration cover the last
+    ``retained`` threats in recording order; older indices raise
+    IndexError.
+    """
+
+    def __init__(self, levels: Iterable[Enum], window: float = ACTIVE_THREAT_WINDOW,
+                 bucket_seconds: float = THREAT_BUCKET_SECONDS, retained: int = RETAINED_THREATS,
+                 archive_path: Optional[Union[str, Path]] = None):
+        self.levels = list(levels)
+        self.window = window
+        self.bucket_seconds = bucket_seconds
+        self.archive_path = Path(archive_path) if archive_path is not None else None
+        self._lock = threading.RLock()
+
+        self._buckets: Dict[int, _ThreatBucket] = {}
+        self._bucket_keys: List[int] = []  # min-heap of keys in _buckets
+        self._horizon = float('-inf')  # Threats detected at or before this are inactive
+        self._recent: deque = deque(maxlen=retained)
+
+        self.total = 0
+        self.archived = 0
+        self.active_count = 0
+        self.level_counts: Dict[Enum, int] = {level: 0 for level in self.levels}
+        self.confidence_sum = 0.0
+
+    # List compatibility
+
+    def __len__(self) -> int:
+        return self.total
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(list(self._recent))
+
+    def __getitem__(self, index):
+        with self._lock:
+            first = self.total - len(self._recent)
+            if isinstance(index, slice):
+                positions = range(self.total)[index]
+                if positions and min(positions[0], positions[-1]) < first:
+                    raise IndexError("threat history slice reaches into archived threats")
+                return [self._recent[position - first] for position in positions]
+            position = index + self.total if index < 0 else index
+            if not first <= position < self.total:
+                raise IndexError("threat history index out of retained range")
+            return self._recent[position - first]
+
+    def append(self, threat: Any):
+        with self._lock:
+            self.total += 1
+            self._recent.append(threat)
+            detection_time = threat.detection_time
+            if detection_time <= self._horizon:
+                # Already outside the active window
+                self._archive([threat])
+                return
+
+            key = int(detection_time // self.bucket_seconds)
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = _ThreatBucket()
+                heapq.heappush(self._bucket_keys, key)
+            position = bisect.bisect_right(bucket.times, detection_time)
+            bucket.times.insert(position, detection_time)
+            bucket.threats.insert(position, threat)
+
+            self.active_count += 1
+            self.level_counts[threat.threat_level] += 1
+            self.confidence_sum += threat.confidence_score
+
+    def extend(self, threats: Iterable[Any]):
+        for threat in threats:
+            self.append(threat)
+
+    # Active window
+
+    def advance(self, now: float):
+        """Retire threats that are no longer active at ``now``; the clock never moves backwards"""
+        with self._lock:
+            horizon = now - self.window
+            if horizon <= self._horizon:
+                return
+            self._horizon = horizon
+
+            while self._bucket_keys:
+                key = self._bucket_keys[0]
+                bucket = self._buckets[key]
+                while bucket.expired < len(bucket.times) and bucket.times[bucket.expired] <= horizon:
+                    threat = bucket.threats[bucket.expired]
+                    self.active_count -= 1
+                    self.level_counts[threat.threat_level] -= 1
+                    self.confidence_sum -= threat.confidence_score
+                    bucket.expired += 1
+                if bucket.expired < len(bucket.times):
+                    break  # Every later bucket is newer still
+                heapq.heappop(self._bucket_keys)
+                del self._buckets[key]
+                self._archive(bucket.threats)
+
+            if self.active_count == 0:
+                self.confidence_sum = 0.0  # Drop accumulated rounding error
+
+    def active_threats(self, now: float) -> List[Any]:
+        """Threats detected less than ``window`` seconds before now, oldest first"""
+        with self._lock:
+            self.advance(now)
+            threats = []
+            for key in sorted(self._buckets):
+                bucket = self._buckets[key]
+                threats.extend(bucket.threats[bucket.expired:])
+        # Re-check each threat in case its detection time was edited after recording
+        return [threat for threat in threats if now - threat.detection_time < self.window]
+
+    def active_statistics(self, now: float) -> Dict[str, Any]:
+        """Active count, per-level counts and average confidence from the running totals"""
+        with self._lock:
+            self.advance(now)
+            return {
+                'active_threats': self.active_count,
+                'threat_levels': {level.name: self.level_counts[level] for level in self.levels},
+                'average_confidence': self.confidence_sum / self.active_count if self.active_count else 0.0
+            }
+
+    # Archive
+
+    def _archive(self, threats: List[Any]):
+        self.archived += len(threats)
+        if self.archive_path is None:
+            return
+        lines = []
+        for threat in threats:
+            record = asdict(threat)
+            record['threat_level'] = threat.threat_level.name
+            lines.append(json.dumps(record, default=str))
+        with open(self.archive_path, 'a') as archive:
+            archive.write('\n'.join(lines) + '\n')
+
+    def iter_archive(self) -> Iterator[Dict[str, Any]]:
+        """Archived threats as dicts, in the order they were archived"""
+        if self.archive_path is None or not self.archive_path.exists():
+            return
+        with open(self.archive_path) as archive:
+            for line in archive:
+                if line.strip():
+                    yield json.loads(line)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            'total_threats': self.total,
+            'active_threats': self.active_count,
+            'buckets': len(self._buckets),
+            'retained_threats': len(self._recent),
+            'archived_threats': self.archived,
+            'archive_path': str(self.archive_path) if self.archive_path is not None else None
+        }
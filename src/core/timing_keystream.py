@@ -0,0 +1,164 @@
+"""
+MWRASP Quantum Timing Keystream
+Vectorized, cached generation of the temporal fragment noise keystream
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+
+# Bytes of fragment keystream kept for reuse between fragmentation and reconstruction
+DEFAULT_KEYSTREAM_CACHE_BYTES = 64 * 1024 * 1024
+
+# Creation times whose sine tables are kept
+DEFAULT_SINE_TABLES = 64
+
+
+def temporal_seed(fragment_index: int, creation_time: float) -> int:
+    """RandomState seed of a fragment's decoherence and entanglement noise"""
+    microsecond_phase = int((creation_time * 1000000) % 1000000)
+    return (fragment_index * microsecond_phase) % 2**32
+
+
+def temporal_noise(length: int, creation_time: float, start: int = 0) -> np.ndarray:
+    """Sine interference bytes [start, length) for a creation time; byte j depends only on j"""
+    time_oscillation = np.sin(2 * np.pi * creation_time * np.arange(start, length) / 1000.0)
+    return (time_oscillation * 127 + 128).astype(np.uint8)
+
+
+def timing_keystream(length: int, fragment_index: int, creation_time: float,
+                     sine_table: np.ndarray = None) -> np.ndarray:
+    """Decoherence ^ temporal ^ entanglement noise for one fragment.
+
+    Draws the same RandomState sequence as the original per-byte-pair loop:
+    ``length`` uint8 decoherence bytes, then one ``randint(0, 64)`` per byte
+    pair, taken here as a single batched draw and repeated over each pair
+    (an odd trailing byte gets no entanglement noise).
+    """
+    timing_random = np.random.RandomState(temporal_seed(fragment_index, creation_time))
+    keystream = timing_random.randint(0, 256, size=length, dtype=np.uint8)
+
+    if sine_table is None:
+        sine_table = temporal_noise(length, creation_time)
+    np.bitwise_xor(keystream, sine_table[:length], out=keystream)
+
+    pairs = length // 2
+    correlations = timing_random.randint(0, 64, size=pairs).astype(np.uint8)
+    paired = keystream[:pairs * 2].reshape(pairs, 2)
+    np.bitwise_xor(paired, correlations[:, None], out=paired)
+    return keystream
+
+
+class TimingKeystreamCache:
+    """LRU caches of fragment keystreams and per-creation-time sine tables.
+
+    Keystreams are keyed by ``(fragment_index, creation_time, length)`` and
+    bounded by total bytes, so a fragment group's keystreams are generated at
+    fragmentation and reused at reconstruction. Sine tables are keyed by
+    creation time (all fragments of a group share one) and extended by only
+    the missing tail when a longer fragment needs them; ``np.sin`` over the
+    large creation-time phases dominates cold keystream generation. Cached
+    arrays are read-only.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_KEYSTREAM_CACHE_BYTES,
+                 max_sine_tables: int = DEFAULT_SINE_TABLES):
+        self.max_bytes = max_bytes
+        self.max_sine_tables = max_sine_tables
+        self._keystreams: "OrderedDict[Tuple[int, float, int], np.ndarray]" = OrderedDict()
+        self._sine_tables: "OrderedDict[float, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.sine_table_builds = 0
+
+    def __len__(self) -> int:
+        return len(self._keystreams)
+
+    def sine_table(self, length: int, creation_time: float) -> np.ndarray:
+        with self._lock:
+            table = self._sine_tables.get(creation_time)
+            if table is not None and len(table) >= length:
+                self._sine_tables.move_to_end(creation_time)
+                return table
+        if table is None:
+            table = temporal_noise(length, creation_time)
+        else:
+            table = np.concatenate((table, temporal_noise(length, creation_time, start=len(table))))
+        table.flags.writeable = False
+        with self._lock:
+            self.sine_table_builds += 1
+            self._sine_tables[creation_time] = table
+            self._sine_tables.move_to_end(creation_time)
+            while len(self._sine_tables) > self.max_sine_tables:
+                self._sine_tables.popitem(last=False)
+        return table
+
+    def keystream(self, length: int, fragment_index: int, creation_time: float) -> np.ndarray:
+        key = (fragment_index, creation_time, length)
+        with self._lock:
+            keystream = self._keystreams.get(key)
+            if keystream is not None:
+                self._keystreams.move_to_end(key)
+                self.hits += 1
+                return keystream
+            self.misses += 1
+
+        keystream = timing_keystream(length, fragment_index, creation_time,
+                                     self.sine_table(length, creation_time))
+        keystream.flags.writeable = False
+        if length > self.max_bytes:
+            return keystream
+
+        with self._lock:
+            if key not in self._keystreams:
+                self._keystreams[key] = keystream
+                self._bytes += length
+            while self._bytes > self.max_bytes:
+                _, evicted = self._keystreams.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+        return keystream
+
+    def apply(self, data: bytes, fragment_index: int, creation_time: float) -> bytes:
+        """XOR data with its fragment keystream (the transform is its own inverse)"""
+        data_array = np.frombuffer(data, dtype=np.uint8)
+        keystream = self.keystream(len(data_array), fragment_index, creation_time)
+        return np.bitwise_xor(data_array, keystream).tobytes()
+
+    def apply_into(self, data, fragment_index: int, creation_time: float,
+                   out: np.ndarray, start: int = 0) -> np.ndarray:
+        """XOR bytes [start:] of a fragment with its keystream into ``out``, without copies.
+
+        ``data`` is any buffer holding the whole fragment and may share memory
+        with ``out`` (in-place transform).
+        """
+        data_array = np.frombuffer(data, dtype=np.uint8)
+        keystream = self.keystream(len(data_array), fragment_index, creation_time)
+        return np.bitwise_xor(data_array[start:], keystream[start:], out=out)
+
+    def clear(self):
+        with self._lock:
+            self._keystreams.clear()
+            self._sine_tables.clear()
+            self._bytes = 0
+
+    def get_statistics(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'keystreams': len(self._keystreams),
+            'cached_bytes': self._bytes,
+            'max_bytes': self.max_bytes,
+            'sine_tables': len(self._sine_tables),
+            'sine_table_builds': self.sine_table_builds,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,463 @@
+"""
+MWRASP Canary Token Registry
+Persistent, memory-mapped fixed-record store for canary tokens
+"""
+
+import json
+import os
+import threading
+import time
+import weakref
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from .post_quantum_crypto import SecurityLevel
+
+
+REGISTRY_MAGIC = b"MWCTREG1"
+INDEX_MAGIC = b"MWCTIDX1"
+
+# Longest token id a fixed record can hold
+MAX_TOKEN_ID_BYTES = 64
+
+# Records allocated when a registry file is first created
+INITIAL_CAPACITY = 1024
+
+# Unindexed records merged into the sorted index once this many accumulate
+INDEX_MERGE_THRESHOLD = 65536
+
+# Access log entries folded into the records once this many accumulate
+LOG_FOLD_THRESHOLD = 1 << 20
+
+# Record flags
+FLAG_NIST_COMPLIANT = 1
+FLAG_POST_QUANTUM_SAFE = 2
+FLAG_DELETED = 4
+
+REGISTRY_HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('count', '<u8'),
+    ('live', '<u8'),
+    ('log_folded', '<u8'),   # access log bytes already folded into the records
+    ('reserved', 'V32'),
+])
+
+# One fixed-size record per token; variable-length strings live in the string heap
+TOKEN_RECORD_DTYPE = np.dtype([
+    ('token_id', f'S{MAX_TOKEN_ID_BYTES}'),
+    ('created_at', '<f8'),
+    ('last_accessed', '<f8'),  # NaN if never accessed
+    ('access_count', '<u8'),
+    ('strings_offset', '<u8'),
+    ('strings_length', '<u4'),
+    ('security_level', 'i1'),  # 0 if none
+    ('flags', 'u1'),
+])
+
+INDEX_HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('entries', '<u8'),
+    ('covered', '<u8'),  # records [0, covered) are in the sorted index
+])
+
+ACCESS_LOG_DTYPE = np.dtype([
+    ('slot', '<u4'),
+    ('count', '<u4'),
+    ('timestamp', '<f8'),
+])
+
+
+class CanaryTokenRegistry(MutableMapping):
+    """Dict-like canary token store backed by files in ``directory``.
+
+    ``tokens.dat`` is a memory-mapped array of TOKEN_RECORD_DTYPE records and
+    ``strings.dat`` an append-only heap holding each token's value, access
+    pattern and signature. ``index.dat`` keeps the token ids sorted for binary
+    search, so reopening a registry maps the files instead of parsing them;
+    only records appended since the last index merge are loaded into a dict.
+    Access counts and last-access times go to the append-only ``access.log``
+    and are folded into the records at checkpoint.
+
+    CanaryToken objects are materialized on lookup and shared while referenced
+    elsewhere. Deleting a token only marks its record, so ``restore`` can
+    bring it back.
+    """
+
+    def __init__(self, directory: str, index_merge_threshold: int = INDEX_MERGE_THRESHOLD,
+                 log_fold_threshold: int = LOG_FOLD_THRESHOLD):
+        started = time.perf_counter()
+        self.directory = directory
+        self.index_merge_threshold = index_merge_threshold
+        self.log_fold_threshold = log_fold_threshold
+        os.makedirs(directory, exist_ok=True)
+        self._records_path = os.path.join(directory, "tokens.dat")
+        self._strings_path = os.path.join(directory, "strings.dat")
+        self._index_path = os.path.join(directory, "index.dat")
+        self._log_path = os.path.join(directory, "access.log")
+        self._lock = threading.RLock()
+        self._materialized: "weakref.WeakValueDictionary[str, Any]" = weakref.WeakValueDictionary()
+        self._pending_access: Dict[int, Tuple[int, float]] = {}  # slot -> (count, last access)
+        self._tail: Dict[bytes, int] = {}  # token id -> slot for records not yet indexed
+
+        self._open_records()
+        self._open_index()
+        covered = int(self._index_header['covered'])
+        count = self.record_count
+        if covered < count:
+            tail_ids = self._records['token_id'][covered:count]
+            self._tail = {token_id: covered + i for i, token_id in enumerate(tail_ids.tolist())}
+
+        self._strings = open(self._strings_path, 'ab')
+        self._strings_reader = os.open(self._strings_path, os.O_RDONLY)
+        self._strings_size = self._strings.tell()
+        self._strings_flushed = self._strings_size
+
+        self._log = open(self._log_path, 'ab')
+        self._log_entries = 0
+        self._replay_access_log()
+        self.closed = False
+        self.open_seconds = time.perf_counter() - started
+
+    # -- file management ---------------------------------------------------
+
+    def _open_records(self):
+        if not os.path.exists(self._records_path):
+            with open(self._records_path, 'wb') as f:
+                header = np.zeros(1, dtype=REGISTRY_HEADER_DTYPE)
+                header['magic'] = REGISTRY_MAGIC
+                f.write(header.tobytes())
+                f.truncate(REGISTRY_HEADER_DTYPE.itemsize + INITIAL_CAPACITY * TOKEN_RECORD_DTYPE.itemsize)
+        self._header_map = np.memmap(self._records_path, dtype=REGISTRY_HEADER_DTYPE, mode='r+', shape=(1,))
+        self._header = self._header_map[0]
+        if self._header['magic'] != REGISTRY_MAGIC:
+            raise ValueError(f"{self._records_path} is not a canary token registry")
+        self._map_records()
+
+    def _map_records(self):
+        size = os.path.getsize(self._records_path) - REGISTRY_HEADER_DTYPE.itemsize
+        self._records = np.memmap(
+            self._records_path, dtype=TOKEN_RECORD_DTYPE, mode='r+',
+            offset=REGISTRY_HEADER_DTYPE.itemsize, shape=(size // TOKEN_RECORD_DTYPE.itemsize,)
+        )
+
+    def _grow_records(self):
+        capacity = len(self._records) * 2
+        self._records.flush()
+        del self._records
+        os.truncate(self._records_path, REGISTRY_HEADER_DTYPE.itemsize + capacity * TOKEN_RECORD_DTYPE.itemsize)
+        self._map_records()
+
+    def _open_index(self):
+        if not os.path.exists(self._index_path):
+            self._write_index(np.zeros(0, dtype=TOKEN_RECORD_DTYPE['token_id']), np.zeros(0, dtype='<u8'), 0)
+        self._index_header = np.fromfile(self._index_path, dtype=INDEX_HEADER_DTYPE, count=1)[0]
+        if self._index_header['magic'] != INDEX_MAGIC:
+            raise ValueError(f"{self._index_path} is not a canary token registry index")
+        entries = int(self._index_header['entries'])
+        if entries == 0:
+            self._index_ids = np.zeros(0, dtype=TOKEN_RECORD_DTYPE['token_id'])
+            self._index_slots = np.zeros(0, dtype='<u8')
+            return
+        ids_offset = INDEX_HEADER_DTYPE.itemsize
+        self._index_ids = np.memmap(self._index_path, dtype=TOKEN_RECORD_DTYPE['token_id'], mode='r',
+                                    offset=ids_offset, shape=(entries,))
+        self._index_slots = np.memmap(self._index_path, dtype='<u8', mode='r',
+                                      offset=ids_offset + entries * MAX_TOKEN_ID_BYTES, shape=(entries,))
+
+    def _write_index(self, ids: np.ndarray, slots: np.ndarray, covered: int):
+        header = np.zeros(1, dtype=INDEX_HEADER_DTYPE)
+        header['magic'] = INDEX_MAGIC
+        header['entries'] = len(ids)
+        header['covered'] = covered
+        temp_path = self._index_path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(header.tobytes())
+            f.write(np.ascontiguousarray(ids).tobytes())
+            f.write(np.ascontiguousarray(slots, dtype='<u8').tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self._index_path)
+
+    def _merge_index(self):
+        """Merge records appended since the last merge into the sorted index"""
+        if not self._tail:
+            return
+        tail_ids = np.array(list(self._tail.keys()), dtype=TOKEN_RECORD_DTYPE['token_id'])
+        tail_slots = np.fromiter(self._tail.values(), dtype='<u8', count=len(self._tail))
+        order = np.argsort(tail_ids, kind='stable')
+        tail_ids, tail_slots = tail_ids[order], tail_slots[order]
+        positions = np.searchsorted(self._index_ids, tail_ids)
+        ids = np.insert(np.asarray(self._index_ids), positions, tail_ids)
+        slots = np.insert(np.asarray(self._index_slots), positions, tail_slots)
+
+        self._index_ids = self._index_slots = None
+        self._write_index(ids, slots, self.record_count)
+        self._open_index()
+        self._tail = {}
+
+    def _replay_access_log(self):
+        """Apply access log entries that have not been folded into the records yet"""
+        log_size = os.path.getsize(self._log_path)
+        folded = int(self._header['log_folded'])
+        entry_size = ACCESS_LOG_DTYPE.itemsize
+        entries = (log_size - folded) // entry_size if log_size > folded else 0
+        if entries:
+            log = np.fromfile(self._log_path, dtype=ACCESS_LOG_DTYPE, count=entries, offset=folded)
+            slots, inverse = np.unique(log['slot'], return_inverse=True)
+            counts = np.bincount(inverse, weights=log['count'], minlength=len(slots))
+            latest = np.full(len(slots), -np.inf)
+            np.maximum.at(latest, inverse, log['timestamp'])
+            self._pending_access = {
+                int(slot): (int(count), float(last))
+                for slot, count, last in zip(slots, counts, latest)
+            }
+            self._log_entries = entries
+        self._fold_access_log()
+
+    def _fold_access_log(self):
+        """Write pending access counts into the records and truncate the log"""
+        self._log.flush()
+        log_size = os.path.getsize(self._log_path)
+        if self._pending_access:
+            slots = np.fromiter(self._pending_access.keys(), dtype=np.int64, count=len(self._pending_access))
+            pending = np.array(list(self._pending_access.values()), dtype=np.float64)
+            self._records['access_count'][slots] += pending[:, 0].astype(np.uint64)
+            last = self._records['last_accessed'][slots]
+            self._records['last_accessed'][slots] = np.fmax(last, pending[:, 1])
+        # Record how much of the log the records now include before truncating it
+        self._header['log_folded'] = log_size
+        self._records.flush()
+        self._header_map.flush()
+        self._log.truncate(0)
+        self._header['log_folded'] = 0
+        self._header_map.flush()
+        self._pending_access = {}
+        self._log_entries = 0
+
+    # -- record access ------------------------------------------------------
+
+    @property
+    def record_count(self) -> int:
+        return int(self._header['count'])
+
+    @staticmethod
+    def _key(token_id: str) -> bytes:
+        key = token_id.encode('utf-8')
+        if len(key) > MAX_TOKEN_ID_BYTES or not key or key.endswith(b'\x00'):
+            raise ValueError(f"token id must be 1-{MAX_TOKEN_ID_BYTES} bytes: {token_id!r}")
+        return key
+
+    def _slot(self, token_id: str, include_deleted: bool = False) -> Optional[int]:
+        try:
+            key = self._key(token_id)
+        except (ValueError, AttributeError):
+            return None
+        slot = self._tail.get(key)
+        if slot is None:
+            position = int(np.searchsorted(self._index_ids, key))
+            if position >= len(self._index_ids) or self._index_ids[position] != key:
+                return None
+            slot = int(self._index_slots[position])
+        if not include_deleted and self._records['flags'][slot] & FLAG_DELETED:
+            return None
+        return slot
+
+    def _read_strings(self, slot: int) -> Dict[str, Any]:
+        record = self._records[slot]
+        offset, length = int(record['strings_offset']), int(record['strings_length'])
+        if offset + length > self._strings_flushed:
+            self._strings.flush()
+            self._strings_flushed = self._strings_size
+        return json.loads(os.pread(self._strings_reader, length, offset))
+
+    def _append_strings(self, token) -> Tuple[int, int]:
+        blob = json.dumps({
+            'value': token.value,
+            'access_pattern': token.access_pattern,
+            'quantum_signature': token.quantum_signature
+        }).encode('utf-8')
+        offset = self._strings_size
+        self._strings.write(blob)
+        self._strings_size += len(blob)
+        return offset, len(blob)
+
+    def _materialize(self, slot: int):
+        from .quantum_detector import CanaryToken
+
+        record = self._records[slot]
+        strings = self._read_strings(slot)
+        access_count = int(record['access_count'])
+        last_accessed = float(record['last_accessed'])
+        pending = self._pending_access.get(slot)
+        if pending is not None:
+            access_count += pending[0]
+            last_accessed = pending[1] if np.isnan(last_accessed) else max(last_accessed, pending[1])
+        flags = int(record['flags'])
+        security_level = int(record['security_level'])
+        return CanaryToken(
+            token_id=record['token_id'].decode('utf-8'),
+            value=strings['value'],
+            created_at=float(record['created_at']),
+            access_pattern=strings['access_pattern'],
+            quantum_signature=strings['quantum_signature'],
+            access_count=access_count,
+            last_accessed=None if np.isnan(last_accessed) else last_accessed,
+            nist_compliant=bool(flags & FLAG_NIST_COMPLIANT),
+            security_level=SecurityLevel(security_level) if security_level else None,
+            post_quantum_safe=bool(flags & FLAG_POST_QUANTUM_SAFE)
+        )
+
+    # -- mapping interface --------------------------------------------------
+
+    def __getitem__(self, token_id: str):
+        with self._lock:
+            token = self._materialized.get(token_id)
+            if token is not None:
+                return token
+            slot = self._slot(token_id)
+            if slot is None:
+                raise KeyError(token_id)
+            token = self._materialize(slot)
+            self._materialized[token_id] = token
+            return token
+
+    def __contains__(self, token_id: object) -> bool:
+        if not isinstance(token_id, str):
+            return False
+        with self._lock:
+            return self._slot(token_id) is not None
+
+    def __setitem__(self, token_id: str, token):
+        key = self._key(token_id)
+        with self._lock:
+            slot = self._slot(token_id, include_deleted=True)
+            if slot is None:
+                slot = self.record_count
+                if slot >= len(self._records):
+                    self._grow_records()
+                self._records[slot]['token_id'] = key
+                self._tail[key] = slot
+                self._header['count'] = slot + 1
+                self._header['live'] += 1
+            elif self._records['flags'][slot] & FLAG_DELETED:
+                self._header['live'] += 1
+
+            offset, length = self._append_strings(token)
+            flags = (FLAG_NIST_COMPLIANT if token.nist_compliant else 0) | \
+                    (FLAG_POST_QUANTUM_SAFE if token.post_quantum_safe else 0)
+            record = self._records[slot]
+            record['created_at'] = token.created_at
+            record['last_accessed'] = np.nan if token.last_accessed is None else token.last_accessed
+            record['access_count'] = token.access_count
+            record['strings_offset'] = offset
+            record['strings_length'] = length
+            record['security_level'] = token.security_level.value if token.security_level else 0
+            record['flags'] = flags
+            # The token's own counters supersede any logged accesses
+            self._pending_access.pop(slot, None)
+            self._materialized[token_id] = token
+
+            if len(self._tail) >= self.index_merge_threshold:
+                self._merge_index()
+
+    def __delitem__(self, token_id: str):
+        with self._lock:
+            slot = self._slot(token_id)
+            if slot is None:
+                raise KeyError(token_id)
+            self._records['flags'][slot] |= FLAG_DELETED
+            self._header['live'] -= 1
+            self._materialized.pop(token_id, None)
+
+    def __len__(self) -> int:
+        return int(self._header['live'])
+
+    def __iter__(self) -> Iterator[str]:
+        count = self.record_count
+        chunk = 65536
+        for start in range(0, count, chunk):
+            records = self._records[start:min(start + chunk, count)]
+            live = (records['flags'] & FLAG_DELETED) == 0
+            for token_id in records['token_id'][live].tolist():
+                yield token_id.decode('utf-8')
+
+    # -- registry operations ------------------------------------------------
+
+    def record_access(self, token_id: str, timestamp: float, count: int = 1) -> bool:
+        """Append an access to the log; returns False for unknown tokens"""
+        with self._lock:
+            slot = self._slot(token_id)
+            if slot is None:
+                return False
+            entry = np.zeros(1, dtype=ACCESS_LOG_DTYPE)
+            entry['slot'] = slot
+            entry['count'] = count
+            entry['timestamp'] = timestamp
+            self._log.write(entry.tobytes())
+            self._log_entries += 1
+
+            pending_count, last = self._pending_access.get(slot, (0, timestamp))
+            self._pending_access[slot] = (pending_count + count, max(last, timestamp))
+            if self._log_entries >= self.log_fold_threshold:
+                self._fold_access_log()
+            return True
+
+    def restore(self, token_id: str):
+        """Bring back a deleted token; returns the token or None if it was never stored"""
+        with self._lock:
+            slot = self._slot(token_id, include_deleted=True)
+            if slot is None:
+                return None
+            if self._records['flags'][slot] & FLAG_DELETED:
+                self._records['flags'][slot] &= 0xFF ^ FLAG_DELETED
+                self._header['live'] += 1
+        return self[token_id]
+
+    def count_nist_compliant(self) -> int:
+        """Number of live NIST compliant tokens, from the flag column"""
+        flags = self._records['flags'][:self.record_count]
+        return int(np.count_nonzero((flags & (FLAG_NIST_COMPLIANT | FLAG_DELETED)) == FLAG_NIST_COMPLIANT))
+
+    def flush(self):
+        """Make appended records, strings and log entries durable without checkpointing"""
+        with self._lock:
+            self._strings.flush()
+            self._strings_flushed = self._strings_size
+            os.fsync(self._strings.fileno())
+            self._records.flush()
+            self._header_map.flush()
+            self._log.flush()
+            os.fsync(self._log.fileno())
+
+    def checkpoint(self):
+        """Fold the access log into the records and merge the id index"""
+        with self._lock:
+            self.flush()
+            self._fold_access_log()
+            self._merge_index()
+
+    def close(self):
+        with self._lock:
+            if self.closed:
+                return
+            self.checkpoint()
+            self._strings.close()
+            os.close(self._strings_reader)
+            self._log.close()
+            self.closed = True
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            'directory': self.directory,
+            'tokens': len(self),
+            'records': self.record_count,
+            'capacity': len(self._records),
+            'indexed_records': int(self._index_header['covered']),
+            'unindexed_records': len(self._tail),
+            'pending_log_entries': self._log_entries,
+            'materialized_tokens': len(self._materialized),
+            'string_heap_bytes': self._strings_size,
+            'open_seconds': self.open_seconds
+        }
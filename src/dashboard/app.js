@@ -8,6 +8,7 @@ class MWRASPDashboard {
         this.isConnected = false;
         this.charts = {};
         this.lastData = {};
+        this.stateChannels = {};  // topic -> {version, state}
         this.logBuffer = [];
         this.maxLogEntries = 100;
         
@@ -204,6 +205,7 @@ class MWRASPDashboard {
             
             this.websocket.onopen = () => {
                 this.isConnected = true;
+                this.stateChannels = {};
                 this.updateConnectionStatus('online');
                 this.log('WebSocket connected', 'system');
                 
@@ -277,9 +279,12 @@ class MWRASPDashboard {
                 this.updateThreatChart(data);
                 this.displayRecentThreat(data);
                 break;
-            case 'statistics_update':
-                this.updateThreatStatistics(data);
+            case 'state_snapshot':
+            case 'state_delta': {
+                const state = this.applyStateMessage('threats', event, data);
+                if (state) this.updateThreatStatistics(state);
                 break;
+            }
         }
     }
     
@@ -307,15 +312,60 @@ class MWRASPDashboard {
     
     handleSystemMessage(event, data) {
         switch (event) {
-            case 'status_update':
-                this.updateSystemStats(data);
+            case 'state_snapshot':
+            case 'state_delta': {
+                const state = this.applyStateMessage('system', event, data);
+                if (state) this.updateSystemStats(state);
                 break;
+            }
             case 'heartbeat':
                 document.getElementById('connectedClients').textContent = data.connections || 0;
                 break;
         }
     }
     
+    applyStateMessage(topic, event, data) {
+        // Returns the updated state, or null if the message could not be applied
+        if (event === 'state_snapshot') {
+            this.stateChannels[topic] = { version: data.version, state: data.state };
+            return data.state;
+        }
+        
+        const channel = this.stateChannels[topic];
+        if (!channel || data.version <= channel.version) {
+            return null;  // No snapshot yet, or already applied
+        }
+        if (data.base_version !== channel.version) {
+            // Missed a delta; the server replies with the gap or a fresh snapshot
+            this.sendWebSocketMessage({ type: 'resync', topic, version: channel.version });
+            return null;
+        }
+        
+        for (const op of data.ops) {
+            channel.state = this.applyPatchOperation(channel.state, op);
+        }
+        channel.version = data.version;
+        return channel.state;
+    }
+    
+    applyPatchOperation(state, op) {
+        if (op.path === '') {
+            return op.op === 'remove' ? null : op.value;
+        }
+        const keys = op.path.split('/').slice(1).map(key => key.replace(/~1/g, '/').replace(/~0/g, '~'));
+        const last = keys.pop();
+        let target = state;
+        for (const key of keys) {
+            target = target[key];
+        }
+        if (op.op === 'remove') {
+            delete target[last];
+        } else {
+            target[last] = op.value;
+        }
+        return state;
+    }
+    
     handleAlertMessage(event, data) {
         this.log(`ALERT: ${data.message}`, 'error');
         this.showNotification(data.message, data.severity);
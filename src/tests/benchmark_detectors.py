@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Detector Micro-Benchmarks for MWRASP Quantum Detection
+Replays synthetic Grover/Shor/Simon-shaped and benign access streams through
+QuantumDetector and reports per-detector latency, allocations and throughput
+
+Usage:
+    python -m src.tests.benchmark_detectors --output benchmark.json
+    python -m src.tests.benchmark_detectors --baseline benchmark.json --max-regression 0.25
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from ..core.quantum_detector import QuantumDetector, ENTANGLEMENT_WINDOW
+from .test_data_generator import AccessStream, ACCESS_STREAM_RATES, SystemType, TestDataGenerator
+
+
+DEFAULT_WORKLOADS = ["grovers", "shors", "simons", "benign"]
+
+# Individually timed detectors: name -> callable(detector, history, current_time)
+DETECTORS: Dict[str, Callable[[QuantumDetector, Any, float], Any]] = {
+    'superposition_access': lambda detector, history, now: history.count_since(now - 0.1),
+    'entanglement_correlation': lambda detector, history, now: detector._detect_entanglement_pattern(now),
+    'quantum_speedup': lambda detector, history, now: detector._detect_quantum_speedup(history),
+    'interference_pattern': lambda detector, history, now: detector._detect_interference_pattern(history),
+    'simons_algorithm': lambda detector, history, now: detector._detect_simons_algorithm_pattern(history),
+    'bernstein_vazirani_algorithm': lambda detector, history, now: detector._detect_bernstein_vazirani_pattern(history),
+    'deutsch_jozsa_algorithm': lambda detector, history, now: detector._detect_deutsch_jozsa_pattern(history),
+    'grovers_algorithm': lambda detector, history, now: detector._detect_grovers_algorithm_pattern(history),
+    'shors_algorithm': lambda detector, history, now: detector._detect_shors_algorithm_pattern(history),
+}
+
+
+def latency_percentiles(samples_ns: List[int]) -> Dict[str, float]:
+    """p50/p95/p99/max/mean of nanosecond samples, in microseconds"""
+    if not samples_ns:
+        return {'p50_us': 0.0, 'p95_us': 0.0, 'p99_us': 0.0, 'max_us': 0.0, 'mean_us': 0.0}
+    values = np.asarray(samples_ns, dtype=np.float64) / 1000.0
+    return {
+        'p50_us': float(np.percentile(values, 50)),
+        'p95_us': float(np.percentile(values, 95)),
+        'p99_us': float(np.percentile(values, 99)),
+        'max_us': float(values.max()),
+        'mean_us': float(values.mean())
+    }
+
+
+def _new_detector() -> QuantumDetector:
+    # Compliance audit printing and PQ minting would dominate the measurements
+    return QuantumDetector(government_compliance=False, token_pool_size=0)
+
+
+def _create_tokens(detector: QuantumDetector, stream: AccessStream) -> List[str]:
+    return [detector.generate_canary_token(f"bench_{i}").token_id for i in range(stream.token_count)]
+
+
+def _record(detector: QuantumDetector, token_ids: List[str], stream: AccessStream, i: int):
+    token_id = token_ids[stream.token_indices[i]]
+    timestamp = stream.timestamps[i]
+    detector.access_monitor.record(token_id, timestamp, stream.accessor_ids[i], stream.values[i])
+    return token_id, timestamp
+
+
+def benchmark_detectors(stream: AccessStream) -> Dict[str, Dict[str, float]]:
+    """Time each detector on every access of the stream, in isolation"""
+    detector = _new_detector()
+    try:
+        token_ids = _create_tokens(detector, stream)
+        samples: Dict[str, List[int]] = {name: [] for name in DETECTORS}
+        hits = dict.fromkeys(DETECTORS, 0)
+        clock = time.perf_counter_ns
+        for i in range(len(stream)):
+            token_id, timestamp = _record(detector, token_ids, stream, i)
+            history = detector.access_monitor[token_id]
+            for name, run in DETECTORS.items():
+                started = clock()
+                result = run(detector, history, timestamp)
+                samples[name].append(clock() - started)
+                hits[name] += bool(result)
+
+        return {
+            name: {**latency_percentiles(samples[name]), 'positive_rate': hits[name] / max(len(stream), 1)}
+            for name in DETECTORS
+        }
+    finally:
+        detector.stop_monitoring()
+
+
+def benchmark_analysis(stream: AccessStream) -> Dict[str, Any]:
+    """Replay the stream through record + _analyze_quantum_threat, the access_token hot path"""
+    detector = _new_detector()
+    try:
+        token_ids = _create_tokens(detector, stream)
+        record_samples, analyze_samples = [], []
+        indicator_counts: Dict[str, int] = {}
+        threats = 0
+        clock = time.perf_counter_ns
+
+        gc.collect()
+        started_wall = time.perf_counter()
+        for i in range(len(stream)):
+            started = clock()
+            token_id, timestamp = _record(detector, token_ids, stream, i)
+            recorded = clock()
+            threat = detector._analyze_quantum_threat(
+                token_id, {'time': timestamp, 'accessor_id': stream.accessor_ids[i], 'token_id': token_id}
+            )
+            analyze_samples.append(clock() - recorded)
+            record_samples.append(recorded - started)
+            if threat:
+                threats += 1
+                for indicator in threat.quantum_indicators:
+                    indicator_counts[indicator] = indicator_counts.get(indicator, 0) + 1
+        elapsed = time.perf_counter() - started_wall
+        detector.circuit_validation_queue.drain(timeout=10.0)
+
+        return {
+            'record': latency_percentiles(record_samples),
+            'analyze_quantum_threat': latency_percentiles(analyze_samples),
+            'throughput_per_second': len(stream) / elapsed if elapsed > 0 else 0.0,
+            'threats_detected': threats,
+            'indicator_counts': indicator_counts,
+            'pattern_cache_hit_rate': detector.pattern_cache.get_statistics()['hit_rate']
+        }
+    finally:
+        detector.stop_monitoring()
+
+
+def benchmark_allocations(stream: AccessStream) -> Dict[str, float]:
+    """Memory allocated and retained per access on the hot path, via tracemalloc"""
+    detector = _new_detector()
+    try:
+        token_ids = _create_tokens(detector, stream)
+        accesses = max(len(stream), 1)
+        gc.collect()
+        blocks_before = sys.getallocatedblocks()
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        for i in range(len(stream)):
+            token_id, timestamp = _record(detector, token_ids, stream, i)
+            detector._analyze_quantum_threat(
+                token_id, {'time': timestamp, 'accessor_id': stream.accessor_ids[i], 'token_id': token_id}
+            )
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        gc.collect()
+        blocks_after = sys.getallocatedblocks()
+        detector.circuit_validation_queue.drain(timeout=10.0)
+
+        return {
+            'retained_bytes_per_access': (current - before) / accesses,
+            'peak_traced_bytes': peak - before,
+            'retained_blocks_per_access': (blocks_after - blocks_before) / accesses
+        }
+    finally:
+        detector.stop_monitoring()
+
+
+def benchmark_batch(stream: AccessStream) -> Dict[str, float]:
+    """Throughput of the columnar access_tokens_batch path over the whole stream"""
+    detector = _new_detector()
+    try:
+        token_ids = _create_tokens(detector, stream)
+        columns = [token_ids[i] for i in stream.token_indices]
+        started = time.perf_counter()
+        rows = detector.access_tokens_batch(columns, stream.timestamps, stream.accessor_ids, stream.values)
+        elapsed = time.perf_counter() - started
+        detector.circuit_validation_queue.drain(timeout=10.0)
+        return {
+            'seconds': elapsed,
+            'throughput_per_second': len(stream) / elapsed if elapsed > 0 else 0.0,
+            'threats_detected': len(rows)
+        }
+    finally:
+        detector.stop_monitoring()
+
+
+def run_benchmarks(workloads: Optional[List[str]] = None, token_count: int = 16,
+                   accesses_per_token: int = 40, rates: Optional[Dict[str, float]] = None,
+                   seed: int = 42) -> Dict[str, Any]:
+    """Run every benchmark for each workload and return a JSON-serialisable report"""
+    workloads = workloads or DEFAULT_WORKLOADS
+    rates = rates or {}
+    report = {
+        'generated_at': time.time(),
+        'platform': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'system': platform.system()
+        },
+        'config': {
+            'workloads': workloads,
+            'token_count': token_count,
+            'accesses_per_token': accesses_per_token,
+            'rates': {workload: rates.get(workload, ACCESS_STREAM_RATES[workload]) for workload in workloads},
+            'seed': seed,
+            'entanglement_window': ENTANGLEMENT_WINDOW
+        },
+        'workloads': {}
+    }
+
+    for workload in workloads:
+        generator = TestDataGenerator(SystemType.GOVERNMENT)
+        generator.random.seed(seed)
+        stream = generator.generate_access_stream(workload, token_count, accesses_per_token, rates.get(workload))
+        report['workloads'][workload] = {
+            'accesses': len(stream),
+            **benchmark_analysis(stream),
+            'detectors': benchmark_detectors(stream),
+            'allocations': benchmark_allocations(stream),
+            'batch': benchmark_batch(stream)
+        }
+    return report
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any],
+                    max_regression: float = 0.25) -> List[str]:
+    """Hot-path p95 latencies that regressed by more than max_regression"""
+    regressions = []
+    for workload, results in current['workloads'].items():
+        previous = baseline.get('workloads', {}).get(workload)
+        if previous is None:
+            continue
+        checks = [('analyze_quantum_threat', previous['analyze_quantum_threat'], results['analyze_quantum_threat'])]
+        checks.extend(
+            (f"detectors.{name}", previous['detectors'][name], stats)
+            for name, stats in results['detectors'].items() if name in previous.get('detectors', {})
+        )
+        for name, before, after in checks:
+            if before['p95_us'] > 0 and after['p95_us'] > before['p95_us'] * (1 + max_regression):
+                regressions.append(
+                    f"{workload}/{name}: p95 {before['p95_us']:.1f}us -> {after['p95_us']:.1f}us"
+                )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="MWRASP quantum detector micro-benchmarks")
+    parser.add_argument("--workloads", nargs="+", choices=DEFAULT_WORKLOADS, default=DEFAULT_WORKLOADS)
+    parser.add_argument("--tokens", type=int, default=16, help="canary tokens per workload")
+    parser.add_argument("--accesses-per-token", type=int, default=40)
+    parser.add_argument("--rate", action="append", default=[], metavar="WORKLOAD=HZ",
+                        help="per-token access rate override, e.g. grovers=1000")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="JSON report to compare hot-path p95 latencies against")
+    parser.add_argument("--max-regression", type=float, default=0.25,
+                        help="allowed fractional p95 slowdown against the baseline")
+    args = parser.parse_args(argv)
+
+    rates = {}
+    for override in args.rate:
+        workload, _, hz = override.partition("=")
+        rates[workload] = float(hz)
+
+    # Detector warnings must not end up in a JSON report written to stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        report = run_benchmarks(args.workloads, args.tokens, args.accesses_per_token, rates, args.seed)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_reports(json.load(f), report, args.max_regression)
+        report['regressions'] = regressions
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+    for regression in regressions:
+        print(f"REGRESSION: {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
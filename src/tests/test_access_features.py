@@ -0,0 +1,70 @@
+import pytest
+import numpy as np
+
+from ..core.access_features import RollingHistogram
+from ..core.access_history import AccessHistory
+
+
+class TestRollingHistogram:
+    def test_entropy_and_frequencies(self):
+        """Test that incremental entropy matches a direct computation"""
+        histogram = RollingHistogram()
+        samples = [1, 1, 2, 3, 3, 3]
+        for sample in samples:
+            histogram.add(sample)
+
+        _, counts = np.unique(samples, return_counts=True)
+        probabilities = counts / len(samples)
+        expected = -np.sum(probabilities * np.log2(probabilities))
+
+        assert histogram.entropy() == pytest.approx(expected)
+        assert histogram.distinct == 3
+        assert histogram.max_frequency == 3
+
+        histogram.remove(3)
+        histogram.remove(3)
+        assert histogram.max_frequency == 2
+        assert histogram.distinct == 3
+
+
+class TestAccessFeatures:
+    def setup_method(self):
+        self.windows = {4: 'values', 6: None}
+        self.history = AccessHistory(capacity=16, feature_windows=self.windows)
+
+    def test_window_features_track_recent_accesses(self):
+        """Test rolling moments and counters against a recomputation"""
+        timestamps = np.cumsum([0.0, 0.0005, 0.003, 0.0015, 0.0008, 0.01, 0.0002, 0.004])
+        values = ['10', '2000', '10', None, '7', '7', '3000', '10']
+        for timestamp, value in zip(timestamps, values):
+            self.history.record(float(timestamp), "attacker", value)
+
+        features = self.history.features.window(4)
+        intervals = np.diff(self.history.times(last=4))
+        assert features.interval_count == 3
+        assert features.interval_mean == pytest.approx(intervals.mean())
+        assert features.interval_std == pytest.approx(intervals.std())
+        assert features.rapid_count(0.001) == np.count_nonzero(intervals < 0.001)
+        assert features.rapid_count(0.005) == np.count_nonzero(intervals < 0.005)
+
+        window_values = self.history.values(last=4)
+        window_values = window_values[~np.isnan(window_values)]
+        assert features.value_count == len(window_values)
+        assert features.large_value_count == 1
+        assert features.value_range == (window_values.min(), window_values.max())
+
+    def test_features_rebuilt_after_eviction(self):
+        """Test that time-based eviction keeps features consistent"""
+        for i in range(10):
+            self.history.record(float(i), "user", str(i))
+
+        self.history.evict_before(7.0)
+        features = self.history.features.window(6)
+        assert len(self.history) == 2
+        assert features.interval_count == 1
+        assert features.interval_mean == pytest.approx(1.0)
+
+    def test_capacity_must_cover_largest_window(self):
+        """Test that the ring buffer can always read back outgoing entries"""
+        with pytest.raises(ValueError):
+            AccessHistory(capacity=6, feature_windows=self.windows)
@@ -0,0 +1,153 @@
+import sys
+import threading
+
+import numpy as np
+
+from ..core.access_history import AccessHistory, AccessHistoryStore, as_access_history
+from ..core.quantum_detector import DETECTOR_FEATURE_WINDOWS, QuantumDetector
+
+
+class TestAccessHistory:
+    def test_record_and_views(self):
+        """Test that recorded accesses are exposed as ordered array views"""
+        history = AccessHistory(capacity=8)
+        for i in range(5):
+            history.record(100.0 + i, f"user_{i}", str(i * 10))
+
+        assert len(history) == 5
+        assert np.array_equal(history.times(), [100.0, 101.0, 102.0, 103.0, 104.0])
+        assert np.array_equal(history.times(last=2), [103.0, 104.0])
+        assert np.array_equal(history.values(last=3), [20.0, 30.0, 40.0])
+        assert history.last_time() == 104.0
+
+    def test_ring_buffer_overwrites_oldest(self):
+        """Test fixed capacity: the oldest records are overwritten"""
+        history = AccessHistory(capacity=4)
+        for i in range(10):
+            history.record(float(i), "user")
+
+        assert len(history) == 4
+        assert np.array_equal(history.times(), [6.0, 7.0, 8.0, 9.0])
+        assert history.total_evicted == 6
+        # Views stay contiguous across the wrap-around
+        assert history.times().base is not None
+
+    def test_evict_before(self):
+        """Test time-based eviction only moves the window"""
+        history = AccessHistory(capacity=16)
+        for i in range(10):
+            history.record(float(i), "user")
+
+        evicted = history.evict_before(4.0)
+        assert evicted == 5
+        assert np.array_equal(history.times(), [5.0, 6.0, 7.0, 8.0, 9.0])
+        assert history.count_since(7.0) == 2
+
+    def test_value_columns_are_optional(self):
+        """Test that value columns are only allocated once a value is seen"""
+        history = AccessHistory(capacity=32)
+        history.record(1.0, "user")
+        bytes_without_values = history.nbytes
+        assert np.isnan(history.values()).all()
+
+        history.record(2.0, "user", "1234")
+        assert history.nbytes > bytes_without_values
+        assert np.isnan(history.values()[0])
+        assert history.values()[1] == 1234.0
+
+    def test_legacy_dict_conversion(self):
+        """Test compatibility with lists of access dicts"""
+        accesses = [
+            {'time': 1.0, 'accessor_id': 'a', 'value': '7'},
+            {'time': 2.0, 'accessor_id': 'b', 'input': 3},
+        ]
+        history = as_access_history(accesses)
+
+        assert len(history) == 2
+        assert np.array_equal(history.oracle_values(), [7.0, 3.0])
+        records = history.to_dicts()
+        assert records[0]['accessor_id'] == 'a'
+        assert records[0]['value'] == '7'
+        assert 'value' not in records[1]
+
+
+class TestAccessHistoryStore:
+    def test_store_interns_accessors_and_reports_memory(self):
+        """Test shared accessor interning and memory reporting"""
+        store = AccessHistoryStore(capacity_per_token=8)
+        for i in range(20):
+            store.record(f"token_{i % 4}", float(i), "same_user")
+
+        stats = store.get_memory_statistics()
+        assert stats['tracked_tokens'] == 4
+        assert stats['buffered_records'] == 20
+        assert stats['interned_symbols'] == 2  # '' and 'same_user'
+        assert 0 < stats['total_bytes'] <= stats['max_bytes_per_token'] * 4
+
+    def test_evict_releases_empty_buffers(self):
+        """Test that fully evicted tokens are dropped from the store"""
+        store = AccessHistoryStore(capacity_per_token=8)
+        store.record("old", 1.0, "user")
+        store.record("new", 100.0, "user")
+
+        store.evict_older_than(50.0)
+        assert "old" not in store
+        assert "new" in store
+
+    def test_eviction_from_another_thread_during_recording(self):
+        """Test that monitor-thread eviction never interleaves with a feature update"""
+        store = AccessHistoryStore(capacity_per_token=64, feature_windows=DETECTOR_FEATURE_WINDOWS)
+        errors = []
+        stop = threading.Event()
+        clock = [0.0]
+
+        def evict():
+            while not stop.is_set():
+                try:
+                    store.evict_older_than(clock[0] - 0.01)
+                except Exception as e:
+                    errors.append(e)
+
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-5)
+        evictor = threading.Thread(target=evict)
+        evictor.start()
+        try:
+            for i in range(20000):
+                clock[0] = i * 0.0005
+                store.record(f"token_{i % 3}", clock[0], "user", str(i % 7))
+        except Exception as e:
+            errors.append(e)
+        finally:
+            stop.set()
+            evictor.join()
+            sys.setswitchinterval(switch_interval)
+
+        assert errors == []
+
+    def test_count_tokens_near_many_matches_single_queries(self):
+        """Test that the batched entanglement count agrees with one query per time"""
+        rng = np.random.RandomState(3)
+        store = AccessHistoryStore(capacity_per_token=64, recent_window=0.05)
+        token_ids = np.array([f"token_{i}" for i in rng.randint(0, 40, 600)])
+        timestamps = np.sort(rng.uniform(0.0, 3.0, 600))
+        store.record_batch(token_ids, timestamps, ["user"] * 600)
+
+        query_times = np.concatenate((rng.uniform(-0.1, 3.1, 200), timestamps[::7], [timestamps[-1]]))
+        expected = [store.count_tokens_near(t, 0.05) for t in query_times]
+        assert store.count_tokens_near_many(query_times, 0.05).tolist() == expected
+        assert len(store.count_tokens_near_many(np.zeros(0))) == 0
+
+    def test_detector_uses_bounded_history(self):
+        """Test that the detector keeps at most history_capacity records per token"""
+        detector = QuantumDetector(government_compliance=False, history_capacity=32)
+        try:
+            token = detector.generate_canary_token("history_test")
+            for i in range(80):
+                detector.access_token(token.token_id, f"user_{i}")
+
+            assert len(detector.access_monitor[token.token_id]) == 32
+            stats = detector.get_threat_statistics()
+            assert stats['access_history']['capacity_per_token'] == 32
+        finally:
+            detector.stop_monitoring()
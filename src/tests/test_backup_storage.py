@@ -0,0 +1,84 @@
+from ..core.backup_storage import InMemoryFragmentStore, SegmentFileFragmentStore
+from ..core.quantum_backup_recovery import QuantumBackupEngine, QuantumBackupType, RecoveryPriority
+
+
+class TestFragmentStores:
+    def test_memory_store_expires_from_heap(self):
+        store = InMemoryFragmentStore()
+        store.put("a", b"1", expires_at=10.0)
+        store.put("b", b"2", expires_at=20.0)
+        store.put("a", b"3", expires_at=30.0)
+        del store["b"]
+
+        assert store.expire(25.0) == 0
+        assert store["a"] == b"3"
+        assert store.expire(30.0) == 1
+        assert len(store) == 0 and "a" not in store
+
+    def test_segment_store_reopens_with_same_contents(self, tmp_path):
+        """Test that overwrites and tombstones replay correctly across segments"""
+        store = SegmentFileFragmentStore(tmp_path, segment_span=100.0)
+        store.put("kept", b"first", expires_at=50.0)
+        store.put("kept", b"second", expires_at=250.0)
+        store.put("gone", b"x" * 10, expires_at=60.0)
+        store.put("other", b"y", expires_at=150.0)
+        assert store.delete("gone") and not store.delete("gone")
+        store.close()
+
+        reopened = SegmentFileFragmentStore(tmp_path, segment_span=100.0)
+        assert sorted(reopened.keys()) == ["kept", "other"]
+        assert reopened.get("kept") == b"second" and reopened.get("gone") is None
+        assert reopened.get_statistics()['segments'] == 3
+
+        # Torn tail from a crash mid-append is cut off on open
+        reopened.put("tail", b"z" * 8, expires_at=150.0)
+        reopened.close()
+        segment = tmp_path / f"{1:012d}.seg"
+        segment.write_bytes(segment.read_bytes()[:-3])
+        recovered = SegmentFileFragmentStore(tmp_path, segment_span=100.0)
+        assert "tail" not in recovered and recovered.get("other") == b"y"
+        recovered.put("tail", b"ok", expires_at=150.0)
+        assert recovered.get("tail") == b"ok"
+        recovered.close()
+
+    def test_segment_store_expires_by_dropping_files(self, tmp_path):
+        store = SegmentFileFragmentStore(tmp_path, segment_span=100.0)
+        for i in range(5):
+            store.put(f"early_{i}", b"e", expires_at=10.0 + i)
+        store.put("late", b"l", expires_at=120.0)
+
+        assert store.expire(99.0) == 0
+        assert store.expire(100.0) == 5
+        assert [path.name for path in tmp_path.iterdir()] == [f"{1:012d}.seg"]
+        assert store.keys() == ["late"]
+        stats = store.get_statistics()
+        assert stats['segments_dropped'] == 1 and stats['entries_expired'] == 5
+        store.close()
+
+
+class TestQuantumBackupEngineStorage:
+    def test_backups_survive_engine_restart(self, tmp_path):
+        engine = QuantumBackupEngine(storage=SegmentFileFragmentStore(tmp_path))
+        data = b"canary token batch " * 300
+        backup_id = engine.create_quantum_backup("tokens", data)
+        engine.quantum_storage_fragments.close()
+
+        restarted = QuantumBackupEngine(storage=SegmentFileFragmentStore(tmp_path))
+        assert restarted.recover_quantum_backup(backup_id) == data
+        assert restarted.temporal_backup_chains["tokens_full_quantum_safe"] == [backup_id]
+        restarted.quantum_storage_fragments.close()
+
+    def test_expiry_index_drives_cleanup(self):
+        engine = QuantumBackupEngine()
+        short = engine.create_quantum_backup(
+            "canary", b"short lived", QuantumBackupType.CANARY_TOKEN_BACKUP, RecoveryPriority.LOW_BACKGROUND
+        )
+        kept = engine.create_quantum_backup("full", b"long lived")
+        expiry = engine.backup_records[short].expires_at
+
+        assert engine._expire_backups(expiry - 1) == 0
+        assert engine._expire_backups(expiry) == 1
+        assert engine._cleanup_orphaned_fragments(expiry) == engine.default_fragment_count + 1
+        assert short not in engine.backup_records
+        assert engine.recover_quantum_backup(kept) == b"long lived"
+        assert len(engine.quantum_storage_fragments) == engine.default_fragment_count + 1
@@ -0,0 +1,82 @@
+import threading
+import time
+
+from ..core.circuit_validation import CircuitValidationQueue
+from ..core.quantum_detector import QuantumDetector, QuantumThreat, ThreatLevel
+
+
+class TestCircuitValidationQueue:
+    def test_jobs_run_off_the_calling_thread(self):
+        """Test that validations run on pooled workers with one converter each"""
+        converters = []
+        seen = []
+
+        def factory():
+            converter = object()
+            converters.append(converter)
+            return converter
+
+        def validate(converter, subject, payload):
+            seen.append((threading.current_thread().name, converter, subject, payload))
+
+        validation_queue = CircuitValidationQueue(validate, workers=2, converter_factory=factory)
+        try:
+            for i in range(10):
+                assert validation_queue.submit(f"threat_{i}", i)
+            assert validation_queue.drain(timeout=5.0)
+
+            assert len(seen) == 10
+            assert all(name.startswith("circuit-validation-") for name, _, _, _ in seen)
+            assert {converter for _, converter, _, _ in seen} <= set(converters)
+            assert 1 <= len(converters) <= 2
+            stats = validation_queue.get_statistics()
+            assert stats['completed'] == 10
+            assert stats['queue_depth'] == 0
+            assert stats['validation_latency']['max_ms'] >= 0.0
+        finally:
+            validation_queue.stop()
+
+    def test_bounded_queue_drops_instead_of_blocking(self):
+        """Test that a full queue rejects new jobs and counts them"""
+        release = threading.Event()
+        validation_queue = CircuitValidationQueue(
+            lambda converter, subject, payload: release.wait(5.0),
+            workers=1, max_pending=2, converter_factory=object
+        )
+        try:
+            results = [validation_queue.submit(i, None) for i in range(6)]
+            assert results.count(False) >= 3
+            assert validation_queue.get_statistics()['dropped'] == results.count(False)
+        finally:
+            release.set()
+            validation_queue.drain(timeout=5.0)
+            validation_queue.stop()
+
+
+class TestDetectorCircuitValidation:
+    def test_validations_attached_asynchronously(self):
+        """Test that the threat is returned before its circuit validations are attached"""
+        detector = QuantumDetector(government_compliance=False)
+        try:
+            token = detector.generate_canary_token("circuit_test")
+            for i in range(12):
+                detector.access_monitor.record(token.token_id, 1000.0 + i * 0.001, "attacker", str(i))
+
+            threat = QuantumThreat(
+                threat_id="circuit_threat",
+                threat_level=ThreatLevel.HIGH,
+                detection_time=time.time(),
+                attack_vector='quantum_computer_attack',
+                quantum_indicators=['simons_algorithm', 'deutsch_jozsa_algorithm'],
+                affected_tokens=[token.token_id],
+                confidence_score=0.85
+            )
+            result = detector._validate_with_circuit_conversion(threat, detector.access_monitor[token.token_id])
+            assert result['circuit_validations_queued'] == 2
+
+            assert detector.circuit_validation_queue.drain(timeout=10.0)
+            assert [v['algorithm'] for v in threat.circuit_validations] == ['simons', 'deutsch_jozsa']
+            stats = detector.get_threat_statistics()['circuit_validation_queue']
+            assert stats['completed'] == 1
+        finally:
+            detector.stop_monitoring()
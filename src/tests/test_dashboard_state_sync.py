@@ -0,0 +1,96 @@
+import asyncio
+import copy
+import json
+from unittest.mock import Mock
+
+from ..api.state_sync import StateChannel, apply_patch, diff_state
+from ..core.threat_bus import ThreatEventBus
+from .test_websocket_fanout import FakeWebSocket, settle
+
+
+class TestStateDiff:
+    def test_patch_round_trip_through_json(self):
+        old = {"threats": {"active": 3, "levels": {"HIGH": 1, "LOW": 2}}, "a/b": 1, "gone": True, "list": [1, 2]}
+        new = {"threats": {"active": 4, "levels": {"HIGH": 2, "LOW": 2}}, "a/b": 2, "list": [1, 2], "added": {"x": 1}}
+        ops = diff_state(old, new)
+
+        assert {op["path"] for op in ops} == {
+            "/threats/active", "/threats/levels/HIGH", "/a~1b", "/gone", "/added"
+        }
+        client_state = json.loads(json.dumps(old))
+        assert apply_patch(client_state, json.loads(json.dumps(ops))) == new
+        assert diff_state(new, copy.deepcopy(new)) == []
+        assert apply_patch(None, diff_state(None, new)) == new
+
+
+class TestStateChannel:
+    def test_versions_and_resync(self):
+        channel = StateChannel("threats", history=3)
+        assert channel.update({"count": 0}) is not None
+        for count in range(1, 6):
+            delta = channel.update({"count": count, "static": "x" * 100})
+            assert delta["data"]["version"] == delta["data"]["base_version"] + 1
+        assert channel.update({"count": 5, "static": "x" * 100}) is None
+        assert channel.version == 6
+
+        # Only the changed field travels once the state has settled
+        assert channel.update({"count": 6, "static": "x" * 100})["data"]["ops"] == [
+            {"op": "replace", "path": "/count", "value": 6}
+        ]
+
+        # A client two versions behind gets the missed deltas, in order
+        assert [m["data"]["version"] for m in channel.resync_messages(5)] == [6, 7]
+        assert channel.resync_messages(7) == []
+        # Deltas older than the history fall back to a snapshot
+        snapshot, = channel.resync_messages(1)
+        assert snapshot["event"] == "state_snapshot" and snapshot["data"]["version"] == 7
+        assert snapshot["data"]["state"] == {"count": 6, "static": "x" * 100}
+
+
+class TestWebSocketStateSync:
+    def test_client_tracks_state_from_snapshot_and_deltas(self):
+        from ..api.websocket import WebSocketManager
+
+        class ClientSocket(FakeWebSocket):
+            query_params = {}
+
+            async def accept(self):
+                pass
+
+        stats = {"total_threats_detected": 0, "threat_levels": {"HIGH": 0, "LOW": 0}, "details": ["x"] * 50}
+        detector = Mock()
+        detector.threat_bus = ThreatEventBus()
+        detector.get_threat_statistics = lambda: copy.deepcopy(stats)
+
+        async def scenario():
+            manager = WebSocketManager()
+            manager.set_system_references(detector, None, None)
+            client = ClientSocket()
+            await manager.connect(client)
+            await settle()
+
+            snapshot = [m for m in client.messages() if m["event"] == "state_snapshot"]
+            assert [m["type"] for m in snapshot] == ["threats"]
+            state, version = snapshot[0]["data"]["state"], snapshot[0]["data"]["version"]
+
+            stats["total_threats_detected"] = 1
+            stats["threat_levels"]["HIGH"] = 1
+            await manager._publish_state("threats")
+            await settle()
+
+            delta = client.messages()[-1]
+            assert delta["event"] == "state_delta" and delta["data"]["base_version"] == version
+            assert len(delta["data"]["ops"]) == 2
+            assert apply_patch(state, delta["data"]["ops"]) == stats
+
+            # A client that lost track asks to resync and is sent the gap
+            await manager.handle_client_message(client, {"type": "resync", "topic": "threats", "version": version})
+            await settle()
+            assert client.messages()[-1]["data"]["version"] == delta["data"]["version"]
+            assert manager.get_connection_stats()["state_channels"]["threats"]["version"] == version + 1
+            # State deltas are not replayed to later connections
+            assert len(manager.fanout.history) == 0
+
+            manager.disconnect(client)
+
+        asyncio.run(scenario())
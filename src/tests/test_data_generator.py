@@ -61,6 +61,27 @@ class QuantumAttackScenario:
     timestamp: str
     duration_seconds: int
 
+@dataclass
+class AccessStream:
+    """Time-ordered canary token accesses as columns, for detector replay"""
+    workload: str
+    token_count: int
+    token_indices: List[int]
+    timestamps: List[float]
+    accessor_ids: List[str]
+    values: List[Optional[str]]
+    
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+# Default per-token access rates (accesses/second) for each stream shape
+ACCESS_STREAM_RATES = {
+    "grovers": 800.0,   # ~1.25ms amplitude amplification queries
+    "shors": 2000.0,    # sub-millisecond QFT period finding
+    "simons": 400.0,    # ~2.5ms oracle queries
+    "benign": 0.5,      # ordinary document access
+}
+
 class TestDataGenerator:
     """Generates realistic test data for all MWRASP systems"""
     
@@ -258,6 +279,98 @@ class TestDataGenerator:
         
         return base_signatures
     
+    def generate_access_stream(self, workload: str, token_count: int = 16, accesses_per_token: int = 40,
+                               rate: Optional[float] = None, start_time: float = 1_000_000.0) -> AccessStream:
+        """Generate an access stream shaped like a quantum attack or benign traffic
+        
+        Workloads are "grovers", "shors", "simons" and "benign". Each token gets
+        accesses_per_token accesses at about ``rate`` accesses/second; token
+        bursts are staggered and the stream is returned in time order.
+        """
+        if workload not in ACCESS_STREAM_RATES:
+            raise ValueError(f"Unknown access stream workload: {workload}")
+        rate = rate or ACCESS_STREAM_RATES[workload]
+        value_generator = getattr(self, f"_{workload}_access_values")
+        
+        accesses = []
+        for token_index in range(token_count):
+            timestamp = start_time + token_index * self.random.uniform(0.0, 1.0 / rate)
+            values = value_generator(accesses_per_token)
+            for i in range(accesses_per_token):
+                if workload == "benign":
+                    timestamp += self.random.expovariate(rate)
+                else:
+                    timestamp += (1.0 / rate) * self.random.uniform(0.95, 1.05)
+                accessor_id = f"{workload}_actor_{token_index % 4}"
+                accesses.append((timestamp, token_index, accessor_id, values[i]))
+        accesses.sort()
+        
+        return AccessStream(
+            workload=workload,
+            token_count=token_count,
+            token_indices=[access[1] for access in accesses],
+            timestamps=[access[0] for access in accesses],
+            accessor_ids=[access[2] for access in accesses],
+            values=[access[3] for access in accesses]
+        )
+    
+    def generate_mixed_access_stream(self, workloads: List[str], token_count: int = 16,
+                                     accesses_per_token: int = 40,
+                                     rates: Optional[Dict[str, float]] = None) -> AccessStream:
+        """Interleave several workloads, each on its own block of tokens"""
+        rates = rates or {}
+        accesses = []
+        for block, workload in enumerate(workloads):
+            stream = self.generate_access_stream(workload, token_count, accesses_per_token, rates.get(workload))
+            offset = block * token_count
+            accesses.extend(zip(stream.timestamps, [offset + i for i in stream.token_indices],
+                                stream.accessor_ids, stream.values))
+        accesses.sort(key=lambda access: access[0])
+        
+        return AccessStream(
+            workload="+".join(workloads),
+            token_count=token_count * len(workloads),
+            token_indices=[access[1] for access in accesses],
+            timestamps=[access[0] for access in accesses],
+            accessor_ids=[access[2] for access in accesses],
+            values=[access[3] for access in accesses]
+        )
+    
+    def _grovers_access_values(self, count: int) -> List[Optional[str]]:
+        """Search values converging on a marked item (amplitude amplification)"""
+        target = self.random.randint(100, 900)
+        values = []
+        for i in range(count):
+            spread = max(0, int(400 * (1 - 2 * i / count)))
+            values.append(str(max(0, target + self.random.randint(-spread, spread))))
+        return values
+    
+    def _shors_access_values(self, count: int) -> List[Optional[str]]:
+        """Large modular arithmetic triples a, b, a mod b (modular exponentiation)"""
+        values = []
+        while len(values) < count:
+            modulus = self.random.randint(1500, 9000)
+            remainder = self.random.randint(1, modulus - 1)
+            values.extend(str(v) for v in (modulus * self.random.randint(2, 9) + remainder, modulus, remainder))
+        return values[:count]
+    
+    def _simons_access_values(self, count: int) -> List[Optional[str]]:
+        """Oracle queries in pairs x, x XOR s for a hidden period s"""
+        period = self.random.randint(1, 255)
+        values = []
+        while len(values) < count:
+            x = self.random.randint(0, 4095)
+            values.extend((str(x), str(x ^ period)))
+        return values[:count]
+    
+    def _benign_access_values(self, count: int) -> List[Optional[str]]:
+        """Mostly value-less document reads with the occasional lookup"""
+        return [
+            self.random.choice(["report.pdf", "summary", str(self.random.randint(0, 99999))])
+            if self.random.random() < 0.3 else None
+            for _ in range(count)
+        ]
+    
     def _random_timestamp(self) -> str:
         """Generate random timestamp within last 30 days"""
         now = datetime.datetime.now()
@@ -0,0 +1,54 @@
+import json
+
+from .benchmark_detectors import DETECTORS, compare_reports, run_benchmarks
+from .test_data_generator import SystemType, TestDataGenerator
+
+
+class TestAccessStreams:
+    def test_streams_are_time_ordered_and_reproducible(self):
+        """Test that access streams are sorted and seeded"""
+        first = TestDataGenerator(SystemType.GOVERNMENT).generate_access_stream("grovers", 4, 20)
+        second = TestDataGenerator(SystemType.GOVERNMENT).generate_access_stream("grovers", 4, 20)
+
+        assert len(first) == 80
+        assert first.timestamps == sorted(first.timestamps)
+        assert first.values == second.values
+        assert set(first.token_indices) == set(range(4))
+
+    def test_mixed_stream_uses_separate_token_blocks(self):
+        stream = TestDataGenerator(SystemType.BANKING).generate_mixed_access_stream(["shors", "benign"], 3, 10)
+        assert stream.token_count == 6
+        assert len(stream) == 60
+        assert stream.timestamps == sorted(stream.timestamps)
+
+
+class TestDetectorBenchmark:
+    def test_report_is_json_and_attack_shapes_are_detected(self):
+        """Test the benchmark report layout and that each attack stream triggers its detector"""
+        report = run_benchmarks(["grovers", "shors", "simons", "benign"], token_count=2, accesses_per_token=30)
+        report = json.loads(json.dumps(report))
+
+        for workload, results in report['workloads'].items():
+            assert results['accesses'] == 60
+            assert set(results['detectors']) == set(DETECTORS)
+            assert results['analyze_quantum_threat']['p95_us'] > 0
+            assert results['throughput_per_second'] > 0
+            assert 'retained_bytes_per_access' in results['allocations']
+
+        workloads = report['workloads']
+        assert workloads['grovers']['detectors']['grovers_algorithm']['positive_rate'] > 0
+        assert workloads['shors']['detectors']['shors_algorithm']['positive_rate'] > 0
+        assert workloads['simons']['detectors']['simons_algorithm']['positive_rate'] > 0
+        assert workloads['benign']['detectors']['shors_algorithm']['positive_rate'] == 0
+
+    def test_compare_reports_flags_p95_regressions(self):
+        stats = {'p95_us': 10.0}
+        baseline = {'workloads': {'grovers': {'analyze_quantum_threat': stats, 'detectors': {'shors_algorithm': stats}}}}
+        current = {'workloads': {'grovers': {
+            'analyze_quantum_threat': {'p95_us': 11.0},
+            'detectors': {'shors_algorithm': {'p95_us': 20.0}}
+        }}}
+
+        assert compare_reports(baseline, current, max_regression=0.25) == [
+            "grovers/detectors.shors_algorithm: p95 10.0us -> 20.0us"
+        ]
@@ -0,0 +1,127 @@
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, Mock
+
+from ..core.expiration_wheel import ExpirationWheel
+from ..core.temporal_fragmentation import FragmentationPolicy, FragmentStatus, TemporalFragmentation
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestExpirationWheel:
+    def setup_method(self):
+        self.clock = FakeClock()
+        self.batches = []
+        self.wheel = ExpirationWheel(self.batches.append, tick=0.01, slots=8, levels=3,
+                                     clock=self.clock, autostart=False)
+
+    def expired_keys(self):
+        return [key for batch in self.batches for key, _ in batch]
+
+    def test_never_fires_early_and_batches_per_tick(self):
+        """Test that keys expire on the first tick at or after their deadline"""
+        for i in range(5):
+            self.wheel.schedule(f"same_tick_{i}", 1000.05)
+        self.wheel.schedule("later", 1000.5, payload="payload")
+
+        self.clock.now = 1000.049
+        self.wheel.advance()
+        assert self.batches == []
+
+        self.clock.now = 1000.05
+        self.wheel.advance()
+        assert len(self.batches) == 1
+        assert sorted(self.expired_keys()) == [f"same_tick_{i}" for i in range(5)]
+
+        self.clock.now = 1000.6
+        self.wheel.advance()
+        assert self.batches[-1] == [("later", "payload")]
+        assert len(self.wheel) == 0
+
+    def test_cancel_and_reschedule(self):
+        self.wheel.schedule("cancelled", 1000.1)
+        self.wheel.schedule("moved", 1000.1)
+        assert self.wheel.cancel("cancelled")
+        assert not self.wheel.cancel("cancelled")
+        self.wheel.schedule("moved", 1003.0)
+
+        self.clock.now = 1001.0
+        self.wheel.advance()
+        assert self.expired_keys() == []
+        self.clock.now = 1003.0
+        self.wheel.advance()
+        assert self.expired_keys() == ["moved"]
+
+    def test_cascade_and_beyond_horizon(self):
+        """Test deadlines spanning several levels and past the wheel horizon"""
+        horizon = self.wheel.get_statistics()['horizon_seconds']
+        deadlines = {"level_0": 1000.05, "level_1": 1000.5, "level_2": 1004.0, "beyond": 1000.0 + horizon * 3}
+        for key, deadline in deadlines.items():
+            self.wheel.schedule(key, deadline)
+
+        fired = {}
+        while len(fired) < len(deadlines):
+            self.clock.now += 0.07
+            self.wheel.advance()
+            for key in self.expired_keys():
+                fired.setdefault(key, self.clock.now)
+
+        for key, deadline in deadlines.items():
+            assert deadline <= fired[key] < deadline + 0.1
+        stats = self.wheel.get_statistics()
+        assert stats['expired'] == 4
+        assert stats['cascaded'] > 0
+        assert stats['scheduler_lag']['max_ms'] >= 0.0
+
+
+class TestFragmentationExpiration:
+    def test_fragments_expire_without_timer_threads(self):
+        """Test that fragment expiry, wipe and cleanup all run on the single wheel thread"""
+        policy = FragmentationPolicy(max_fragment_lifetime_ms=50, quantum_resistance_level=1)
+        fragmenter = TemporalFragmentation(policy, enable_legal_routing=False)
+        fragmenter.start_cleanup_service()
+        threads_before = threading.active_count()
+
+        groups = [asyncio.run(fragmenter.fragment_data(b"x" * 1024, f"group_{i}")) for i in range(20)]
+        fragments = [fragment for group in groups for fragment in group]
+        fragmenter._schedule_expiration(fragments)
+        assert threading.active_count() <= threads_before + 1
+
+        time.sleep(0.2)
+        assert all(fragment.status == FragmentStatus.EXPIRED for fragment in fragments)
+        assert all(fragment.data_chunk == b'\x00' * len(fragment.data_chunk) for fragment in fragments)
+
+        stats = fragmenter.get_system_stats()['expiration_scheduler']
+        assert stats['expired'] >= len(fragments) * 2
+        assert stats['scheduler_lag']['p50_ms'] < 100.0
+
+        fragmenter._expire_fragment(fragments[0].fragment_id)
+        time.sleep(1.2)
+        assert fragments[0].fragment_id not in fragmenter.fragments
+        fragmenter.stop_cleanup_service()
+        fragmenter.expiration_scheduler.stop()
+
+    def test_legal_process_wipes_and_purges_active_fragments(self):
+        """Test that emergency expiry leaves no fragment behind once the wheel runs"""
+        policy = FragmentationPolicy(max_fragment_lifetime_ms=60000, quantum_resistance_level=1)
+        fragmenter = TemporalFragmentation(policy, enable_legal_routing=False)
+        fragments = asyncio.run(fragmenter.fragment_data(b"x" * 1024, "subpoenaed"))
+        assert fragments and all(fragment.status == FragmentStatus.ACTIVE for fragment in fragments)
+        fragmenter.legal_engine = Mock(detect_legal_process=AsyncMock(return_value=True))
+
+        assert asyncio.run(fragmenter.detect_legal_process_on_fragments("subpoena"))
+        assert all(fragment.status == FragmentStatus.EXPIRED for fragment in fragments)
+        assert all(bytes(fragment.data_chunk) == b'\x00' * len(fragment.data_chunk) for fragment in fragments)
+        # Only the purges are left pending for the emergency-expired fragments
+        assert not any((fragment.fragment_id, 'mark') in fragmenter.expiration_scheduler for fragment in fragments)
+
+        time.sleep(1.2)
+        assert not any(fragment.fragment_id in fragmenter.fragments for fragment in fragments)
+        fragmenter.expiration_scheduler.stop()
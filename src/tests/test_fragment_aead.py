@@ -0,0 +1,64 @@
+import dataclasses
+
+import numpy as np
+
+from ..core.secure_fragmentation_v2 import AEAD_TAG_SIZE, IntegrityStatus, SecureFragmentationSystem
+
+
+class TestFragmentAEAD:
+    def test_fragments_are_sealed_with_detached_tags(self):
+        system = SecureFragmentationSystem(parity_fragments=1)
+        data = np.random.RandomState(19).bytes(40_000)
+        data_id, fragments = system.fragment_with_integrity(data, fragment_count=4, lifetime_ms=60000)
+        key = system._data_key(data_id)
+
+        for fragment in fragments:
+            assert len(fragment.encrypted_data) == fragment.metadata.shard_size
+            assert len(fragment.integrity_proof) == AEAD_TAG_SIZE
+            assert fragment.metadata.checksum == fragment.integrity_proof.hex()
+            assert fragment.verify_integrity(key) == IntegrityStatus.VERIFIED
+        # Plaintext data shards never appear in the ciphertext
+        assert fragments[0].encrypted_data != data[:len(fragments[0].encrypted_data)]
+        assert system.reconstruct_with_verification(data_id, fragments) == data
+
+    def test_tampering_is_rejected(self):
+        """Test that flipped ciphertext, edited metadata and a foreign key all fail the tag"""
+        system = SecureFragmentationSystem(parity_fragments=2)
+        data = b"sensitive payload " * 500
+        data_id, fragments = system.fragment_with_integrity(data, fragment_count=5, lifetime_ms=60000)
+        key = system._data_key(data_id)
+
+        flipped = bytearray(fragments[0].encrypted_data)
+        flipped[7] ^= 1
+        fragments[0].encrypted_data = bytes(flipped)
+        assert fragments[0].verify_integrity(key) == IntegrityStatus.TAMPERED
+
+        fragments[1].metadata = dataclasses.replace(fragments[1].metadata, data_length=len(data) - 1)
+        assert fragments[1].verify_integrity(key) == IntegrityStatus.TAMPERED
+        # Two rejected fragments are within the parity budget; a third is not
+        assert system.reconstruct_with_verification(data_id, fragments) == data
+
+        fragments[2].integrity_proof = bytes(AEAD_TAG_SIZE)
+        assert fragments[2].verify_integrity(key) == IntegrityStatus.CORRUPTED
+
+        assert fragments[3].verify_integrity(system._data_key("other")) == IntegrityStatus.TAMPERED
+        assert system.reconstruct_with_verification(data_id, fragments) is None
+
+    def test_expired_fragments_are_not_decrypted(self):
+        system = SecureFragmentationSystem()
+        data_id, fragments = system.fragment_with_integrity(b"short lived", lifetime_ms=-1)
+        status, shard = fragments[0].open(system._data_key(data_id))
+        assert status == IntegrityStatus.EXPIRED and shard is None
+
+    def test_group_layout_comes_from_verified_fragments(self):
+        """Test that a forged first fragment cannot choose the codec or the output length"""
+        system = SecureFragmentationSystem(parity_fragments=2)
+        data = np.random.RandomState(18).bytes(1000)
+        data_id, fragments = system.fragment_with_integrity(data, fragment_count=4, lifetime_ms=60000)
+
+        fragments[0].metadata.data_length = 996
+        assert system.reconstruct_with_verification(data_id, fragments) == data
+        fragments[0].metadata.data_fragments = 1
+        fragments[0].metadata.total_fragments = 1
+        assert system.reconstruct_with_verification(data_id, fragments) == data
+        assert system.reconstruct_with_verification(data_id, fragments[:1]) is None
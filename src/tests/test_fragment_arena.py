@@ -0,0 +1,60 @@
+import asyncio
+
+import numpy as np
+
+from ..core.temporal_fragmentation import FragmentationPolicy, FragmentStatus, TemporalFragmentation
+
+
+def fragment(data: bytes, quantum_resistance_level: int = 3, overlap_factor: float = 0.0):
+    policy = FragmentationPolicy(
+        max_fragment_lifetime_ms=5000, overlap_factor=overlap_factor,
+        quantum_resistance_level=quantum_resistance_level
+    )
+    fragmenter = TemporalFragmentation(policy, enable_legal_routing=False)
+    fragments = asyncio.run(fragmenter.fragment_data(data, "arena_group"))
+    return fragmenter, fragments
+
+
+class TestFragmentArena:
+    def test_chunks_share_one_arena(self):
+        """Test that a group's chunks are contiguous memoryviews over a single buffer"""
+        data = np.random.RandomState(2).bytes(4096)
+        fragmenter, fragments = fragment(data, overlap_factor=0.2)
+        try:
+            assert all(isinstance(f.data_chunk, memoryview) for f in fragments)
+            assert len({id(f.data_chunk.obj.base) for f in fragments}) == 1
+
+            views = [np.asarray(f.data_chunk) for f in fragments]
+            for previous, current in zip(views, views[1:]):
+                assert previous.ctypes.data + len(previous) == current.ctypes.data
+            # Overlapping chunks hold more bytes than the payload
+            assert sum(len(f.data_chunk) for f in fragments) > len(data)
+        finally:
+            fragmenter.expiration_scheduler.stop()
+
+    def test_roundtrip_with_and_without_timing_patterns(self):
+        data = np.random.RandomState(3).bytes(10_000)
+        for level in (1, 3):
+            fragmenter, fragments = fragment(data, quantum_resistance_level=level)
+            try:
+                if level == 1:
+                    assert b"".join(bytes(f.data_chunk) for f in fragments) == data
+                else:
+                    assert bytes(fragments[0].data_chunk) != data[:len(fragments[0].data_chunk)]
+                assert fragmenter.reconstruct_data("arena_group") == data
+            finally:
+                fragmenter.expiration_scheduler.stop()
+
+    def test_expire_zeroes_arena_in_place(self):
+        """Test that the secure wipe overwrites the shared arena rather than rebinding chunks"""
+        fragmenter, fragments = fragment(b"classified" * 500)
+        try:
+            views = [f.data_chunk for f in fragments]
+            fragmenter.force_expire_all("arena_group")
+            for f, view in zip(fragments, views):
+                assert f.status == FragmentStatus.EXPIRED
+                assert f.data_chunk is view
+                assert not np.asarray(view).any()
+            assert fragmenter.reconstruct_data("arena_group") is None
+        finally:
+            fragmenter.expiration_scheduler.stop()
@@ -0,0 +1,68 @@
+import asyncio
+import hashlib
+import io
+
+import numpy as np
+import pytest
+
+from ..core.temporal_fragmentation import FragmentationPolicy, FragmentStatus, TemporalFragmentation
+
+
+def make_fragmenter(overlap_factor: float = 0.2) -> TemporalFragmentation:
+    policy = FragmentationPolicy(max_fragment_lifetime_ms=60000, overlap_factor=overlap_factor)
+    return TemporalFragmentation(policy, enable_legal_routing=False)
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+async def blocks(data: bytes, size: int):
+    for offset in range(0, len(data), size):
+        yield data[offset:offset + size]
+
+
+class TestFragmentStream:
+    def test_stream_roundtrip_from_async_iterator(self):
+        """Test that streamed fragments rebuild the payload incrementally"""
+        fragmenter = make_fragmenter()
+        data = np.random.RandomState(4).bytes(300_007)
+        try:
+            fragments = asyncio.run(collect(fragmenter.fragment_stream(blocks(data, 7001), "stream", fragment_size=65536)))
+            assert len(fragments) == 5
+            assert all(f.total_fragments == 5 for f in fragments)
+            assert all(f.original_hash == hashlib.sha256(data).hexdigest() for f in fragments)
+            # Later fragments carry the overlap prefix from the previous one
+            assert len(fragments[1].data_chunk) == 65536 + int(65536 * 0.2)
+
+            rebuilt = asyncio.run(collect(fragmenter.reconstruct_stream("stream")))
+            assert len(rebuilt) == 5
+            assert b"".join(rebuilt) == data
+            assert all(f.status == FragmentStatus.RECONSTRUCTED for f in fragments)
+        finally:
+            fragmenter.expiration_scheduler.stop()
+
+    def test_stream_groups_reconstruct_with_reconstruct_data(self):
+        fragmenter = make_fragmenter(overlap_factor=0.3)
+        data = np.random.RandomState(5).bytes(100_000)
+        try:
+            asyncio.run(collect(fragmenter.fragment_stream(io.BytesIO(data), "file", fragment_size=16384)))
+            assert fragmenter.reconstruct_data("file") == data
+        finally:
+            fragmenter.expiration_scheduler.stop()
+
+    def test_reconstruct_stream_needs_every_fragment(self):
+        """Test that a gap yields nothing and corruption fails verification"""
+        fragmenter = make_fragmenter(overlap_factor=0.0)
+        data = b"classified" * 5000
+        try:
+            fragments = asyncio.run(collect(fragmenter.fragment_stream(data, "gap", fragment_size=8192)))
+            fragmenter._expire_fragment(fragments[2].fragment_id)
+            assert asyncio.run(collect(fragmenter.reconstruct_stream("gap"))) == []
+
+            fragments = asyncio.run(collect(fragmenter.fragment_stream(data, "corrupt", fragment_size=8192)))
+            fragments[1].data_chunk[0] ^= 0xFF
+            with pytest.raises(ValueError):
+                asyncio.run(collect(fragmenter.reconstruct_stream("corrupt")))
+        finally:
+            fragmenter.expiration_scheduler.stop()
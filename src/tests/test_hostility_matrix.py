@@ -0,0 +1,122 @@
+import asyncio
+import itertools
+from types import SimpleNamespace
+
+import numpy as np
+
+from ..core.legal_conflict_engine import LegalConflictEngine
+
+
+def loop_selection(engine, available, threshold, min_hostility):
+    """Reference: the original nested-loop greedy selection over hostility_matrix"""
+    selected, barriers, impossibility = [], [], 1.0
+    remaining = list(available)
+    for _ in range(threshold):
+        if not remaining:
+            break
+        best, best_hostility = None, 0.0
+        for candidate in remaining:
+            cumulative = 0.0
+            for chosen in selected:
+                hostility = engine.hostility_matrix[candidate][chosen].total_score
+                cumulative += hostility
+                if hostility > 0.5:
+                    barriers.append(f"{candidate}-{chosen}: {hostility:.2f}")
+            average = cumulative / max(len(selected), 1)
+            if average > best_hostility and average >= min_hostility:
+                best, best_hostility = candidate, average
+        if best:
+            selected.append(best)
+            remaining.remove(best)
+            impossibility *= (1 - (1 - best_hostility) * 0.1)
+        else:
+            selected.append(remaining.pop(0))
+    return selected, barriers[:10], impossibility
+
+
+class TestHostilityMatrix:
+    def test_dense_array_mirrors_matrix(self):
+        engine = LegalConflictEngine(enable_real_time_tracking=False)
+        for source, i in engine.jurisdiction_ordinals.items():
+            for target, j in engine.jurisdiction_ordinals.items():
+                assert engine.hostility_array[i, j] == engine.hostility_matrix[source][target].total_score
+
+    def test_vectorized_selection_matches_loop(self):
+        """Test that the vectorized greedy picks what the nested loops picked"""
+        engine = LegalConflictEngine(enable_real_time_tracking=False)
+        rng = np.random.RandomState(7)
+        engine.hostility_array[:] = rng.uniform(0.3, 1.0, engine.hostility_array.shape)
+        np.fill_diagonal(engine.hostility_array, 0.0)
+        for source, i in engine.jurisdiction_ordinals.items():
+            for target, j in engine.jurisdiction_ordinals.items():
+                engine.hostility_matrix[source][target].total_score = engine.hostility_array[i, j]
+
+        codes = list(engine.jurisdictions)
+        for available in itertools.islice(itertools.permutations(codes, 5), 0, 120, 7):
+            for threshold, min_hostility in [(3, 0.7), (4, 0.5), (5, 0.0)]:
+                selected, barriers, impossibility = engine._greedy_hostile_selection(
+                    list(available), threshold, min_hostility
+                )
+                expected = loop_selection(engine, available, threshold, min_hostility)
+                assert (selected, barriers) == (expected[0], expected[1])
+                assert np.isclose(impossibility, expected[2])
+
+    def test_selection_cache_invalidated_by_control_changes(self):
+        engine = LegalConflictEngine(enable_real_time_tracking=False)
+        first = asyncio.run(engine.select_maximally_hostile_routing("frag_a"))
+        second = asyncio.run(engine.select_maximally_hostile_routing("frag_b"))
+        assert first.target_jurisdictions == second.target_jurisdictions
+        assert engine.get_performance_metrics()['routing_cache']['hits'] == 1
+
+        second.target_jurisdictions.append("XX")
+        assert "XX" not in asyncio.run(engine.select_maximally_hostile_routing("frag_c")).target_jurisdictions
+
+        assert engine.set_jurisdiction_status("CN", "disabled")
+        assert engine.get_performance_metrics()['routing_cache']['entries'] == 0
+        assert "CN" not in asyncio.run(engine.select_maximally_hostile_routing("frag_d")).target_jurisdictions
+
+
+class TestIncrementalHostility:
+    def test_jurisdiction_change_recomputes_row_and_column(self):
+        """Test that one jurisdiction's change recomputes 2N-1 pairs and matches a full rebuild"""
+        engine = LegalConflictEngine(enable_real_time_tracking=False)
+        engine._routing_cache[("stale",)] = (["US"], [], 1.0)
+        version = engine.hostility_version
+        n = len(engine.jurisdictions)
+
+        recomputed = engine.update_jurisdiction("CH", sanctions_list=["RU", "IR"], mlat_treaties=["EU"])
+        assert recomputed == 2 * n - 1
+        assert engine.hostility_version == version + 1
+        assert not engine._routing_cache
+
+        incremental = engine.hostility_array.copy()
+        engine._calculate_hostility_matrix()
+        assert np.array_equal(incremental, engine.hostility_array)
+
+    def test_refresh_detects_in_place_edits(self):
+        engine = LegalConflictEngine(enable_real_time_tracking=False)
+        assert engine.refresh_hostility() == 0
+
+        engine.jurisdictions["US"].blocking_statutes.append("FOREIGN_DATA_ACT")
+        engine.jurisdictions["EU"].diplomatic_status["CN"] = 0.95
+        # US row and column, plus the single EU -> CN pair
+        assert engine.refresh_hostility() == 2 * len(engine.jurisdictions) - 1 + 1
+        assert engine.refresh_hostility() == 0
+
+        incremental = engine.hostility_array.copy()
+        engine._calculate_hostility_matrix()
+        assert np.array_equal(incremental, engine.hostility_array)
+
+    def test_legal_conflict_overrides_survive_recompute(self):
+        engine = LegalConflictEngine(enable_real_time_tracking=False)
+        conflict = SimpleNamespace(source_jurisdiction="US", target_jurisdiction="CH", severity=0.97)
+        assert engine._apply_legal_conflicts([conflict]) == 1
+        assert engine._apply_legal_conflicts([conflict]) == 0
+        us, ch = engine.jurisdiction_ordinals["US"], engine.jurisdiction_ordinals["CH"]
+        assert engine.hostility_array[us, ch] == 0.97
+
+        engine.update_jurisdiction("US", enforcement_capability=0.5)
+        assert engine.hostility_array[us, ch] == 0.97
+
+        assert engine._apply_legal_conflicts([]) == 1
+        assert engine.hostility_array[us, ch] != 0.97
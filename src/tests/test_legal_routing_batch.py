@@ -0,0 +1,52 @@
+import asyncio
+
+from ..core.legal_conflict_engine import LegalConflictEngine
+from ..core.temporal_fragmentation import FragmentationPolicy, TemporalFragmentation
+
+
+class TestBatchedLegalRouting:
+    def test_batch_matches_single_decisions(self):
+        """Test that batched routing selects the same jurisdictions as per-fragment calls"""
+        engine = LegalConflictEngine(enable_real_time_tracking=False)
+        single = asyncio.run(engine.select_maximally_hostile_routing("frag_single"))
+        batch = asyncio.run(engine.select_maximally_hostile_routing_batch([f"frag_{i}" for i in range(8)]))
+
+        assert [decision.fragment_id for decision in batch] == [f"frag_{i}" for i in range(8)]
+        for decision in batch:
+            assert decision.target_jurisdictions == single.target_jurisdictions
+            assert decision.hostility_scores == single.hostility_scores
+            assert decision.impossibility_confidence == single.impossibility_confidence
+        assert len({decision.decision_hash for decision in batch}) == 8
+        # Each decision owns its record, so mutating one leaves the rest intact
+        batch[0].target_jurisdictions.append("XX")
+        assert "XX" not in batch[1].target_jurisdictions
+
+    def test_batch_records_history_and_metrics(self):
+        engine = LegalConflictEngine(enable_real_time_tracking=False)
+        assert asyncio.run(engine.select_maximally_hostile_routing_batch([])) == []
+        asyncio.run(engine.select_maximally_hostile_routing_batch(["a", "b", "c"]))
+
+        metrics = engine.get_performance_metrics()
+        assert metrics['total_routing_decisions'] == 3
+        assert len(metrics['routing_latency_ms']) == 3
+
+    def test_fragment_data_routes_group_in_one_call(self, monkeypatch):
+        """Test that fragmentation makes one batched routing call keyed by the real fragment ids"""
+        fragmenter = TemporalFragmentation(FragmentationPolicy(max_fragment_lifetime_ms=5000, max_fragments=20))
+        engine = fragmenter.legal_engine
+        calls = []
+        batch = engine.select_maximally_hostile_routing_batch
+
+        async def counting_batch(fragment_ids, **kwargs):
+            calls.append(list(fragment_ids))
+            return await batch(fragment_ids, **kwargs)
+
+        monkeypatch.setattr(engine, "select_maximally_hostile_routing_batch", counting_batch)
+        try:
+            fragments = asyncio.run(fragmenter.fragment_data(b"x" * 10_000, "routed"))
+            assert len(calls) == 1
+            assert calls[0] == [fragment.fragment_id for fragment in fragments]
+            assert all(fragment.legal_jurisdictions for fragment in fragments)
+            assert {d.fragment_id for d in engine.routing_history} == set(calls[0])
+        finally:
+            fragmenter.expiration_scheduler.stop()
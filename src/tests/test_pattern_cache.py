@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from ..core.access_history import AccessHistoryStore
+from ..core.pattern_cache import PatternCache, window_fingerprint
+from ..core.quantum_detector import QuantumDetector, SHORS_WINDOW
+
+
+class TestPatternCache:
+    def test_lru_eviction_and_counters(self):
+        """Test bounded size with least-recently-used eviction"""
+        cache = PatternCache(max_entries=2, ttl=10.0)
+        cache.put('a', 1, now=0.0)
+        cache.put('b', 2, now=0.0)
+        assert cache.get('a', now=1.0) == 1  # 'b' is now least recently used
+        cache.put('c', 3, now=1.0)
+
+        assert 'b' not in cache
+        assert cache.get('b', now=1.0) is None
+        stats = cache.get_statistics()
+        assert stats['size'] == 2
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['evictions'] == 1
+        assert stats['hit_rate'] == pytest.approx(0.5)
+
+    def test_ttl_expiry(self):
+        """Test that entries expire ttl seconds after insertion"""
+        cache = PatternCache(max_entries=8, ttl=5.0)
+        cache.put('a', 1, now=0.0)
+        cache.put('b', 2, now=3.0)
+
+        assert cache.get('a', now=6.0) is None
+        assert cache.purge_expired(now=9.0) == 1
+        assert len(cache) == 0
+        assert cache.get_statistics()['expirations'] == 2
+
+
+class TestWindowFingerprint:
+    def test_same_shape_on_different_tokens_shares_key(self):
+        """Test that keys depend on window content, not token identity or absolute time"""
+        store = AccessHistoryStore(capacity_per_token=64)
+        for i in range(30):
+            store.record('token_a', 100.0 + i * 0.0005, 'attacker', str(i % 4))
+            store.record('token_b', 500.0 + i * 0.0005, 'other', str(i % 4))
+        store.record('token_c', 900.0, 'attacker', '1')
+
+        key_a = window_fingerprint(store['token_a'], SHORS_WINDOW)
+        assert key_a == window_fingerprint(store['token_b'], SHORS_WINDOW)
+        assert key_a != window_fingerprint(store['token_c'], SHORS_WINDOW)
+
+    def test_detector_reports_cache_statistics(self):
+        """Test that detection results are cached and reported"""
+        detector = QuantumDetector(government_compliance=False, pattern_cache_size=16)
+        try:
+            token = detector.generate_canary_token("cache_test")
+            for i in range(40):
+                detector.access_token(token.token_id, "user")
+
+            stats = detector.get_threat_statistics()['pattern_cache']
+            assert stats['max_entries'] == 16
+            assert 0 < stats['size'] <= 16
+            assert stats['hits'] + stats['misses'] == 40
+        finally:
+            detector.stop_monitoring()
+
+    def test_ratio_tests_are_not_shared_across_rounded_intervals(self):
+        """Test that windows equal after quantization but with different ratio verdicts get distinct keys"""
+        detector = QuantumDetector(government_compliance=False)
+        try:
+            for token_id, first_interval in (('fast_first', 0.00001), ('slower_first', 0.00009)):
+                times = 100.0 + np.concatenate(([0.0], first_interval + 0.002 * np.arange(7)))
+                for timestamp in times:
+                    detector.access_monitor.record(token_id, float(timestamp), 'attacker')
+            fast = detector.access_monitor['fast_first']
+            slower = detector.access_monitor['slower_first']
+            assert window_fingerprint(fast, SHORS_WINDOW) == window_fingerprint(slower, SHORS_WINDOW)
+
+            # Bernstein-Vazirani compares the first interval to the rest (>100x)
+            assert detector._detect_bernstein_vazirani_pattern(fast)
+            assert not detector._detect_bernstein_vazirani_pattern(slower)
+
+            fast_patterns = dict(detector._cached_window_patterns(fast, 101.0))
+            slower_patterns = dict(detector._cached_window_patterns(slower, 101.0))
+            assert 'bernstein_vazirani_algorithm' in fast_patterns
+            assert 'bernstein_vazirani_algorithm' not in slower_patterns
+            assert detector.pattern_cache.get_statistics()['hits'] == 0
+        finally:
+            detector.stop_monitoring()
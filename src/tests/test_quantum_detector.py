@@ -9,9 +9,13 @@ from ..core.quantum_detector import (
     QuantumDetector, 
     ThreatLevel, 
     QuantumThreat, 
-    CanaryToken
+    CanaryToken,
+    BATCH_THREAT_DTYPE,
+    ENTANGLEMENT_WINDOW,
+    decode_quantum_indicators
 )
 from ..core.post_quantum_crypto import SecurityLevel
+from ..core.access_history import AccessHistoryStore
 
 
 class TestQuantumDetector:
@@ -151,6 +155,27 @@ class TestQuantumDetector:
         assert stats['total_tokens'] == 2
         assert stats['monitoring_active'] == self.detector._monitoring
     
+    def test_threat_statistics_aggregate_from_snapshot(self):
+        """Aggregation reads only the snapshot, so later detector changes do not race it"""
+        for index in range(3):
+            token = self.detector.generate_canary_token(f"snapshot_test_{index}")
+            self.detector.access_token(token.token_id, "test_user")
+        
+        snapshot = self.detector.snapshot_threat_statistics()
+        expected = self.detector.get_threat_statistics()
+        
+        token = self.detector.generate_canary_token("snapshot_test_late")
+        self.detector.access_token(token.token_id, "test_user")
+        self.detector.canary_tokens.clear()
+        
+        stats = self.detector.aggregate_threat_statistics(snapshot)
+        assert stats['access_history'] == expected['access_history']
+        assert stats['access_history']['tracked_tokens'] == 3
+        assert stats['nist_compliant_tokens'] == expected['nist_compliant_tokens']
+        assert stats['total_tokens'] == 3
+        # The snapshot itself is left untouched for other aggregations
+        assert snapshot.stats['access_history'] is None
+    
     def test_access_nonexistent_token(self):
         """Test accessing a non-existent token"""
         result = self.detector.access_token("nonexistent_token", "test_user")
@@ -303,6 +328,80 @@ class TestQuantumDetector:
         
         # All signatures should be unique
         assert len(signatures) == 10
+    
+    def test_batch_access_detection(self):
+        """Test columnar batch ingestion with one analysis per token"""
+        attacked = self.detector.generate_canary_token("batch_attacked")
+        quiet = self.detector.generate_canary_token("batch_quiet")
+        
+        base_time = time.time()
+        token_ids = [attacked.token_id] * 10 + [quiet.token_id, "unknown_token"]
+        timestamps = [base_time + i * 0.0002 for i in range(10)] + [base_time - 30.0, base_time]
+        accessor_ids = [f"burst_{i}" for i in range(10)] + ["normal_user", "nobody"]
+        
+        results = self.detector.access_tokens_batch(token_ids, timestamps, accessor_ids)
+        
+        assert results.dtype == BATCH_THREAT_DTYPE
+        assert len(results) == 1
+        assert token_ids[results[0]['batch_index']] == attacked.token_id
+        assert 'superposition_access' in decode_quantum_indicators(int(results[0]['indicators']))
+        assert attacked.access_count == 10
+        assert quiet.access_count == 1
+        assert len(self.detector.threat_history) == 1
+    
+    def test_batch_access_matches_sequential_history(self):
+        """Test that batch ingestion records the same history as single accesses"""
+        token = self.detector.generate_canary_token("batch_history")
+        timestamps = np.cumsum(np.full(30, 0.003)) + time.time()
+        values = [str(v) for v in range(30)]
+        
+        # Deliver out of order; the batch is grouped and time-sorted per token
+        shuffled = np.random.permutation(30)
+        self.detector.access_tokens_batch(
+            [token.token_id] * 30,
+            timestamps[shuffled],
+            ["batch_user"] * 30,
+            [values[i] for i in shuffled]
+        )
+        
+        history = self.detector.access_monitor[token.token_id]
+        assert np.array_equal(history.times(), timestamps)
+        assert np.array_equal(history.values(), np.arange(30, dtype=np.float64))
+        
+        features = history.features.window(12)
+        intervals = np.diff(timestamps[-12:])
+        assert features.interval_mean == pytest.approx(intervals.mean())
+    
+    def test_batch_entanglement_counts_in_one_pass(self):
+        """Test that a burst over many tokens does not rescan the store once per token"""
+        tokens = self.detector.generate_canary_tokens(300, "batch_entanglement")
+        base_time = time.time()
+        timestamps = base_time + np.arange(300) * 0.001
+        token_ids = [token.token_id for token in tokens]
+        
+        reference = AccessHistoryStore(recent_window=ENTANGLEMENT_WINDOW)
+        reference.record_batch(np.array(token_ids), timestamps, ["burst"] * 300)
+        expected = {t: reference.count_tokens_near(t, ENTANGLEMENT_WINDOW) for t in timestamps.tolist()}
+        
+        analysed = {}
+        original_analysis = self.detector._analyze_quantum_threat
+        
+        def record_analysis(token_id, access_info, correlated_accesses=None):
+            analysed[access_info['time']] = correlated_accesses
+            return original_analysis(token_id, access_info, correlated_accesses)
+        
+        self.detector._analyze_quantum_threat = record_analysis
+        self.detector.access_monitor.count_tokens_near = Mock(side_effect=AssertionError("per-token scan"))
+        self.detector.access_tokens_batch(token_ids, timestamps, ["burst"] * 300)
+        
+        assert analysed == expected
+        assert max(expected.values()) > 2
+    
+    def test_batch_access_rejects_mismatched_columns(self):
+        """Test that batch columns must line up"""
+        token = self.detector.generate_canary_token("batch_invalid")
+        with pytest.raises(ValueError):
+            self.detector.access_tokens_batch([token.token_id] * 3, [time.time()])
 
 
 @pytest.mark.integration
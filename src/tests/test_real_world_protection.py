@@ -0,0 +1,35 @@
+import asyncio
+from unittest.mock import Mock
+
+from ..core.real_world_protection import RealWorldProtectionManager
+from ..core.temporal_fragmentation import FragmentationPolicy, TemporalFragmentation
+
+
+class TestRealWorldProtection:
+    def setup_method(self):
+        self.fragmentation = TemporalFragmentation(
+            FragmentationPolicy(max_fragment_lifetime_ms=60000), enable_legal_routing=False
+        )
+        self.manager = RealWorldProtectionManager(Mock(), self.fragmentation, Mock())
+
+    def teardown_method(self):
+        for observer in self.manager.file_observers:
+            observer.stop()
+        self.fragmentation.expiration_scheduler.stop()
+
+    def test_directory_protection_fragments_inside_event_loop(self, tmp_path):
+        """The API adds directories from a running event loop, where asyncio.run is refused"""
+        (tmp_path / "report.txt").write_bytes(b"confidential " * 4096)
+
+        async def handler():
+            return self.manager.add_protected_directory(str(tmp_path))
+
+        assert asyncio.run(handler())
+        assert len(self.manager.protected_files) == 1
+        assert len(self.fragmentation.fragments) > 0
+
+    def test_file_fragmentation_without_event_loop(self, tmp_path):
+        path = tmp_path / "keys.pem"
+        path.write_bytes(b"-----BEGIN KEY-----" * 1000)
+
+        assert self.manager._fragment_file_content(str(path)) == len(self.fragmentation.fragments) > 0
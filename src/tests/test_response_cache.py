@@ -0,0 +1,150 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from ..api.response_cache import EndpointMetrics, LatencyHistogram, ResponseCache
+
+
+class TestResponseCache:
+    def test_concurrent_misses_compute_once_off_the_loop(self):
+        calls = []
+        loop_thread = threading.get_ident()
+
+        def aggregate():
+            calls.append(threading.get_ident())
+            time.sleep(0.05)
+            return {"total_threats_detected": len(calls)}
+
+        async def scenario():
+            cache = ResponseCache()
+            try:
+                ticks = 0
+
+                async def ticker():
+                    nonlocal ticks
+                    while True:
+                        await asyncio.sleep(0.005)
+                        ticks += 1
+
+                ticking = asyncio.ensure_future(ticker())
+                results = await asyncio.gather(*(cache.get("quantum_statistics", 60.0, aggregate) for _ in range(10)))
+                ticking.cancel()
+
+                assert all(result is results[0] for result in results)
+                assert len(calls) == 1 and calls[0] != loop_thread
+                # The event loop kept running while the aggregation was in the pool
+                assert ticks >= 3
+
+                assert await cache.get("quantum_statistics", 60.0, aggregate) is results[0]
+                stats = cache.get_statistics()
+                assert (stats['misses'], stats['coalesced'], stats['hits']) == (1, 9, 1)
+            finally:
+                cache.close()
+
+        asyncio.run(scenario())
+
+    def test_ttl_expiry_and_invalidate(self):
+        values = iter(range(100))
+
+        async def scenario():
+            cache = ResponseCache()
+            try:
+                assert await cache.get("report", 0.02, lambda: next(values), offload=False) == 0
+                assert await cache.get("report", 0.02, lambda: next(values), offload=False) == 0
+                await asyncio.sleep(0.03)
+                assert await cache.get("report", 0.02, lambda: next(values), offload=False) == 1
+                cache.invalidate("report")
+                assert await cache.get("report", 60.0, lambda: next(values)) == 2
+            finally:
+                cache.close()
+
+        asyncio.run(scenario())
+
+    def test_failures_reach_every_waiter_and_are_not_cached(self):
+        def failing():
+            time.sleep(0.02)
+            raise RuntimeError("aggregation failed")
+
+        async def scenario():
+            cache = ResponseCache()
+            try:
+                results = await asyncio.gather(*(cache.get("stats", 60.0, failing) for _ in range(3)),
+                                               return_exceptions=True)
+                assert all(isinstance(result, RuntimeError) for result in results)
+                assert cache.get_statistics()['errors'] == 1
+                assert await cache.get("stats", 60.0, lambda: "recovered") == "recovered"
+            finally:
+                cache.close()
+
+        asyncio.run(scenario())
+
+    def test_cancelled_leader_does_not_cancel_followers(self):
+        def aggregate():
+            time.sleep(0.05)
+            return {"total_threats_detected": 1}
+
+        async def scenario():
+            cache = ResponseCache()
+            try:
+                leader = asyncio.ensure_future(cache.get("stats", 60.0, aggregate))
+                await asyncio.sleep(0.01)
+                follower = asyncio.ensure_future(cache.get("stats", 60.0, aggregate))
+                await asyncio.sleep(0.01)
+                leader.cancel()
+
+                assert await follower == {"total_threats_detected": 1}
+                assert leader.cancelled()
+                # The computation finished and was cached despite the cancelled leader
+                assert await cache.get("stats", 60.0, aggregate) is follower.result()
+                assert cache.get_statistics()['misses'] == 1
+            finally:
+                cache.close()
+
+        asyncio.run(scenario())
+
+    def test_snapshot_runs_on_the_loop_and_compute_on_the_pool(self):
+        threads = {}
+        state = {"tokens": ["a", "b"]}
+
+        def snapshot():
+            threads["snapshot"] = threading.get_ident()
+            return list(state["tokens"])
+
+        def aggregate(tokens):
+            threads["compute"] = threading.get_ident()
+            return {"total_tokens": len(tokens)}
+
+        async def scenario():
+            cache = ResponseCache()
+            try:
+                assert await cache.get("stats", 60.0, aggregate, snapshot=snapshot) == {"total_tokens": 2}
+                assert threads["snapshot"] == threading.get_ident()
+                assert threads["compute"] != threads["snapshot"]
+            finally:
+                cache.close()
+
+        asyncio.run(scenario())
+
+
+class TestLatencyHistogram:
+    def test_percentiles_and_per_endpoint_breakdown(self):
+        histogram = LatencyHistogram()
+        for _ in range(90):
+            histogram.record(0.003)
+        for _ in range(10):
+            histogram.record(0.2)
+
+        stats = histogram.get_statistics()
+        assert stats['count'] == 100
+        assert stats['p50_ms'] == 5 and stats['p95_ms'] == 250 and stats['p99_ms'] == 250
+        assert stats['buckets'] == {"<=5ms": 90, "<=250ms": 10}
+        assert stats['mean_ms'] == pytest.approx(22.7)
+
+        metrics = EndpointMetrics()
+        metrics.record("/quantum/statistics", 0.001)
+        metrics.record("/stats", 10.0)
+        breakdown = metrics.get_statistics()
+        assert list(breakdown) == ["/quantum/statistics", "/stats"]
+        assert breakdown["/stats"]['buckets'] == {">5000ms": 1} and breakdown["/stats"]['p99_ms'] == 10000.0
@@ -0,0 +1,83 @@
+import time
+
+import pytest
+import numpy as np
+
+from ..core.quantum_detector import ENTANGLEMENT_WINDOW
+from ..core.sharded_detector import ShardedQuantumDetector, shard_for_token
+
+
+class TestShardedQuantumDetector:
+    @classmethod
+    def setup_class(cls):
+        cls.detector = ShardedQuantumDetector(num_shards=2, government_compliance=False)
+        cls.tokens = [cls.detector.generate_canary_token(f"shard_test_{i}") for i in range(8)]
+
+    @classmethod
+    def teardown_class(cls):
+        cls.detector.shutdown()
+
+    def test_token_partitioning(self):
+        """Test that tokens live on the shard given by their id hash"""
+        shard_statistics = self.detector.get_threat_statistics()['shard_statistics']
+        expected = [0, 0]
+        for token in self.tokens:
+            expected[shard_for_token(token.token_id, 2)] += 1
+
+        assert [stats['total_tokens'] for stats in shard_statistics] == expected
+        assert shard_for_token(self.tokens[0].token_id, 2) == shard_for_token(self.tokens[0].token_id, 2)
+
+    def test_threats_stream_back_to_front_end(self):
+        """Test that threats detected on a shard are visible through get_active_threats"""
+        token = self.tokens[0]
+        results = [self.detector.access_token(token.token_id, "attacker") for _ in range(10)]
+
+        assert any(results)
+        active = self.detector.get_active_threats()
+        assert any(token.token_id in threat.affected_tokens for threat in active)
+        assert not self.detector.access_token("nonexistent_token")
+
+    def test_cross_shard_entanglement(self):
+        """Test that entanglement counts accesses on every shard, not just the local one"""
+        by_shard = {0: [], 1: []}
+        for token in self.tokens:
+            by_shard[shard_for_token(token.token_id, 2)].append(token.token_id)
+        if not by_shard[0] or not by_shard[1]:
+            pytest.skip("all tokens hashed to one shard")
+
+        # Let earlier accesses leave the window: each shard alone sees at most 2 tokens
+        time.sleep(ENTANGLEMENT_WINDOW * 2)
+        token_ids = by_shard[0][:2] + by_shard[1][:2]
+        for token_id in token_ids:
+            self.detector.access_token(token_id, "attacker")
+
+        latest = self.detector.threat_history[-1]
+        assert 'entanglement_correlation' in latest.quantum_indicators
+
+    def test_batch_rows_reference_caller_columns(self):
+        """Test scatter/gather batch access across shards"""
+        token_ids = [self.tokens[i % 4].token_id for i in range(200)] + ["unknown_token"]
+        timestamps = 5000.0 + np.arange(201) * 0.0005
+        rows = self.detector.access_tokens_batch(token_ids, timestamps)
+
+        assert len(rows) > 0
+        assert np.all(np.diff(rows['batch_index']) > 0)
+        assert all(token_ids[i] != "unknown_token" for i in rows['batch_index'])
+
+        with pytest.raises(ValueError):
+            self.detector.access_tokens_batch(token_ids, timestamps[:-1])
+
+    def test_coordinated_attack_aggregation(self):
+        """Test coordinated-attack detection over correlation events from several shards"""
+        events = [
+            (['simons_algorithm'], 100.0, 0.85),
+            (['grovers_algorithm'], 101.0, 0.95),
+            (['shors_algorithm'], 102.0, 0.98),
+        ]
+        attacks_before = len(self.detector.coordinated_attacks)
+        self.detector._merge_shard_results([], events)
+
+        assert len(self.detector.coordinated_attacks) == attacks_before + 1
+        assert self.detector.coordinated_attacks[-1]['quantum_indicators'] == [
+            'grovers_algorithm', 'shors_algorithm', 'simons_algorithm'
+        ]
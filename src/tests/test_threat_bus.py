@@ -0,0 +1,108 @@
+import asyncio
+import threading
+import time
+from unittest.mock import Mock
+
+from ..core.agent_system import AutonomousDefenseCoordinator
+from ..core.quantum_detector import QuantumDetector, QuantumThreat, ThreatLevel
+from ..core.threat_bus import DROP_NEWEST, ThreatEventBus
+
+
+def make_threat(threat_id: str) -> QuantumThreat:
+    return QuantumThreat(
+        threat_id=threat_id,
+        threat_level=ThreatLevel.HIGH,
+        detection_time=time.time(),
+        attack_vector="superposition_access",
+        quantum_indicators=["superposition_access"],
+        affected_tokens=["token"],
+        confidence_score=0.9
+    )
+
+
+class TestThreatEventBus:
+    def test_bounded_queues_drop_and_count(self):
+        async def scenario():
+            bus = ThreatEventBus()
+            oldest = bus.subscribe("oldest", maxsize=2)
+            newest = bus.subscribe("newest", maxsize=2, overflow=DROP_NEWEST)
+            for event in ["a", "b", "c"]:
+                assert bus.publish(event) == 2
+
+            assert oldest.drain() == ["b", "c"] and newest.drain() == ["a", "b"]
+            assert oldest.dropped == newest.dropped == 1
+            assert bus.get_statistics()['dropped'] == 2
+
+            newest.close()
+            bus.publish("d")
+            assert await oldest.get() == "d"
+            assert bus.subscriber_count == 1 and await newest.get() is None
+
+        asyncio.run(scenario())
+
+    def test_publish_from_another_thread(self):
+        async def scenario():
+            bus = ThreatEventBus()
+            subscription = bus.subscribe("consumer")
+            publisher = threading.Thread(target=lambda: [bus.publish(i) for i in range(100)])
+            publisher.start()
+            received = [await asyncio.wait_for(subscription.get(), 1.0) for _ in range(100)]
+            publisher.join()
+            assert received == list(range(100))
+            assert subscription.pending() == 0
+
+        asyncio.run(scenario())
+
+    def test_publish_async_waits_for_room(self):
+        async def scenario():
+            bus = ThreatEventBus()
+            subscription = bus.subscribe("slow", maxsize=1)
+            await bus.publish_async("first")
+            blocked = asyncio.ensure_future(bus.publish_async("second"))
+            await asyncio.sleep(0.01)
+            assert not blocked.done()
+
+            assert await subscription.get() == "first"
+            await asyncio.wait_for(blocked, 1.0)
+            assert await subscription.get() == "second"
+            assert subscription.dropped == 0
+
+        asyncio.run(scenario())
+
+
+class TestCoordinatorThreatEvents:
+    def test_each_detected_threat_is_coordinated_once(self):
+        """Test that the coordinator reacts to published threats once, without polling"""
+        detector = QuantumDetector(government_compliance=False)
+        detector.start_monitoring = Mock()
+        detector.stop_monitoring = Mock()
+        coordinator = AutonomousDefenseCoordinator(detector, Mock(), initial_agent_count=5)
+        coordinated = []
+
+        async def record(threats):
+            coordinated.extend(threat.threat_id for threat in threats)
+
+        coordinator._coordinate_threat_response = record
+        detector._record_threat(make_threat("before_start"))
+
+        async def scenario():
+            await coordinator.start_coordination()
+            await asyncio.sleep(0.01)
+            started = time.perf_counter()
+            for i in range(5):
+                detector._record_threat(make_threat(f"t{i}"))
+            while len(coordinated) < 6 and time.perf_counter() - started < 1.0:
+                await asyncio.sleep(0.001)
+            latency = time.perf_counter() - started
+            await asyncio.sleep(0.1)
+            await coordinator.stop_coordination()
+            return latency
+
+        try:
+            latency = asyncio.run(scenario())
+        finally:
+            detector.quantum_backup_engine.stop_monitoring()
+        assert coordinated == ["before_start"] + [f"t{i}" for i in range(5)]
+        assert latency < 0.05
+        assert coordinator.coordination_stats['threat_events'] == 5
+        assert detector.threat_bus.subscriber_count == 0
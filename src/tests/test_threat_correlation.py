@@ -0,0 +1,59 @@
+import pytest
+import numpy as np
+
+from ..core.threat_correlation import IndicatorTimeIndex, ThreatCorrelationIndex
+
+
+class TestIndicatorTimeIndex:
+    def test_window_aggregates_match_direct_computation(self):
+        """Test prefix-sum window statistics against numpy over the same threats"""
+        index = IndicatorTimeIndex(retention=300.0)
+        rng = np.random.default_rng(7)
+        timestamps = 1.7e9 + np.cumsum(rng.uniform(0.01, 2.0, size=200))
+        confidences = rng.uniform(0.5, 1.0, size=200)
+        for timestamp, confidence in zip(timestamps, confidences):
+            index.add(float(timestamp), float(confidence))
+
+        current_time = float(timestamps[-1]) + 0.5
+        mask = current_time - timestamps < 10.0
+        recent = index.window(current_time, 10.0)
+
+        assert recent.count == np.count_nonzero(mask)
+        assert recent.mean_confidence == pytest.approx(confidences[mask].mean())
+        assert recent.confidence_std == pytest.approx(confidences[mask].std())
+        assert recent.mean_age == pytest.approx(np.mean(current_time - timestamps[mask]))
+        assert recent.age_std == pytest.approx(np.std(current_time - timestamps[mask]))
+
+    def test_retention_and_compaction(self):
+        """Test that entries older than the retention horizon are dropped"""
+        index = IndicatorTimeIndex(retention=10.0)
+        for i in range(5000):
+            index.add(i * 0.1, 0.8)
+
+        assert len(index) == 100
+        assert index.count_since(499.9 - 10.0) == 100
+        assert len(index._times) < 5000
+
+    def test_out_of_order_insert(self):
+        """Test that late timestamps are kept in time order"""
+        index = IndicatorTimeIndex()
+        for timestamp in (1.0, 3.0, 2.0, 4.0):
+            index.add(timestamp, 0.9)
+
+        assert index.count_since(1.5) == 3
+        assert index.window(4.0, 2.5).count == 3
+
+
+class TestThreatCorrelationIndex:
+    def test_window_lists_only_active_indicators(self):
+        """Test per-indicator aggregation across a coordination window"""
+        correlation = ThreatCorrelationIndex()
+        correlation.add('grovers_algorithm', 100.0, 0.9)
+        correlation.add('shors_algorithm', 103.0, 0.8)
+        correlation.add('shors_algorithm', 104.0, 0.6)
+
+        recent = correlation.window(104.5, 5.0)
+        assert set(recent) == {'grovers_algorithm', 'shors_algorithm'}
+        assert recent['shors_algorithm'].confidence_sum == pytest.approx(1.4)
+        assert set(correlation.window(110.0, 5.0)) == set()
+        assert correlation.get_statistics()['indexed_threats'] == 3
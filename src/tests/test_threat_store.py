@@ -0,0 +1,84 @@
+import random
+
+import numpy as np
+import pytest
+
+from ..core.quantum_detector import QuantumDetector, QuantumThreat, ThreatLevel
+from ..core.threat_store import ThreatStore
+
+
+def make_threat(index: int, detection_time: float, level: ThreatLevel, confidence: float) -> QuantumThreat:
+    return QuantumThreat(
+        threat_id=f"threat_{index}",
+        threat_level=level,
+        detection_time=detection_time,
+        attack_vector="entanglement_correlation",
+        quantum_indicators=["entanglement_correlation"],
+        affected_tokens=[f"token_{index}"],
+        confidence_score=confidence
+    )
+
+
+class TestThreatStore:
+    def test_running_totals_match_full_scan(self):
+        """Test that bucketed counters agree with rescanning the whole history"""
+        rng = random.Random(22)
+        store = ThreatStore(ThreatLevel, window=300.0, bucket_seconds=10.0)
+        threats = []
+        for i in range(2000):
+            # Mostly in order, with some late arrivals
+            detection_time = i * 0.5 - (rng.random() * 40 if i % 7 == 0 else 0)
+            threat = make_threat(i, detection_time, rng.choice(list(ThreatLevel)), rng.random())
+            store.append(threat)
+            threats.append(threat)
+
+            if i % 97 == 0:
+                now = i * 0.5
+                active = [t for t in threats if now - t.detection_time < 300.0]
+                stats = store.active_statistics(now)
+                assert stats['active_threats'] == len(active)
+                assert stats['threat_levels'] == {
+                    level.name: sum(t.threat_level == level for t in active) for level in ThreatLevel
+                }
+                assert np.isclose(stats['average_confidence'], np.mean([t.confidence_score for t in active]))
+                assert {t.threat_id for t in store.active_threats(now)} == {t.threat_id for t in active}
+
+        assert len(store) == 2000 and store[-1] is threats[-1]
+        assert store[1990:] == threats[1990:]
+
+    def test_expired_buckets_are_archived(self, tmp_path):
+        archive = tmp_path / "threats.jsonl"
+        store = ThreatStore(ThreatLevel, window=60.0, bucket_seconds=10.0, retained=5, archive_path=archive)
+        for i in range(20):
+            store.append(make_threat(i, 1000.0 + i * 5, ThreatLevel.HIGH, 0.8))
+
+        assert store.active_statistics(1100.0)['active_threats'] == 11
+        archived = list(store.iter_archive())
+        assert [record['threat_id'] for record in archived] == [f"threat_{i}" for i in range(8)]
+        assert archived[0]['threat_level'] == "HIGH"
+        assert store.get_statistics()['buckets'] == 6
+
+        # Late arrivals that are already inactive go straight to the archive
+        store.append(make_threat(99, 900.0, ThreatLevel.LOW, 0.5))
+        assert store.archived == 9 and store.active_statistics(1100.0)['threat_levels']['LOW'] == 0
+
+        # Only the most recent threats stay indexable
+        assert store[-1].threat_id == "threat_99" and len(store) == 21
+        with pytest.raises(IndexError):
+            store[0]
+
+    def test_detector_statistics_use_store(self):
+        detector = QuantumDetector(government_compliance=False)
+        try:
+            token = detector.generate_canary_token("store_test")
+            for i in range(6):
+                detector.access_token(token.token_id, f"attacker_{i}")
+
+            stats = detector.get_threat_statistics()
+            assert stats['total_threats_detected'] == len(detector.threat_history) > 0
+            assert stats['active_threats'] == len(detector.get_active_threats())
+            assert stats['threat_store']['active_threats'] == stats['active_threats']
+            # Heavy sections are served from the TTL cache on repeated calls
+            assert detector.get_threat_statistics()['quantum_backup_system'] is stats['quantum_backup_system']
+        finally:
+            detector.quantum_backup_engine.stop_monitoring()
@@ -0,0 +1,74 @@
+import asyncio
+
+import numpy as np
+
+from ..core.temporal_fragmentation import FragmentationPolicy, TemporalFragmentation
+from ..core.timing_keystream import TimingKeystreamCache, timing_keystream
+
+
+def loop_keystream(length: int, fragment_index: int, creation_time: float) -> np.ndarray:
+    """Reference: the original per-byte-pair construction of the timing noise"""
+    microsecond_phase = int((creation_time * 1000000) % 1000000)
+    timing_random = np.random.RandomState((fragment_index * microsecond_phase) % 2**32)
+    decoherence_pattern = timing_random.randint(0, 256, size=length, dtype=np.uint8)
+    time_oscillation = np.sin(2 * np.pi * creation_time * np.arange(length) / 1000.0)
+    temporal_noise = (time_oscillation * 127 + 128).astype(np.uint8)
+    entanglement_noise = np.zeros(length, dtype=np.uint8)
+    for i in range(0, length - 1, 2):
+        correlation = timing_random.randint(0, 64)
+        entanglement_noise[i] = correlation
+        if i + 1 < length:
+            entanglement_noise[i + 1] = correlation
+    return decoherence_pattern ^ temporal_noise ^ entanglement_noise
+
+
+class TestTimingKeystream:
+    def test_matches_per_byte_pair_loop(self):
+        """Test that the batched draw reproduces the original noise exactly"""
+        creation_time = 1712345678.123456
+        for length in (0, 1, 2, 3, 255, 1024, 4097):
+            for fragment_index in (0, 1, 7):
+                expected = loop_keystream(length, fragment_index, creation_time)
+                assert np.array_equal(timing_keystream(length, fragment_index, creation_time), expected)
+
+    def test_cache_reuses_keystreams_and_sine_tables(self):
+        cache = TimingKeystreamCache(max_bytes=10_000)
+        data = bytes(range(256)) * 10
+        masked = cache.apply(data, 3, 1000.5)
+        assert masked != data
+        assert cache.apply(masked, 3, 1000.5) == data
+
+        cache.keystream(100, 4, 1000.5)  # same creation time: sine table reused
+        stats = cache.get_statistics()
+        assert stats['hits'] == 1
+        assert stats['sine_table_builds'] == 1
+
+        extended = cache.keystream(5_000, 6, 1000.5)  # sine table grows by its tail only
+        assert np.array_equal(extended, timing_keystream(5_000, 6, 1000.5))
+
+        cache.keystream(9_000, 5, 1000.5)  # pushes the first keystream out
+        assert cache.get_statistics()['cached_bytes'] <= 10_000
+        assert cache.get_statistics()['evictions'] >= 1
+
+
+class TestFragmentationKeystream:
+    def test_fragment_roundtrip_uses_cached_keystreams(self):
+        """Test that reconstruction hits the keystreams generated during fragmentation"""
+        policy = FragmentationPolicy(max_fragment_lifetime_ms=5000, overlap_factor=0.0, quantum_resistance_level=3)
+        fragmenter = TemporalFragmentation(policy, enable_legal_routing=False)
+        data = np.random.RandomState(1).bytes(300_000)
+
+        fragments = asyncio.run(fragmenter.fragment_data(data, "keystream_group"))
+        misses = fragmenter.keystream_cache.get_statistics()['misses']
+        assert misses == len(fragments)
+
+        for fragment in fragments:
+            clean = fragmenter._remove_quantum_timing_patterns(
+                fragment.data_chunk, fragment.fragment_index, fragment.created_at
+            )
+            assert clean != fragment.data_chunk
+        stats = fragmenter.keystream_cache.get_statistics()
+        assert stats['misses'] == misses
+        assert stats['hits'] == len(fragments)
+        assert stats['sine_table_builds'] <= len(fragments)
+        fragmenter.expiration_scheduler.stop()
@@ -0,0 +1,101 @@
+import time
+
+import pytest
+
+from ..core.post_quantum_crypto import SecurityLevel
+from ..core.quantum_detector import CanaryToken, QuantumDetector
+from ..core.token_registry import CanaryTokenRegistry
+
+
+def make_token(i: int) -> CanaryToken:
+    return CanaryToken(
+        token_id=f"token_{i:06d}",
+        value=f"sensitive_{i}",
+        created_at=1000.0 + i,
+        access_pattern=f"pattern_{i}",
+        quantum_signature="ab" * 40,
+        nist_compliant=i % 2 == 0,
+        security_level=SecurityLevel.LEVEL_3 if i % 2 == 0 else None,
+        post_quantum_safe=i % 2 == 0
+    )
+
+
+class TestCanaryTokenRegistry:
+    def test_reopen_materializes_tokens_on_demand(self, tmp_path):
+        """Test that tokens written by one registry are read back after reopening"""
+        registry = CanaryTokenRegistry(str(tmp_path), index_merge_threshold=64)
+        for i in range(200):
+            registry[f"token_{i:06d}"] = make_token(i)
+        registry.close()
+
+        reopened = CanaryTokenRegistry(str(tmp_path))
+        try:
+            assert len(reopened) == 200
+            assert "token_000150" in reopened
+            assert "token_999999" not in reopened
+            assert reopened.get_statistics()['materialized_tokens'] == 0
+
+            token = reopened["token_000150"]
+            assert token == make_token(150)
+            assert reopened["token_000150"] is token
+            assert reopened.count_nist_compliant() == 100
+            assert sorted(reopened) == [f"token_{i:06d}" for i in range(200)]
+        finally:
+            reopened.close()
+
+    def test_access_log_replayed_without_checkpoint(self, tmp_path):
+        """Test that logged accesses survive a restart that skipped the checkpoint"""
+        registry = CanaryTokenRegistry(str(tmp_path))
+        registry["token_000001"] = make_token(1)
+        for i in range(5):
+            assert registry.record_access("token_000001", 2000.0 + i)
+        assert not registry.record_access("unknown_token", 2000.0)
+        registry.flush()  # durable, but the log is not folded into the records
+
+        reopened = CanaryTokenRegistry(str(tmp_path))
+        try:
+            token = reopened["token_000001"]
+            assert token.access_count == 5
+            assert token.last_accessed == 2004.0
+            assert reopened.get_statistics()['pending_log_entries'] == 0
+        finally:
+            reopened.close()
+
+    def test_delete_and_restore(self, tmp_path):
+        registry = CanaryTokenRegistry(str(tmp_path))
+        try:
+            registry["token_000001"] = make_token(1)
+            del registry["token_000001"]
+            assert "token_000001" not in registry
+            assert len(registry) == 0
+
+            assert registry.restore("token_000001").value == "sensitive_1"
+            assert len(registry) == 1
+            assert registry.restore("never_stored") is None
+            with pytest.raises(ValueError):
+                registry["x" * 65] = make_token(2)
+        finally:
+            registry.close()
+
+
+class TestDetectorTokenRegistry:
+    def test_detector_restart_keeps_tokens(self, tmp_path):
+        """Test that a restarted detector sees tokens and access counts from the registry"""
+        detector = QuantumDetector(government_compliance=False, token_registry_path=str(tmp_path))
+        token_ids = [token.token_id for token in detector.generate_canary_tokens(20)]
+        detector.access_token(token_ids[0], "reader", timestamp=time.time())
+        detector.access_token(token_ids[0], "reader", timestamp=time.time())
+        detector.stop_monitoring()
+        detector.token_registry.close()
+
+        restarted = QuantumDetector(government_compliance=False, token_registry_path=str(tmp_path))
+        try:
+            assert len(restarted.canary_tokens) == 20
+            assert restarted.canary_tokens[token_ids[0]].access_count == 2
+            assert restarted.get_threat_statistics()['token_registry']['tokens'] == 20
+
+            del restarted.canary_tokens[token_ids[1]]
+            assert restarted.recover_canary_token(token_ids[1]).token_id == token_ids[1]
+        finally:
+            restarted.stop_monitoring()
+            restarted.token_registry.close()
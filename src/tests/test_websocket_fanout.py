@@ -0,0 +1,156 @@
+import asyncio
+import json
+
+import pytest
+
+from ..api.fanout import FRAMING_BINARY, FRAMING_JSON, FRAMING_MSGPACK, MSGPACK_AVAILABLE, FanoutEngine
+
+
+class FakeWebSocket:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.frames = []
+        self.closed_with = None
+
+    async def send_text(self, data: str):
+        await asyncio.sleep(self.delay)
+        self.frames.append(data)
+
+    async def send_bytes(self, data: bytes):
+        await asyncio.sleep(self.delay)
+        self.frames.append(data)
+
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+    def messages(self):
+        return [json.loads(frame) for frame in self.frames]
+
+
+async def settle():
+    await asyncio.sleep(0.01)
+
+
+class TestFanoutEngine:
+    def test_topics_route_and_encode_once_per_framing(self):
+        async def scenario():
+            engine = FanoutEngine()
+            threats, agents, raw = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+            engine.add_client(threats, ["threats"])
+            engine.add_client(agents, ["agents", "threats"])
+            engine.add_client(raw, ["threats"], framing=FRAMING_BINARY)
+
+            assert engine.publish({"type": "threats", "n": 1}, topic="threats") == 3
+            assert engine.publish({"type": "agents", "n": 2}, topic="agents") == 1
+            await settle()
+
+            assert threats.messages() == [{"type": "threats", "n": 1}]
+            assert [m["n"] for m in agents.messages()] == [1, 2]
+            assert raw.frames == [json.dumps({"type": "threats", "n": 1}).encode()]
+            # One JSON text and one binary encoding for the first message, one for the second
+            assert engine.frames_encoded == 3
+
+            engine.set_topics(threats, ["agents"])
+            assert engine.subscriber_count("threats") == 2 and engine.subscriber_count("agents") == 2
+            await engine.close()
+
+        asyncio.run(scenario())
+
+    def test_slow_consumer_is_evicted_without_stalling_others(self):
+        async def scenario():
+            evicted = []
+            engine = FanoutEngine(queue_size=4, on_evict=evicted.append)
+            fast, slow = FakeWebSocket(), FakeWebSocket(delay=10.0)
+            engine.add_client(fast, ["system"])
+            engine.add_client(slow, ["system"])
+
+            for i in range(10):
+                engine.publish({"n": i}, topic="system")
+                await settle()
+
+            assert [m["n"] for m in fast.messages()] == list(range(10))
+            assert evicted == [slow] and slow not in engine
+            assert slow.closed_with == 1013
+            assert engine.get_statistics()['evictions'] == 1
+            await engine.close()
+
+        asyncio.run(scenario())
+
+    def test_send_timeout_evicts(self):
+        async def scenario():
+            engine = FanoutEngine(send_timeout=0.01)
+            stuck = FakeWebSocket(delay=1.0)
+            engine.add_client(stuck, ["threats"])
+            engine.publish({"n": 0})
+            await asyncio.sleep(0.05)
+            assert stuck not in engine and engine.evictions == 1
+
+        asyncio.run(scenario())
+
+    def test_history_ring_buffer_and_replay(self):
+        async def scenario():
+            engine = FanoutEngine(history_size=5)
+            for i in range(12):
+                engine.publish({"n": i}, topic="threats")
+            assert [m["n"] for m in engine.history] == list(range(7, 12))
+
+            late = FakeWebSocket()
+            engine.add_client(late, [])
+            engine.send_to(late, {"welcome": True})
+            assert engine.replay_history(late, 3) == 3
+            await settle()
+            assert late.messages() == [{"welcome": True}, {"n": 9}, {"n": 10}, {"n": 11}]
+            await engine.close()
+
+        asyncio.run(scenario())
+
+    def test_msgpack_framing_requires_msgpack(self):
+        async def scenario():
+            engine = FanoutEngine()
+            websocket = FakeWebSocket()
+            if not MSGPACK_AVAILABLE:
+                with pytest.raises(ValueError):
+                    engine.add_client(websocket, ["threats"], framing=FRAMING_MSGPACK)
+                engine.add_client(websocket, ["threats"], framing=FRAMING_JSON)
+                assert engine.get_statistics()['framings'] == {FRAMING_JSON: 1, FRAMING_BINARY: 0}
+                return
+
+            import msgpack
+            engine.add_client(websocket, ["threats"], framing=FRAMING_MSGPACK)
+            engine.publish({"n": 1}, topic="threats")
+            await settle()
+            assert msgpack.unpackb(websocket.frames[0]) == {"n": 1}
+            await engine.close()
+
+        asyncio.run(scenario())
+
+
+class TestWebSocketManagerFanout:
+    def test_manager_broadcasts_through_topics(self):
+        from ..api.websocket import WebSocketManager
+
+        class ClientSocket(FakeWebSocket):
+            query_params = {"framing": "binary"}
+
+            async def accept(self):
+                pass
+
+        async def scenario():
+            manager = WebSocketManager()
+            client = ClientSocket()
+            await manager.connect(client)
+            await manager.handle_client_message(client, {"type": "subscribe", "subscriptions": ["agents"]})
+            await manager.broadcast_message({"type": "threats"}, subscription_filter="threats")
+            await manager.broadcast_message({"type": "agents"}, subscription_filter="agents")
+            await settle()
+
+            messages = [json.loads(frame) for frame in client.frames]
+            assert [m["type"] for m in messages] == ["connection", "subscription", "agents"]
+            stats = manager.get_connection_stats()
+            assert stats["subscription_breakdown"]["agents"] == 1 and stats["message_history_size"] == 2
+            assert stats["fanout"]["framings"]["binary"] == 1
+
+            manager.disconnect(client)
+            assert len(manager.fanout) == 0 and manager.monitoring_task is None
+
+        asyncio.run(scenario())